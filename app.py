@@ -3,13 +3,25 @@ Main Streamlit application for the Manaaki Navigator MVP.
 This file contains the main chat interface and application logic.
 """
 
+import os
+import uuid
+
 import streamlit as st
 from services.conversation import process_user_input
-from services.mock_data import get_services_by_location
+from services.directory_watcher import start_directory_watcher
+from services.event_log import start_event_log
+from services.instrumentation import span
+from services.metrics import start_metrics_server
+from services.mock_data import get_directory
+from services.service_matcher import get_services_for_display
 from utils.language import (
-    get_ui_text, get_css_for_cultural_mode, get_common_css,
+    get_ui_text, get_theme_css,
     ENGLISH, MAORI, GENERAL, MAORI_RESPONSIVE
 )
+from utils.rendering import (
+    render_user_message, render_bot_message, render_service_cards,
+    service_card_fields, visible_messages, HISTORY_PAGE_SIZE
+)
 
 # Set page configuration
 st.set_page_config(
@@ -19,12 +31,25 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Maximum chat messages kept per session; older messages are dropped
+MAX_HISTORY_MESSAGES = int(os.environ.get("MANAAKI_MAX_HISTORY_MESSAGES", "200"))
+
+# Reload MANAAKI_DIRECTORY_PATH in the background when it changes (no-op without it)
+start_directory_watcher()
+
+# Serve Prometheus metrics on MANAAKI_METRICS_PORT (no-op without it)
+start_metrics_server()
+
+# Log every turn to MANAAKI_EVENT_LOG_PATH on a writer thread (no-op without it)
+start_event_log()
+
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
 if "context" not in st.session_state:
     st.session_state.context = {
+        "session_id": uuid.uuid4().hex,
         "language": ENGLISH,
         "cultural_mode": GENERAL
     }
@@ -32,19 +57,37 @@ if "context" not in st.session_state:
 if "show_options" not in st.session_state:
     st.session_state.show_options = []
 
+if "history_window" not in st.session_state:
+    st.session_state.history_window = HISTORY_PAGE_SIZE
+
 # Apply CSS styling
 def apply_custom_css():
     """Apply custom CSS styling based on cultural mode"""
     cultural_mode = st.session_state.context.get("cultural_mode", GENERAL)
-    st.markdown(f"""
-        <style>
-            {get_common_css()}
-            {get_css_for_cultural_mode(cultural_mode)}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(get_theme_css(cultural_mode), unsafe_allow_html=True)
 
 apply_custom_css()
 
+def bot_message(response, language):
+    """
+    Build a chat history entry for a bot response.
+    
+    Only service IDs are kept; the services are resolved against the shared
+    directory when the message is rendered.
+    """
+    return {
+        "role": "assistant",
+        "content": response["text"],
+        "service_ids": [service["id"] for service in response.get("services", [])],
+        "language": language
+    }
+
+def trim_history():
+    """Drop the oldest messages beyond MAX_HISTORY_MESSAGES"""
+    overflow = len(st.session_state.messages) - MAX_HISTORY_MESSAGES
+    if overflow > 0:
+        del st.session_state.messages[:overflow]
+
 # Sidebar for settings
 with st.sidebar:
     st.title(get_ui_text("app_title", st.session_state.context["language"]))
@@ -89,7 +132,10 @@ with st.sidebar:
     if st.button(get_ui_text("clear_chat", st.session_state.context["language"])):
         st.session_state.messages = []
         st.session_state.show_options = []
+        st.session_state.history_window = HISTORY_PAGE_SIZE
+        # A cleared chat is a new session in the event log
         st.session_state.context = {
+            "session_id": uuid.uuid4().hex,
             "language": st.session_state.context["language"],
             "cultural_mode": st.session_state.context["cultural_mode"]
         }
@@ -112,45 +158,34 @@ if not st.session_state.messages:
     st.session_state.context = result["context"]
     
     # Add bot message to chat history
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": result["response"]["text"]
-    })
+    st.session_state.messages.append(bot_message(result["response"], result["context"]["language"]))
     
     # Set options for quick replies
     st.session_state.show_options = result["response"].get("options", [])
 
-# Display chat messages
-for message in st.session_state.messages:
-    if message["role"] == "user":
-        st.markdown(f"""
-            <div class="chat-message chat-message-user">
-                <div>{message["content"]}</div>
-            </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-            <div class="chat-message chat-message-bot">
-                <div>{message["content"].replace('\n', '<br>')}</div>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Display services if available in the message
-        if "services" in message:
-            st.subheader("Services")
-            cols = st.columns(len(message["services"]))
-            for i, service in enumerate(message["services"]):
-                with cols[i]:
-                    cultural_class = "service-card-maori" if st.session_state.context["cultural_mode"] == MAORI_RESPONSIVE else "service-card-general"
-                    st.markdown(f"""
-                        <div class="service-card {cultural_class}">
-                            <h4>{service["name"]}</h4>
-                            <p>{service["description"]}</p>
-                            <p><strong>Address:</strong> {service["address"]}</p>
-                            <p><strong>Phone:</strong> {service["phone"]}</p>
-                            <p><strong>Hours:</strong> {service["hours"]}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
+# Display the most recent chat messages; earlier ones load on request
+messages, hidden_count = visible_messages(st.session_state.messages, st.session_state.history_window)
+if hidden_count:
+    if st.button(get_ui_text("load_earlier", st.session_state.context["language"])):
+        st.session_state.history_window += HISTORY_PAGE_SIZE
+        st.rerun()
+
+# Render every message against one directory, even if a reload lands mid-render
+directory = get_directory()
+cultural_class = "service-card-maori" if st.session_state.context["cultural_mode"] == MAORI_RESPONSIVE else "service-card-general"
+with span("render"):
+    for message in messages:
+        # Rendered HTML is cached, so unchanged messages cost a cache lookup per rerun
+        if message["role"] == "user":
+            st.markdown(render_user_message(message["content"]), unsafe_allow_html=True)
+        else:
+            st.markdown(render_bot_message(message["content"]), unsafe_allow_html=True)
+            
+            # Display services if available in the message
+            services = get_services_for_display(message.get("service_ids", ()), message.get("language", ENGLISH), directory)
+            if services:
+                cards = tuple(service_card_fields(service) for service in services)
+                st.markdown(render_service_cards(cards, cultural_class), unsafe_allow_html=True)
 
 # Display option buttons if available
 if st.session_state.show_options:
@@ -173,11 +208,8 @@ if st.session_state.show_options:
                 
                 # Add bot message to chat history
                 response = result["response"]
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": response["text"],
-                    "services": response.get("services", [])
-                })
+                st.session_state.messages.append(bot_message(response, result["context"]["language"]))
+                trim_history()
                 
                 # Update options for quick replies
                 st.session_state.show_options = response.get("options", [])
@@ -212,11 +244,8 @@ with st.form(key="user_input_form", clear_on_submit=True):
         
         # Add bot message to chat history
         response = result["response"]
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response["text"],
-            "services": response.get("services", [])
-        })
+        st.session_state.messages.append(bot_message(response, result["context"]["language"]))
+        trim_history()
         
         # Update options for quick replies
         st.session_state.show_options = response.get("options", [])
@@ -5,7 +5,7 @@ This page provides information about the application and its purpose.
 
 import streamlit as st
 from utils.language import (
-    get_ui_text, get_css_for_cultural_mode, get_common_css,
+    get_ui_text, get_theme_css,
     ENGLISH, MAORI, GENERAL, MAORI_RESPONSIVE
 )
 
@@ -13,12 +13,7 @@ from utils.language import (
 def apply_custom_css():
     """Apply custom CSS styling based on cultural mode"""
     cultural_mode = st.session_state.context.get("cultural_mode", GENERAL)
-    st.markdown(f"""
-        <style>
-            {get_common_css()}
-            {get_css_for_cultural_mode(cultural_mode)}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(get_theme_css(cultural_mode), unsafe_allow_html=True)
 
 # Page content
 def show_about_page():
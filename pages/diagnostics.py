@@ -0,0 +1,128 @@
+"""
+Diagnostics page for the Manaaki Navigator Streamlit MVP.
+This page shows rolling per-stage and per-intent latencies recorded by services.instrumentation.
+The page is read-only unless MANAAKI_DIAGNOSTICS_CONTROLS is set, because turning
+instrumentation on or off and resetting timings affect every session on the server.
+"""
+
+import os
+
+import streamlit as st
+from services.instrumentation import get_timings, is_enabled, reset_timings, set_enabled
+from utils.language import get_ui_text, get_theme_css, ENGLISH, GENERAL
+
+# Whether the page shows controls that change process-wide instrumentation state
+CONTROLS_ENABLED = os.environ.get("MANAAKI_DIAGNOSTICS_CONTROLS", "").lower() in ("1", "true", "yes", "on")
+
+# Stages in the order a turn runs through them; other stages are listed after
+STAGE_ORDER = (
+    "preprocess", "detect_intent", "extract_entities", "update_context",
+    "generate_response", "directory_query", "turn", "render"
+)
+
+# Apply CSS styling
+def apply_custom_css():
+    """Apply custom CSS styling based on cultural mode"""
+    cultural_mode = st.session_state.get("context", {}).get("cultural_mode", GENERAL)
+    st.markdown(get_theme_css(cultural_mode), unsafe_allow_html=True)
+
+def timing_rows(summaries, label, order=()):
+    """
+    Turn latency summaries into table rows.
+
+    Args:
+        summaries (dict): Name -> summary from get_timings
+        label (str): Heading of the name column
+        order (tuple): Names to list first, in this order
+
+    Returns:
+        list: One dict per name, latencies in milliseconds
+    """
+    names = [name for name in order if name in summaries]
+    names += sorted(name for name in summaries if name not in order)
+    rows = []
+    for name in names:
+        summary = summaries[name]
+        rows.append({
+            label: name,
+            "count": summary["count"],
+            "mean (ms)": round(summary["mean_us"] / 1000, 3),
+            "p50 (ms)": round(summary["p50_us"] / 1000, 3),
+            "p95 (ms)": round(summary["p95_us"] / 1000, 3),
+            "p99 (ms)": round(summary["p99_us"] / 1000, 3),
+            "max (ms)": round(summary["max_us"] / 1000, 3)
+        })
+    return rows
+
+def markdown_table(rows):
+    """
+    Format table rows as a Markdown table.
+
+    Args:
+        rows (list): Dicts with the same keys
+
+    Returns:
+        str: Markdown table
+    """
+    headers = list(rows[0])
+    lines = [
+        "| " + " | ".join(headers) + " |",
+        "|" + "|".join(" --- " if index == 0 else " ---: " for index in range(len(headers))) + "|"
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(str(row[header]) for header in headers) + " |")
+    return "\n".join(lines)
+
+# Page content
+def show_diagnostics_page():
+    # Apply styling
+    apply_custom_css()
+
+    language = st.session_state.get("context", {}).get("language", ENGLISH)
+
+    # Page header
+    st.markdown(f"""
+        <div class="main-header">
+            <h1>{get_ui_text("diagnostics_title", language)}</h1>
+        </div>
+    """, unsafe_allow_html=True)
+
+    timings = get_timings()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if is_enabled():
+            st.success("Instrumentation is on")
+            if CONTROLS_ENABLED and st.button("Turn off"):
+                set_enabled(False)
+                st.rerun()
+        else:
+            st.info("Instrumentation is off. Set MANAAKI_INSTRUMENTATION=1 to turn it on at startup.")
+            if CONTROLS_ENABLED and st.button("Turn on"):
+                set_enabled(True)
+                st.rerun()
+    with col2:
+        if CONTROLS_ENABLED and st.button("Reset timings"):
+            reset_timings()
+            st.rerun()
+        st.button("Refresh")
+
+    st.caption(f"Latencies over the last {timings['window_seconds'] // 60} minutes, for every session on this server.")
+
+    st.subheader("Stages")
+    stage_rows = timing_rows(timings["stages"], "stage", STAGE_ORDER)
+    if stage_rows:
+        st.markdown(markdown_table(stage_rows))
+        st.caption("generate_response includes directory_query; turn covers every stage of process_user_input.")
+    else:
+        st.write("No timings recorded yet.")
+
+    st.subheader("Turns by intent")
+    intent_rows = timing_rows(timings["intents"], "intent")
+    if intent_rows:
+        st.markdown(markdown_table(intent_rows))
+    else:
+        st.write("No timings recorded yet.")
+
+# Run the page
+show_diagnostics_page()
@@ -5,119 +5,55 @@ This page provides a scenario testing framework to validate the application func
 
 import streamlit as st
 from services.conversation import process_user_input
+from services.scenarios import test_scenarios
 from utils.language import (
-    get_ui_text, get_css_for_cultural_mode, get_common_css,
+    get_ui_text, get_theme_css,
     ENGLISH, MAORI, GENERAL, MAORI_RESPONSIVE
 )
 
-# Define test scenarios
-test_scenarios = [
-    {
-        "id": 1,
-        "name": "Health Services Scenario - English",
-        "description": "User seeking GP services in Auckland",
-        "language": ENGLISH,
-        "cultural_mode": GENERAL,
-        "steps": [
-            {"input": "Hello", "expected_contains": "help connect you with support services"},
-            {"input": "I need to find a doctor", "expected_contains": "health services"},
-            {"input": "Auckland", "expected_contains": "Auckland"},
-            {"input": "GP/Family doctor", "expected_contains": "Community Services Card"}
-        ]
-    },
-    {
-        "id": 2,
-        "name": "Housing Assistance Scenario - English",
-        "description": "User seeking emergency housing",
-        "language": ENGLISH,
-        "cultural_mode": GENERAL,
-        "steps": [
-            {"input": "I need housing help", "expected_contains": "housing assistance"},
-            {"input": "Emergency housing", "expected_contains": "Emergency Housing Special Needs Grant"},
-            {"input": "How do I apply?", "expected_contains": "apply"}
-        ]
-    },
-    {
-        "id": 3,
-        "name": "Māori Cultural Adaptation Scenario",
-        "description": "User interacting in te reo Māori",
-        "language": MAORI,
-        "cultural_mode": MAORI_RESPONSIVE,
-        "steps": [
-            {"input": "Tēnā koe", "expected_contains": "Tēnā koe"},
-            {"input": "He āwhina hauora", "expected_contains": "ratonga hauora"},
-            {"input": "Tāmaki Makaurau", "expected_contains": "Tāmaki Makaurau"}
-        ]
-    },
-    {
-        "id": 4,
-        "name": "Financial Support Scenario - English with Māori Responsive",
-        "description": "User seeking financial assistance with cultural adaptation",
-        "language": ENGLISH,
-        "cultural_mode": MAORI_RESPONSIVE,
-        "steps": [
-            {"input": "Kia ora", "expected_contains": "Kia ora"},
-            {"input": "I need financial help", "expected_contains": "financial assistance"},
-            {"input": "Benefits & payments", "expected_contains": "Work and Income"}
-        ]
-    },
-    {
-        "id": 5,
-        "name": "Mental Health Support Scenario",
-        "description": "User seeking mental health support",
-        "language": ENGLISH,
-        "cultural_mode": GENERAL,
-        "steps": [
-            {"input": "I'm feeling anxious", "expected_contains": "mental health"},
-            {"input": "Talk to someone now", "expected_contains": "1737"}
-        ]
+# Styles for the scenario cards and step results on this page
+TEST_PAGE_CSS = """
+    .test-card {
+        border: 1px solid #ddd;
+        border-radius: 0.5rem;
+        padding: 1rem;
+        margin-bottom: 1rem;
     }
-]
+    .test-step {
+        padding: 0.5rem;
+        margin-bottom: 0.5rem;
+        border-radius: 0.25rem;
+    }
+    .test-step-current {
+        background-color: #e3f2fd;
+        border-left: 3px solid #1976d2;
+    }
+    .test-step-passed {
+        background-color: #e8f5e9;
+        border-left: 3px solid #4caf50;
+    }
+    .test-step-failed {
+        background-color: #ffebee;
+        border-left: 3px solid #f44336;
+    }
+    .test-results {
+        margin-top: 1rem;
+        padding: 1rem;
+        border-radius: 0.5rem;
+    }
+    .test-results-passed {
+        background-color: #e8f5e9;
+    }
+    .test-results-failed {
+        background-color: #ffebee;
+    }
+"""
 
 # Apply CSS styling
 def apply_custom_css():
     """Apply custom CSS styling based on cultural mode"""
     cultural_mode = st.session_state.context.get("cultural_mode", GENERAL)
-    st.markdown(f"""
-        <style>
-            {get_common_css()}
-            {get_css_for_cultural_mode(cultural_mode)}
-            .test-card {{
-                border: 1px solid #ddd;
-                border-radius: 0.5rem;
-                padding: 1rem;
-                margin-bottom: 1rem;
-            }}
-            .test-step {{
-                padding: 0.5rem;
-                margin-bottom: 0.5rem;
-                border-radius: 0.25rem;
-            }}
-            .test-step-current {{
-                background-color: #e3f2fd;
-                border-left: 3px solid #1976d2;
-            }}
-            .test-step-passed {{
-                background-color: #e8f5e9;
-                border-left: 3px solid #4caf50;
-            }}
-            .test-step-failed {{
-                background-color: #ffebee;
-                border-left: 3px solid #f44336;
-            }}
-            .test-results {{
-                margin-top: 1rem;
-                padding: 1rem;
-                border-radius: 0.5rem;
-            }}
-            .test-results-passed {{
-                background-color: #e8f5e9;
-            }}
-            .test-results-failed {{
-                background-color: #ffebee;
-            }}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(get_theme_css(cultural_mode, TEST_PAGE_CSS), unsafe_allow_html=True)
 
 # Initialize session state for testing
 if "test_scenario" not in st.session_state:
@@ -213,9 +149,10 @@ def show_testing_page():
                         </div>
                     """, unsafe_allow_html=True)
                 else:
+                    content_html = message["content"].replace("\n", "<br>")
                     st.markdown(f"""
                         <div class="chat-message chat-message-bot">
-                            <div>{message["content"].replace('\n', '<br>')}</div>
+                            <div>{content_html}</div>
                         </div>
                     """, unsafe_allow_html=True)
             
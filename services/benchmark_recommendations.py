@@ -0,0 +1,185 @@
+"""
+Recommendation ranking benchmark for the Manaaki Navigator Streamlit MVP.
+This module compares sorting every candidate and heap-based top-k selection with
+reading the first rows off the directory's own indexes (get_services_by_location,
+which the default load_order ranking uses) on synthetic directories where one city
+has many matching providers.
+
+Usage:
+    python -m services.benchmark_recommendations --sizes 10000 100000 --limit 3
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from services.directory import BACKENDS, create_directory
+from services.ranking import RANKERS, get_ranker, top_k
+
+SERVICE_TYPES = ("general_practitioner", "mental_health", "dental_care", "hospital")
+
+def make_services(size, location="Auckland"):
+    """
+    Build synthetic service records that all match one location.
+
+    Args:
+        size (int): Number of services
+        location (str): Location of every service
+
+    Returns:
+        list: Service records
+    """
+    return [
+        {
+            "id": f"bench-{row}",
+            "name": f"Benchmark Service {row}",
+            "location": location,
+            "type": SERVICE_TYPES[row % len(SERVICE_TYPES)],
+            "tags": ["low_cost"] if row % 3 else ["low_cost", "general_practitioner"]
+        }
+        for row in range(size)
+    ]
+
+def full_sort(candidates, key, limit):
+    """
+    Rank candidates the old way: build the full list, sort it, keep the head.
+
+    Args:
+        candidates (iterable): (row, service) pairs
+        key (callable): key(row, service), lower is better
+        limit (int): Number of services to keep
+
+    Returns:
+        list: Services, best first
+    """
+    ranked = sorted(list(candidates), key=lambda candidate: key(*candidate))
+    return [service for _, service in ranked[:limit]]
+
+def _median_ms(function, repeat):
+    """
+    Time a function.
+
+    Args:
+        function (callable): Function to time
+        repeat (int): Number of timed calls
+
+    Returns:
+        float: Median call time in milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def run_benchmark(sizes, limit=3, repeat=20, backends=BACKENDS, rankings=None, service_type="general_practitioner"):
+    """
+    Time full sorting and top-k selection against the directory's indexed path.
+
+    Args:
+        sizes (list): Candidate counts to test
+        limit (int): Number of recommendations kept
+        repeat (int): Timed calls per measurement
+        backends (iterable): Directory backends to test
+        rankings (iterable, optional): Ranking names, defaults to every registered ranking
+        service_type (str, optional): Service type filter applied to the query
+
+    Returns:
+        list: One result dict per (size, backend, ranking)
+    """
+    results = []
+    for size in sizes:
+        services = make_services(size)
+        for backend in backends:
+            directory = create_directory(services, backend)
+            for ranking in rankings or list(RANKERS):
+                key = get_ranker(ranking, {"location": "Auckland", "service_type": service_type})
+
+                def query_full():
+                    return full_sort(directory.iter_candidates("Auckland", service_type), key, limit)
+
+                def query_top_k():
+                    return top_k(directory.iter_candidates("Auckland", service_type), key, limit)
+
+                def query_indexed():
+                    return directory.get_services_by_location("Auckland", service_type, limit)
+
+                if query_full() != query_top_k():
+                    raise AssertionError(f"Top-k and full sort disagree ({backend}, {ranking}, {size})")
+                # Only load order can be read off the indexes
+                indexed = ranking == "load_order"
+                if indexed and query_indexed() != query_top_k():
+                    raise AssertionError(f"Indexed path and top-k disagree ({backend}, {size})")
+
+                candidates = sum(1 for _ in directory.iter_candidates("Auckland", service_type))
+                full_ms = _median_ms(query_full, repeat)
+                top_k_ms = _median_ms(query_top_k, repeat)
+                indexed_ms = _median_ms(query_indexed, repeat) if indexed else None
+                results.append({
+                    "size": size,
+                    "candidates": candidates,
+                    "backend": backend,
+                    "ranking": ranking,
+                    "limit": limit,
+                    "full_sort_ms": full_ms,
+                    "top_k_ms": top_k_ms,
+                    "indexed_ms": indexed_ms,
+                    "speedup": full_ms / top_k_ms if top_k_ms else 0.0
+                })
+    return results
+
+def format_results(results):
+    """
+    Format benchmark results as a plain-text table.
+
+    Args:
+        results (list): Results from run_benchmark
+
+    Returns:
+        str: Table
+    """
+    lines = [
+        f"{'services':>9} {'candidates':>10} {'backend':>8} {'ranking':>11} {'full sort':>11} {'top-k':>9} "
+        f"{'speedup':>8} {'indexed':>9}"
+    ]
+    for result in results:
+        indexed = "-" if result["indexed_ms"] is None else f"{result['indexed_ms']:.3f}ms"
+        lines.append(
+            f"{result['size']:>9} {result['candidates']:>10} {result['backend']:>8} {result['ranking']:>11} "
+            f"{result['full_sort_ms']:>9.2f}ms {result['top_k_ms']:>7.2f}ms {result['speedup']:>7.1f}x {indexed:>9}"
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Command-line arguments
+
+    Returns:
+        int: Process exit status
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the ways of selecting recommendations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="services in the benchmark city")
+    parser.add_argument("--limit", type=int, default=3, help="recommendations kept")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per measurement")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="only test this backend (repeatable)")
+    parser.add_argument("--service-type", default="general_practitioner",
+                        help="service type filter; an empty string queries every type")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.sizes, args.limit, max(1, args.repeat), args.backend or BACKENDS,
+                            service_type=args.service_type or None)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Columnar service directory backend for the Manaaki Navigator Streamlit MVP.
+This module stores locations and types as categorical codes and tags as a boolean
+matrix, so directory queries are evaluated as vectorized NumPy masks. Records are
+stored column by column as well, and only the rows actually returned are
+materialized back into service records.
+"""
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from services.directory import NATIONWIDE
+from services.geo import GridIndex, service_coordinates
+from services.projections import LocalizedViewsMixin
+
+# Marks a field that a record does not have
+_MISSING = object()
+
+class ColumnRecord(Mapping):
+    """
+    Read-only service record backed by ServiceColumns.
+
+    Field values are read from the columns on access, so building a record
+    for a query result costs one small object.
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns, row):
+        self._columns = columns
+        self._row = row
+
+    def __getitem__(self, field):
+        column = self._columns.get(field)
+        if column is None or column[self._row] is _MISSING:
+            raise KeyError(field)
+        return column[self._row]
+
+    def __iter__(self):
+        for field, column in self._columns.items():
+            if column[self._row] is not _MISSING:
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ColumnRecord({dict(self)!r})"
+
+class ServiceColumns(Sequence):
+    """
+    Service records stored as one list per field.
+
+    Rows are read back as ColumnRecord views, so the directory holds flat
+    columns of field values rather than a dict per service.
+    """
+
+    def __init__(self, services):
+        """
+        Split service records into columns.
+
+        Args:
+            services (iterable): Service records (dicts)
+        """
+        columns = {}
+        count = 0
+        for service in services:
+            for field, value in service.items():
+                column = columns.get(field)
+                if column is None:
+                    column = columns[field] = [_MISSING] * count
+                column.append(value)
+            count += 1
+            for column in columns.values():
+                if len(column) < count:
+                    column.append(_MISSING)
+        self._count = count
+        # Field name -> values by row
+        self.columns = columns
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[index] for index in range(*row.indices(self._count))]
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("service row out of range")
+        return ColumnRecord(self.columns, row)
+
+    def records(self, rows):
+        """
+        Get the records of several rows without per-row bounds checks.
+
+        Args:
+            rows (iterable): Row numbers in range
+
+        Yields:
+            ColumnRecord: One record per row
+        """
+        columns = self.columns
+        for row in rows:
+            yield ColumnRecord(columns, row)
+
+class _ServicesById(Mapping):
+    """Read-only mapping of service id to a record built on access."""
+
+    def __init__(self, records, rows_by_id):
+        self._records = records
+        self._rows_by_id = rows_by_id
+
+    def __getitem__(self, service_id):
+        return self._records[self._rows_by_id[service_id]]
+
+    def __iter__(self):
+        return iter(self._rows_by_id)
+
+    def __len__(self):
+        return len(self._rows_by_id)
+
+class ColumnarServiceDirectory(LocalizedViewsMixin):
+    """
+    Read-only service directory backed by pandas/NumPy columns.
+
+    Exposes the same query methods as ServiceDirectory. Queries like
+    "location in {X, nationwide} and (type == T or T in tags)" become a
+    handful of vectorized comparisons over integer codes. The directory keeps
+    no record dicts: query results are read-only records backed by the
+    columns (or by a memory-mapped snapshot), built for the selected rows only.
+    """
+
+    def __init__(self, services):
+        """
+        Build the columns from service records.
+
+        Args:
+            services (iterable): Service records (dicts) to index; a sequence
+                that already builds records on access, such as a
+                DirectorySnapshot, is read from directly
+        """
+        if isinstance(services, Sequence) and not isinstance(services, (list, tuple)):
+            records = services
+        else:
+            records = ServiceColumns(services)
+        self._services = records
+
+        # One pass over the records for every column the queries need
+        location_names = []
+        type_names = []
+        tag_lists = []
+        rows_by_id = {}
+        points = []
+        for row, service in enumerate(records):
+            rows_by_id[service["id"]] = row
+            location_names.append(service["location"])
+            type_names.append(service["type"])
+            tag_lists.append(service["tags"])
+            coordinates = service_coordinates(service)
+            if coordinates is not None:
+                points.append((row, *coordinates))
+        self._rows_by_id = rows_by_id
+        self._services_by_id = _ServicesById(records, rows_by_id)
+
+        locations = pd.Categorical([location.lower() for location in location_names])
+        types = pd.Categorical(type_names)
+        self._location_codes = locations.codes
+        self._type_codes = types.codes
+        self._location_lookup = {location: code for code, location in enumerate(locations.categories)}
+        self._type_lookup = {service_type: code for code, service_type in enumerate(types.categories)}
+
+        # One row per tag, one column per service, so a tag's mask is contiguous
+        tags = sorted({tag for service_tags in tag_lists for tag in service_tags})
+        self._tag_lookup = {tag: code for code, tag in enumerate(tags)}
+        self._tag_matrix = np.zeros((len(tags), len(self._services)), dtype=bool)
+        for row, service_tags in enumerate(tag_lists):
+            for tag in service_tags:
+                self._tag_matrix[self._tag_lookup[tag], row] = True
+
+        self._nationwide_mask = self._code_mask(self._location_codes, self._location_lookup.get(NATIONWIDE))
+
+        self._locations = sorted({location for location in location_names if location.lower() != NATIONWIDE})
+        self._service_types = sorted(set(self._type_lookup) | set(self._tag_lookup))
+
+        # Spatial index over services with coordinates (nationwide services have none)
+        self._spatial_index = GridIndex(points)
+
+    def __len__(self):
+        return len(self._services)
+
+    def __iter__(self):
+        return iter(self._services)
+
+    @property
+    def services_by_id(self):
+        """Read-only mapping of service id to service record."""
+        return self._services_by_id
+
+    def _code_mask(self, codes, code):
+        """
+        Get a mask of rows whose categorical code equals code.
+
+        Args:
+            codes (numpy.ndarray): Categorical codes
+            code (int or None): Code to match, None for an unknown value
+
+        Returns:
+            numpy.ndarray: Boolean mask
+        """
+        if code is None:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
+
+    def _masks(self, location, service_type):
+        """
+        Evaluate the location and service type filters.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to filter by
+
+        Returns:
+            tuple: (combined mask, exact type mask or None)
+        """
+        mask = self._nationwide_mask | self._code_mask(
+            self._location_codes, self._location_lookup.get(location.lower())
+        )
+        if not service_type:
+            return mask, None
+
+        category_mask, type_mask = self._category_mask(service_type)
+        return mask & category_mask, type_mask
+
+    def _category_mask(self, service_type):
+        """
+        Evaluate the service type filter on its own.
+
+        Args:
+            service_type (str): Service type or tag
+
+        Returns:
+            tuple: (mask of rows with the type or tag, exact type mask)
+        """
+        type_mask = self._code_mask(self._type_codes, self._type_lookup.get(service_type))
+        tag_code = self._tag_lookup.get(service_type)
+        category_mask = type_mask if tag_code is None else type_mask | self._tag_matrix[tag_code]
+        return category_mask, type_mask
+
+    def _materialize(self, rows):
+        """
+        Turn selected row numbers into service records.
+
+        Args:
+            rows (numpy.ndarray): Row numbers
+
+        Returns:
+            list: Service records
+        """
+        services = self._services
+        return [services[row] for row in rows.tolist()]
+
+    def get_services_by_location(self, location, service_type=None, limit=None):
+        """
+        Filter services by location and optionally by service type.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to filter by
+            limit (int, optional): Maximum number of services to return
+
+        Returns:
+            list: Filtered list of services
+        """
+        mask, _ = self._masks(location, service_type)
+        return self._materialize(np.flatnonzero(mask)[:limit])
+
+    def match_services(self, location, service_type=None, limit=None):
+        """
+        Get services for a location ranked by relevance to a service type.
+
+        Exact type matches come first, then tag matches; within each, the
+        location's own services come before nationwide ones, in load order.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to rank by
+            limit (int, optional): Maximum number of services to return
+
+        Returns:
+            list: Ranked list of services
+        """
+        mask, type_mask = self._masks(location, service_type)
+        rows = np.flatnonzero(mask)
+        # Rank 0-3: (tag match, nationwide) bits; a stable sort keeps load order within each
+        ranks = self._nationwide_mask[rows].astype(np.int8)
+        if type_mask is not None:
+            ranks += np.where(type_mask[rows], 0, 2).astype(np.int8)
+        rows = rows[np.argsort(ranks, kind="stable")]
+        return self._materialize(rows[:limit])
+
+    def iter_candidates(self, location, service_type=None):
+        """
+        Stream the services a location query would return, without ordering them.
+
+        The filter is evaluated as one vectorized mask; records are only looked
+        up as the caller consumes them.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to filter by
+
+        Yields:
+            tuple: (row, service), where row is the service's load position
+        """
+        mask, _ = self._masks(location, service_type)
+        rows = np.flatnonzero(mask).tolist()
+        services = self._services
+        if isinstance(services, ServiceColumns):
+            yield from zip(rows, services.records(rows))
+        else:
+            for row in rows:
+                yield row, services[row]
+
+    def nearest_services(self, latitude, longitude, service_type=None, k=5, radius_km=None):
+        """
+        Get the services nearest to a point.
+
+        Args:
+            latitude (float): Latitude of the point
+            longitude (float): Longitude of the point
+            service_type (str, optional): Only include services of this type or tag
+            k (int): Maximum number of services to return
+            radius_km (float, optional): Only include services within this distance
+
+        Returns:
+            list: (service, distance_km) tuples, nearest first
+        """
+        accept = self._category_mask(service_type)[0].item if service_type else None
+        return [
+            (self._services[row], distance)
+            for distance, row in self._spatial_index.nearest(latitude, longitude, k, radius_km, accept)
+        ]
+
+    def get_service_by_id(self, service_id):
+        """
+        Get a service by its ID.
+
+        Args:
+            service_id (str): ID of the service to retrieve
+
+        Returns:
+            dict: Service data or None if not found
+        """
+        row = self._rows_by_id.get(service_id)
+        return None if row is None else self._services[row]
+
+    def get_services_by_ids(self, service_ids):
+        """
+        Get several services by ID in a single call.
+
+        Args:
+            service_ids (iterable): IDs of the services to retrieve
+
+        Returns:
+            list: Services in the order requested, skipping unknown IDs
+        """
+        services = self._services
+        rows_by_id = self._rows_by_id
+        return [services[rows_by_id[service_id]] for service_id in service_ids if service_id in rows_by_id]
+
+    def get_all_locations(self):
+        """
+        Get a list of all unique locations in the directory.
+
+        Returns:
+            list: List of unique locations
+        """
+        return list(self._locations)
+
+    def get_all_service_types(self):
+        """
+        Get a list of all unique service types and tags in the directory.
+
+        Returns:
+            list: List of unique service types
+        """
+        return list(self._service_types)
@@ -3,7 +3,16 @@ Conversation handling logic for the Manaaki Navigator Streamlit MVP.
 This module provides functions for processing user input and generating responses.
 """
 
-from services.mock_data import get_services_by_location, get_maori_location_name
+import time
+
+from services.event_log import get_event_log
+from services.gazetteer import get_gazetteer
+from services.instrumentation import span, start_turn
+from services.metrics import record_directory_query, record_turn, register_cache
+from services.mock_data import get_maori_location_name, get_directory_state, get_directory_version
+from services.nlu import KeywordMatcher, preprocess_input
+from services.spelling import SpellingCorrector, load_lexicon
+from utils.cache import LRUCache
 
 # Define language constants
 ENGLISH = "english"
@@ -13,135 +22,240 @@ MAORI = "maori"
 GENERAL = "general"
 MAORI_RESPONSIVE = "maori-responsive"
 
+# Intent keyword tables, highest priority first. A keyword ending in "*" is a
+# stem that also matches longer words, e.g. "health*" matches "healthcare".
+INTENT_KEYWORDS = [
+    ("health_services", [
+        "health*", "doctor*", "medical", "hospital*", "gp", "hauora", "tākuta"
+    ]),
+    ("housing_assistance", [
+        "housing", "home*", "rent*", "homeless*", "whare", "kāinga"
+    ]),
+    ("financial_support", [
+        "money", "financial", "finance", "finances", "benefit*", "payment*", "pūtea", "tautoko pūtea"
+    ]),
+    ("social_support", [
+        "family", "families", "social", "support*", "community", "communities", "whānau", "hapori", "tautoko pāpori"
+    ]),
+    ("mental_health", [
+        "mental*", "anxiety", "anxious", "depress*", "stress*", "counsel*", "hinengaro"
+    ]),
+    ("greeting", [
+        "hello", "hi", "kia ora", "tēnā koe", "greetings"
+    ]),
+    ("thanks", [
+        "thank*", "helpful", "good", "great", "kia ora"
+    ]),
+    ("goodbye", [
+        "bye", "goodbye", "exit", "quit", "end", "ka kite"
+    ])
+]
+
+# Compiled once at import; each turn is a set of hash lookups over the input n-grams
+_intent_matcher = KeywordMatcher(INTENT_KEYWORDS)
+
 def detect_intent(input_text, language=ENGLISH):
     """
     Detect the user's intent based on their input text.
     
     Args:
-        input_text (str): User's input text
+        input_text (str or ProcessedInput): User's input text, or its preprocessed form
         language (str): Current language setting
     
     Returns:
         str: Detected intent
     """
-    # Normalize input
-    normalized_input = input_text.lower().strip()
-    
-    # Health-related queries
-    if any(keyword in normalized_input for keyword in [
-        "health", "doctor", "medical", "hospital", "gp", "hauora", "tākuta"
-    ]):
-        return "health_services"
-    
-    # Housing-related queries
-    elif any(keyword in normalized_input for keyword in [
-        "housing", "home", "rent", "homeless", "whare", "kāinga"
-    ]):
-        return "housing_assistance"
-    
-    # Financial assistance queries
-    elif any(keyword in normalized_input for keyword in [
-        "money", "financial", "benefit", "payment", "pūtea", "tautoko pūtea"
-    ]):
-        return "financial_support"
-    
-    # Social support queries
-    elif any(keyword in normalized_input for keyword in [
-        "family", "social", "support", "community", "whānau", "tautoko pāpori"
-    ]):
-        return "social_support"
-    
-    # Mental health queries
-    elif any(keyword in normalized_input for keyword in [
-        "mental", "anxiety", "depression", "stress", "counseling", "hinengaro"
-    ]):
-        return "mental_health"
-    
-    # Greeting queries
-    elif any(keyword in normalized_input for keyword in [
-        "hello", "hi", "kia ora", "tēnā koe", "greetings"
-    ]):
-        return "greeting"
-    
-    # Thank you queries
-    elif any(keyword in normalized_input for keyword in [
-        "thank", "thanks", "helpful", "good", "great", "kia ora"
-    ]):
-        return "thanks"
-    
-    # Goodbye queries
-    elif any(keyword in normalized_input for keyword in [
-        "bye", "goodbye", "exit", "quit", "end", "ka kite"
-    ]):
-        return "goodbye"
+    return _intent_matcher.match(preprocess_input(input_text, _spelling_corrector), default="unknown")
+
+# Service type keywords, highest priority first ("*" marks a stem, as above)
+SERVICE_TYPE_KEYWORDS = {
+    "gp": "general_practitioner",
+    "doctor*": "general_practitioner",
+    "mental*": "mental_health",
+    "counsel*": "mental_health",
+    "therapy": "mental_health",
+    "therapist": "mental_health",
+    "emergency housing": "emergency_housing",
+    "homeless*": "emergency_housing",
+    "rent*": "rental_assistance",
+    "rental": "rental_assistance",
+    "benefit*": "financial_benefit",
+    "payment*": "financial_benefit",
+    "food*": "food_assistance",
+    "dental*": "dental_care",
+    "teeth": "dental_care",
+    "child*": "child_services",
+    "family": "family_services",
+    "families": "family_services"
+}
+
+URGENCY_KEYWORDS = ["urgent*", "emergency", "now", "today", "immediately"]
+
+# Number of services listed in a response
+RESPONSE_SERVICE_LIMIT = 3
+
+_service_type_matcher = KeywordMatcher([
+    (service_type, [keyword]) for keyword, service_type in SERVICE_TYPE_KEYWORDS.items()
+])
+_urgency_matcher = KeywordMatcher([("high", URGENCY_KEYWORDS)])
+
+# Typo correction towards every keyword and place name, built once at startup;
+# real English and te reo Māori words are left alone
+_spelling_corrector = SpellingCorrector(
+    [keyword for _, keywords in INTENT_KEYWORDS for keyword in keywords]
+    + list(SERVICE_TYPE_KEYWORDS)
+    + URGENCY_KEYWORDS,
+    places=sorted(get_gazetteer().vocabulary()),
+    lexicon=load_lexicon()
+)
+
+register_cache("spelling_corrections", lambda: _spelling_corrector.stats()["cache"])
+
+def get_spelling_index_stats():
+    """
+    Get statistics for the spelling correction index.
     
-    # Default to unknown intent
-    return "unknown"
+    Returns:
+        dict: words, deletes (index entries), memory_bytes (approximate) and
+            correction cache stats
+    """
+    return _spelling_corrector.stats()
 
 def extract_entities(input_text):
     """
     Extract entities like location, service type, etc. from user input.
     
     Args:
-        input_text (str): User's input text
+        input_text (str or ProcessedInput): User's input text, or its preprocessed form
     
     Returns:
         dict: Extracted entities
     """
+    processed = preprocess_input(input_text, _spelling_corrector)
     entities = {}
     
-    # Extract location
-    locations = [
-        "auckland", "wellington", "christchurch", "hamilton", "tauranga", 
-        "dunedin", "palmerston north", "nelson", "rotorua", "whangarei",
-        "invercargill", "new plymouth", "whanganui", "gisborne", "timaru",
-        "tāmaki makaurau", "te whanganui-a-tara", "ōtautahi", "kirikiriroa"
-    ]
-    
-    for location in locations:
-        if location.lower() in input_text.lower():
-            entities["location"] = location
-            break
+    # Extract location as its canonical service region, keeping the suburb or
+    # town the user named so nearby services can be ranked by distance
+    gazetteer = get_gazetteer()
+    place = gazetteer.find(processed)
+    if place:
+        region = gazetteer.region_of(place)
+        entities["location"] = region.name
+        if region is not place:
+            entities["locality"] = place.name
     
     # Extract service types
-    service_types = {
-        "gp": "general_practitioner",
-        "doctor": "general_practitioner",
-        "mental": "mental_health",
-        "counseling": "mental_health",
-        "therapy": "mental_health",
-        "emergency housing": "emergency_housing",
-        "homeless": "emergency_housing",
-        "rent": "rental_assistance",
-        "benefit": "financial_benefit",
-        "payment": "financial_benefit",
-        "food": "food_assistance",
-        "dental": "dental_care",
-        "teeth": "dental_care",
-        "child": "child_services",
-        "family": "family_services"
-    }
-    
-    for keyword, service_type in service_types.items():
-        if keyword.lower() in input_text.lower():
-            entities["service_type"] = service_type
-            break
+    service_type = _service_type_matcher.match(processed)
+    if service_type:
+        entities["service_type"] = service_type
     
     # Extract urgency
-    if any(keyword in input_text.lower() for keyword in [
-        "urgent", "emergency", "now", "today", "immediately"
-    ]):
-        entities["urgency"] = "high"
+    urgency = _urgency_matcher.match(processed)
+    if urgency:
+        entities["urgency"] = urgency
     
     return entities
 
-def generate_response(intent, context):
+# Default responses for unknown intents
+DEFAULT_RESPONSES = {
+    ENGLISH: {
+        "text": "I'm here to help you find services. What kind of help are you looking for today?",
+        "options": ["Health services", "Housing help", "Financial support", "Social services"]
+    },
+    MAORI: {
+        "text": "Kei konei ahau hei āwhina i a koe. He aha te momo āwhina e hiahiatia ana e koe i tēnei rā?",
+        "options": ["Ratonga hauora", "Āwhina whare", "Tautoko pūtea", "Ratonga pāpori"]
+    }
+}
+
+# Responses are a pure function of intent plus a few context fields, so they
+# are cached until the service directory changes
+RESPONSE_CACHE_SIZE = 512
+_response_cache = LRUCache(RESPONSE_CACHE_SIZE, version_source=get_directory_version)
+register_cache("responses", _response_cache.stats)
+
+def _response_cache_key(intent, context):
+    """
+    Build the response cache key for an intent and context.
+    
+    Fields an intent's response does not depend on are left out of the key,
+    so e.g. every English "thanks" turn shares one entry.
+    
+    Args:
+        intent (str): Detected intent
+        context (dict): Conversation context
+    
+    Returns:
+        tuple: (intent, language, cultural_mode, location, service_type)
+    """
+    language = context.get("language", ENGLISH)
+    cultural_mode = None
+    location = None
+    service_type = None
+    
+    if intent == "greeting" and language != MAORI:
+        cultural_mode = context.get("cultural_mode", GENERAL)
+    elif intent == "health_services":
+        location = context.get("location", "")
+        service_type = context.get("service_type", "")
+    elif intent == "housing_assistance":
+        service_type = context.get("service_type", "") == "emergency_housing"
+    
+    return (intent, language, cultural_mode, location, service_type)
+
+def get_response_cache_stats():
+    """
+    Get response cache statistics.
+    
+    Returns:
+        dict: hits, misses, evictions, invalidations, size, maxsize and hit_ratio
+    """
+    return _response_cache.stats()
+
+def clear_response_cache():
+    """Drop every cached response."""
+    _response_cache.clear()
+
+def generate_response(intent, context, services=None, directory_state=None):
     """
     Generate a response based on the detected intent and conversation context.
     
+    Responses are served from a bounded LRU cache keyed on intent, language,
+    cultural mode, location and service type when possible.
+    
+    Args:
+        intent (str): Detected intent
+        context (dict): Conversation context including language, cultural mode, etc.
+        services (list, optional): Services already looked up for the context's
+            location and service type; queried from the directory if not given
+        directory_state (tuple, optional): (directory, version) pinned for the turn;
+            defaults to the active directory
+    
+    Returns:
+        dict: Response containing text, options, and any other relevant data
+    """
+    cache_key = _response_cache_key(intent, context)
+    response = _response_cache.get(cache_key)
+    if response is None:
+        # Tag the entry with the directory version it was built from, so a
+        # response built while the directory is being replaced is not kept
+        directory, version = directory_state or get_directory_state()
+        response = _build_response(intent, context, services, directory)
+        _response_cache.put(cache_key, response, version)
+    
+    # Callers get their own dict and lists so cached entries cannot be modified
+    return {key: list(value) if isinstance(value, list) else value for key, value in response.items()}
+
+def _build_response(intent, context, services=None, directory=None):
+    """
+    Build a response for an intent and context without consulting the cache.
+    
     Args:
         intent (str): Detected intent
         context (dict): Conversation context including language, cultural mode, etc.
+        services (list, optional): Services already looked up for the context's
+            location and service type; queried from the directory if not given
+        directory (ServiceDirectory, optional): Directory to query, defaults to the active one
     
     Returns:
         dict: Response containing text, options, and any other relevant data
@@ -151,18 +265,6 @@ def generate_response(intent, context):
     location = context.get("location", "")
     service_type = context.get("service_type", "")
     
-    # Default responses
-    default_response = {
-        ENGLISH: {
-            "text": "I'm here to help you find services. What kind of help are you looking for today?",
-            "options": ["Health services", "Housing help", "Financial support", "Social services"]
-        },
-        MAORI: {
-            "text": "Kei konei ahau hei āwhina i a koe. He aha te momo āwhina e hiahiatia ana e koe i tēnei rā?",
-            "options": ["Ratonga hauora", "Āwhina whare", "Tautoko pūtea", "Ratonga pāpori"]
-        }
-    }
-    
     # Intent-based responses
     if intent == "greeting":
         if language == MAORI:
@@ -185,7 +287,12 @@ def generate_response(intent, context):
     elif intent == "health_services":
         # If we have location, provide location-specific services
         if location:
-            services = get_services_by_location(location, service_type)
+            if services is None:
+                directory = directory or get_directory_state()[0]
+                with span("directory_query"):
+                    started = time.perf_counter()
+                    services = directory.get_services_by_location(location, service_type, RESPONSE_SERVICE_LIMIT)
+                    record_directory_query("services_by_location", time.perf_counter() - started, len(services))
             if services:
                 if language == MAORI:
                     maori_location = get_maori_location_name(location)
@@ -302,7 +409,7 @@ def generate_response(intent, context):
             }
     
     # Default to unknown intent response
-    return default_response.get(language, default_response[ENGLISH])
+    return DEFAULT_RESPONSES.get(language, DEFAULT_RESPONSES[ENGLISH])
 
 def process_user_input(input_text, context):
     """
@@ -313,23 +420,178 @@ def process_user_input(input_text, context):
         context (dict): Current conversation context
     
     Returns:
-        dict: Updated context and response
+        dict: Updated context, response, intent, entities and the spelling
+            corrections applied, as (original, corrected) pairs
     """
+    started = time.perf_counter()
+    
+    # Stage timings, or None when instrumentation is off
+    timer = start_turn()
+    
+    # Every directory lookup in this turn reads the same directory, even if a
+    # reload swaps in a new one part-way through
+    directory_state = get_directory_state()
+    
+    # Normalize and tokenize once, shared by intent detection and entity extraction
+    processed = preprocess_input(input_text, _spelling_corrector)
+    if timer:
+        timer.lap("preprocess")
+    
     # Detect intent from user input
-    intent = detect_intent(input_text, context.get("language", ENGLISH))
+    intent = detect_intent(processed, context.get("language", ENGLISH))
+    if timer:
+        timer.lap("detect_intent")
     
     # Extract entities from user input
-    entities = extract_entities(input_text)
+    entities = extract_entities(processed)
+    if timer:
+        timer.lap("extract_entities")
     
     # Update context with extracted entities
-    updated_context = {**context, **entities}
+    updated_context = _update_context(context, entities)
+    if timer:
+        timer.lap("update_context")
     
     # Generate response based on intent and updated context
-    response = generate_response(intent, updated_context)
-    
-    return {
+    response = generate_response(intent, updated_context, directory_state=directory_state)
+    if timer:
+        timer.lap("generate_response")
+        timer.finish(intent)
+    elapsed = time.perf_counter() - started
+    record_turn(intent, elapsed)
+    
+    result = {
         "context": updated_context,
         "response": response,
         "intent": intent,
-        "entities": entities
+        "entities": entities,
+        "corrections": processed.corrections
     }
+    
+    # Queue the turn for the event log's writer thread, if logging is on
+    event_log = get_event_log()
+    if event_log is not None:
+        event_log.log_turn(input_text, context, result, elapsed)
+    
+    return result
+
+def _update_context(context, entities):
+    """
+    Merge a turn's entities into the conversation context.
+    
+    Args:
+        context (dict): Current conversation context
+        entities (dict): Entities extracted from the turn
+    
+    Returns:
+        dict: Updated context
+    """
+    updated_context = {**context, **entities}
+    # A newly named region replaces any suburb or town from an earlier turn
+    if "location" in entities and "locality" not in entities:
+        updated_context.pop("locality", None)
+    return updated_context
+
+def _directory_query_key(context):
+    """
+    Get the directory query a context would trigger, for grouping batch turns.
+    
+    Args:
+        context (dict): Conversation context
+    
+    Returns:
+        tuple: (normalized location, service type)
+    """
+    return (context.get("location", "").lower(), context.get("service_type") or None)
+
+def process_user_inputs(requests):
+    """
+    Process a batch of user inputs, e.g. turns from many sessions at once.
+    
+    Normalization, intent detection and entity extraction run once per
+    distinct input text, and each directory query runs at most once per
+    (location, service type) group across the whole batch, only for turns
+    whose response is not already cached. Every turn is timed, counted and
+    logged exactly as process_user_input would; a turn's latency covers the
+    work done for it, including any directory query it triggered.
+    
+    Args:
+        requests (list): (input_text, context) pairs
+    
+    Returns:
+        list: Results in request order, each shaped like process_user_input's
+    """
+    # Every turn in the batch reads the same directory
+    directory_state = get_directory_state()
+    directory = directory_state[0]
+    
+    # Understand each distinct input once
+    understood = {}
+    turns = []
+    for input_text, context in requests:
+        started = time.perf_counter()
+        timer = start_turn()
+        known = understood.get(input_text)
+        if known is None:
+            processed = preprocess_input(input_text, _spelling_corrector)
+            if timer:
+                timer.lap("preprocess")
+            intent = detect_intent(processed, context.get("language", ENGLISH))
+            if timer:
+                timer.lap("detect_intent")
+            entities = extract_entities(processed)
+            if timer:
+                timer.lap("extract_entities")
+            known = understood[input_text] = (intent, entities, processed.corrections)
+        elif timer:
+            # Already understood for an earlier turn: these stages cost nothing here
+            for stage in ("preprocess", "detect_intent", "extract_entities"):
+                timer.lap(stage)
+        intent, entities, corrections = known
+        updated_context = _update_context(context, entities)
+        if timer:
+            timer.lap("update_context")
+        turns.append((input_text, context, intent, dict(entities), corrections, updated_context,
+                      timer, time.perf_counter() - started))
+    
+    services_by_query = {}
+    results = []
+    for input_text, context, intent, entities, corrections, updated_context, timer, elapsed in turns:
+        started = time.perf_counter()
+        if timer:
+            timer.skip()
+        
+        # Query the directory once per group, and only for responses that
+        # are not cached yet; the query counts towards the turn that needed it
+        services = None
+        if (intent == "health_services" and updated_context.get("location")
+                and _response_cache_key(intent, updated_context) not in _response_cache):
+            query_key = _directory_query_key(updated_context)
+            services = services_by_query.get(query_key)
+            if services is None:
+                with span("directory_query"):
+                    query_started = time.perf_counter()
+                    services = directory.get_services_by_location(*query_key, RESPONSE_SERVICE_LIMIT)
+                    record_directory_query("services_by_location", time.perf_counter() - query_started, len(services))
+                services_by_query[query_key] = services
+        
+        response = generate_response(intent, updated_context, services, directory_state)
+        if timer:
+            timer.lap("generate_response")
+            timer.finish(intent)
+        elapsed += time.perf_counter() - started
+        record_turn(intent, elapsed)
+        
+        result = {
+            "context": updated_context,
+            "response": response,
+            "intent": intent,
+            "entities": entities,
+            "corrections": corrections
+        }
+        event_log = get_event_log()
+        if event_log is not None:
+            event_log.log_turn(input_text, context, result, elapsed)
+        results.append(result)
+    
+    return results
@@ -0,0 +1,285 @@
+"""
+Indexed service directory for the Manaaki Navigator Streamlit MVP.
+This module provides a directory class that answers location, type and tag
+queries from prebuilt inverted indexes instead of scanning every service.
+"""
+
+import heapq
+import itertools
+import os
+from types import MappingProxyType
+
+from services.geo import GridIndex
+from services.projections import LocalizedViewsMixin
+
+NATIONWIDE = "nationwide"
+
+# Directory implementations selectable with MANAAKI_DIRECTORY_BACKEND
+DEFAULT_BACKEND = "indexed"
+BACKENDS = ("indexed", "columnar")
+
+def create_directory(services, backend=None):
+    """
+    Build a service directory with the requested backend.
+    
+    Args:
+        services (iterable): Service records
+        backend (str, optional): "indexed" (hash indexes) or "columnar" (pandas/NumPy);
+            defaults to MANAAKI_DIRECTORY_BACKEND or "indexed"
+    
+    Returns:
+        Directory object exposing the ServiceDirectory query methods
+    
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = backend or os.environ.get("MANAAKI_DIRECTORY_BACKEND", DEFAULT_BACKEND)
+    if backend == "indexed":
+        return ServiceDirectory(services)
+    if backend == "columnar":
+        from services.columnar_directory import ColumnarServiceDirectory
+        return ColumnarServiceDirectory(services)
+    raise ValueError(f"Unknown directory backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+class ServiceDirectory(LocalizedViewsMixin):
+    """
+    Read-only service directory with inverted indexes over location, type and tags.
+
+    Services are referenced internally by their row number in the directory,
+    so query results keep the order in which services were loaded.
+    """
+
+    def __init__(self, services):
+        """
+        Build the directory and its indexes.
+
+        Args:
+            services (iterable): Service records (dicts) to index
+        """
+        self._services = list(services)
+
+        # Frozen id -> record map for constant-time lookups
+        self._services_by_id = MappingProxyType({
+            service["id"]: service for service in self._services
+        })
+
+        # Inverted indexes: normalized value -> set of row numbers
+        self._location_index = {}
+        self._type_index = {}
+        self._tag_index = {}
+
+        for row, service in enumerate(self._services):
+            self._location_index.setdefault(service["location"].lower(), set()).add(row)
+            self._type_index.setdefault(service["type"], set()).add(row)
+            for tag in service["tags"]:
+                self._tag_index.setdefault(tag, set()).add(row)
+
+        # Precompute "location ∪ nationwide" for every region, kept in load order
+        self._nationwide_rows = frozenset(self._location_index.get(NATIONWIDE, ()))
+        self._nationwide_ordered = tuple(sorted(self._nationwide_rows))
+        self._regional_index = {}
+        # Each region's own rows in load order, for rankings that list nationwide services last
+        self._local_ordered = {}
+        for location, rows in self._location_index.items():
+            if location == NATIONWIDE:
+                continue
+            regional_rows = frozenset(rows | self._nationwide_rows)
+            self._regional_index[location] = (regional_rows, tuple(sorted(regional_rows)))
+            self._local_ordered[location] = tuple(sorted(rows))
+
+        self._locations = sorted({
+            service["location"] for service in self._services
+            if service["location"].lower() != NATIONWIDE
+        })
+        self._service_types = sorted(set(self._type_index) | set(self._tag_index))
+
+        # Spatial index over services with coordinates (nationwide services have none)
+        self._spatial_index = GridIndex.from_services(self._services)
+
+    def __len__(self):
+        return len(self._services)
+
+    def __iter__(self):
+        return iter(self._services)
+
+    @property
+    def services_by_id(self):
+        """Read-only mapping of service id to service record."""
+        return self._services_by_id
+
+    def _regional_rows(self, location):
+        """
+        Get the rows available in a location, including nationwide services.
+
+        Args:
+            location (str): Location to look up
+
+        Returns:
+            tuple: (frozenset of rows, tuple of rows in load order)
+        """
+        return self._regional_index.get(
+            location.lower(), (self._nationwide_rows, self._nationwide_ordered)
+        )
+
+    def _category_rows(self, service_type):
+        """
+        Get the rows whose type is service_type or that carry it as a tag.
+
+        Args:
+            service_type (str): Service type or tag
+
+        Returns:
+            set: Matching row numbers (may be an index set itself; do not modify)
+        """
+        type_rows = self._type_index.get(service_type)
+        tag_rows = self._tag_index.get(service_type)
+        if not tag_rows:
+            return type_rows or set()
+        if not type_rows:
+            return tag_rows
+        return type_rows | tag_rows
+
+    def get_services_by_location(self, location, service_type=None, limit=None):
+        """
+        Filter services by location and optionally by service type.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to filter by
+            limit (int, optional): Maximum number of services to return
+
+        Returns:
+            list: Filtered list of services
+        """
+        regional_rows, ordered_rows = self._regional_rows(location)
+
+        if not service_type:
+            return [self._services[row] for row in ordered_rows[:limit]]
+
+        rows = regional_rows & self._category_rows(service_type)
+        rows = sorted(rows) if limit is None else heapq.nsmallest(limit, rows)
+        return [self._services[row] for row in rows]
+
+    def match_services(self, location, service_type=None, limit=None):
+        """
+        Get services for a location ranked by relevance to a service type.
+
+        Exact type matches come first, then tag matches; within each, the
+        location's own services come before nationwide ones, in load order.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to rank by
+            limit (int, optional): Maximum number of services to return
+
+        Returns:
+            list: Ranked list of services
+        """
+        if not service_type:
+            local_rows = self._local_ordered.get(location.lower(), ())
+            rows = itertools.islice(itertools.chain(local_rows, self._nationwide_ordered), limit)
+            return [self._services[row] for row in rows]
+
+        regional_rows = self._regional_rows(location)[0]
+        type_rows = self._type_index.get(service_type, set())
+        nationwide_rows = self._nationwide_rows
+        rows = regional_rows & self._category_rows(service_type)
+
+        def rank(row):
+            return (0 if row in type_rows else 1, row in nationwide_rows, row)
+
+        rows = sorted(rows, key=rank) if limit is None else heapq.nsmallest(limit, rows, key=rank)
+        return [self._services[row] for row in rows]
+
+    def iter_candidates(self, location, service_type=None):
+        """
+        Stream the services a location query would return, without ordering them.
+
+        Args:
+            location (str): Location to filter by
+            service_type (str, optional): Service type to filter by
+
+        Yields:
+            tuple: (row, service), where row is the service's load position
+        """
+        regional_rows = self._regional_rows(location)[0]
+        if not service_type:
+            rows, required = regional_rows, None
+        else:
+            # Walk the smaller set and test membership in the larger one
+            category_rows = self._category_rows(service_type)
+            if len(category_rows) < len(regional_rows):
+                rows, required = category_rows, regional_rows
+            else:
+                rows, required = regional_rows, category_rows
+
+        services = self._services
+        for row in rows:
+            if required is None or row in required:
+                yield row, services[row]
+
+    def nearest_services(self, latitude, longitude, service_type=None, k=5, radius_km=None):
+        """
+        Get the services nearest to a point.
+
+        Args:
+            latitude (float): Latitude of the point
+            longitude (float): Longitude of the point
+            service_type (str, optional): Only include services of this type or tag
+            k (int): Maximum number of services to return
+            radius_km (float, optional): Only include services within this distance
+
+        Returns:
+            list: (service, distance_km) tuples, nearest first
+        """
+        accept = self._category_rows(service_type).__contains__ if service_type else None
+        return [
+            (self._services[row], distance)
+            for distance, row in self._spatial_index.nearest(latitude, longitude, k, radius_km, accept)
+        ]
+
+    def get_service_by_id(self, service_id):
+        """
+        Get a service by its ID.
+
+        Args:
+            service_id (str): ID of the service to retrieve
+
+        Returns:
+            dict: Service data or None if not found
+        """
+        return self._services_by_id.get(service_id)
+
+    def get_services_by_ids(self, service_ids):
+        """
+        Get several services by ID in a single call.
+
+        Args:
+            service_ids (iterable): IDs of the services to retrieve
+
+        Returns:
+            list: Services in the order requested, skipping unknown IDs
+        """
+        services_by_id = self._services_by_id
+        return [
+            services_by_id[service_id] for service_id in service_ids
+            if service_id in services_by_id
+        ]
+
+    def get_all_locations(self):
+        """
+        Get a list of all unique locations in the directory.
+
+        Returns:
+            list: List of unique locations
+        """
+        return list(self._locations)
+
+    def get_all_service_types(self):
+        """
+        Get a list of all unique service types and tags in the directory.
+
+        Returns:
+            list: List of unique service types
+        """
+        return list(self._service_types)
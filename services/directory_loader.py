@@ -0,0 +1,422 @@
+"""
+On-disk service directory loading for the Manaaki Navigator Streamlit MVP.
+This module reads a service directory from CSV or JSON, converts it once into a
+compact binary snapshot, and memory-maps that snapshot on later starts so workers
+do not re-parse text on every startup.
+
+Usage:
+    python -m services.directory_loader services.csv [services.csv.mnsd]
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+from services.directory import create_directory
+
+# Fields every service record must provide
+REQUIRED_FIELDS = ("id", "name", "location", "type")
+
+# Scalar fields stored in a snapshot, in column order (tags are stored separately)
+SNAPSHOT_FIELDS = (
+    "id", "name", "name_maori", "location", "address", "phone", "website", "type",
+    "description", "description_maori", "eligibility", "hours", "cost", "latitude", "longitude"
+)
+
+SNAPSHOT_SUFFIX = ".mnsd"
+
+# Header: magic, format version, record count, field count, string count,
+# tag reference count, source file size, source file mtime (ns)
+_SNAPSHOT_MAGIC = b"MNSD"
+_SNAPSHOT_VERSION = 2
+_HEADER = struct.Struct("<4sIIIIIQQ")
+_MISSING = 0xFFFFFFFF
+
+def _normalize_tags(value):
+    """
+    Normalize a tags cell from CSV ("a;b" or "a|b") or JSON (list) into a list.
+
+    Args:
+        value: Raw tags value
+
+    Returns:
+        list: Tags
+    """
+    if isinstance(value, str):
+        value = value.replace("|", ";").split(";")
+    elif not isinstance(value, (list, tuple)):
+        return []
+    return [str(tag).strip() for tag in value if str(tag).strip()]
+
+def _normalize_record(raw, row_number):
+    """
+    Clean one raw row into a service record.
+
+    Empty optional fields are dropped so lookups like
+    service.get("name_maori", service["name"]) fall back as expected.
+
+    Args:
+        raw (dict): Raw row
+        row_number (int): 1-based row number, for error messages
+
+    Returns:
+        dict: Service record
+
+    Raises:
+        ValueError: If a required field is missing
+    """
+    record = {}
+    for field, value in raw.items():
+        if field == "tags":
+            continue
+        if value is None or (isinstance(value, float) and value != value):
+            continue
+        value = str(value).strip()
+        if value:
+            record[field] = value
+
+    missing = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing:
+        raise ValueError(f"Row {row_number}: missing required field(s) {', '.join(missing)}")
+
+    record["tags"] = _normalize_tags(raw.get("tags"))
+    return record
+
+def read_services(path):
+    """
+    Read service records from a CSV, JSON or JSON Lines file.
+
+    Args:
+        path (str): Path to the directory file
+
+    Returns:
+        list: Service records
+
+    Raises:
+        ValueError: If the format is unsupported, a row is invalid or IDs repeat
+    """
+    import pandas as pd
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    elif extension == ".json":
+        frame = pd.read_json(path, orient="records", dtype=False)
+    elif extension in (".jsonl", ".ndjson"):
+        frame = pd.read_json(path, orient="records", lines=True, dtype=False)
+    else:
+        raise ValueError(f"Unsupported directory format: {path}")
+
+    services = [
+        _normalize_record(raw, row_number)
+        for row_number, raw in enumerate(frame.to_dict("records"), start=1)
+    ]
+
+    seen_ids = set()
+    for service in services:
+        if service["id"] in seen_ids:
+            raise ValueError(f"Duplicate service id: {service['id']}")
+        seen_ids.add(service["id"])
+
+    return services
+
+def _native_u32(values):
+    """
+    Build a little-endian uint32 array regardless of platform byte order.
+
+    Args:
+        values (iterable): Integers to store
+
+    Returns:
+        array: Array ready to write to a snapshot
+    """
+    result = array("I", values)
+    if sys.byteorder != "little":
+        result.byteswap()
+    return result
+
+def write_snapshot(services, path, source_stat=None):
+    """
+    Write service records to a binary snapshot.
+
+    Every distinct string is stored once in a shared string table, and records
+    are rows of string ids, so repeated values (hours, costs, eligibility) cost
+    four bytes per use. The file is written to a temporary name and renamed into
+    place so readers never see a partial snapshot.
+
+    Args:
+        services (list): Service records
+        path (str): Snapshot path
+        source_stat (os.stat_result, optional): Stat of the source file, used to detect stale snapshots
+    """
+    string_ids = {}
+    strings = []
+
+    def intern(value):
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    field_ids = [intern(field) for field in SNAPSHOT_FIELDS]
+
+    cells = []
+    tag_offsets = [0]
+    tag_refs = []
+    for service in services:
+        for field in SNAPSHOT_FIELDS:
+            cells.append(intern(str(service[field])) if field in service else _MISSING)
+        tag_refs.extend(intern(tag) for tag in service.get("tags", ()))
+        tag_offsets.append(len(tag_refs))
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = [0]
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+
+    header = _HEADER.pack(
+        _SNAPSHOT_MAGIC,
+        _SNAPSHOT_VERSION,
+        len(services),
+        len(SNAPSHOT_FIELDS),
+        len(strings),
+        len(tag_refs),
+        source_stat.st_size if source_stat else 0,
+        source_stat.st_mtime_ns if source_stat else 0
+    )
+
+    temporary_path = f"{path}.tmp{os.getpid()}"
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(header)
+        for section in (field_ids, string_offsets, cells, tag_offsets, tag_refs):
+            _native_u32(section).tofile(snapshot_file)
+        for data in encoded:
+            snapshot_file.write(data)
+    os.replace(temporary_path, path)
+
+class SnapshotRecord(Mapping):
+    """
+    Read-only service record backed by a memory-mapped snapshot.
+
+    Field values are decoded from the snapshot's string table on first access.
+    """
+
+    __slots__ = ("_snapshot", "_row")
+
+    def __init__(self, snapshot, row):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, field):
+        value = self._snapshot._field_value(self._row, field)
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __iter__(self):
+        for field in self._snapshot.fields:
+            if self._snapshot._field_value(self._row, field) is not None:
+                yield field
+        yield "tags"
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"SnapshotRecord({dict(self)!r})"
+
+class DirectorySnapshot(Sequence):
+    """
+    Memory-mapped service directory snapshot.
+
+    Opening a snapshot only reads the header and maps the file; strings are
+    decoded lazily and cached, so startup cost does not depend on the size of
+    descriptions and other free text.
+    """
+
+    def __init__(self, path):
+        """
+        Open a snapshot file.
+
+        Args:
+            path (str): Snapshot path
+
+        Raises:
+            ValueError: If the file is not a snapshot or uses another format version
+        """
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, record_count, field_count, string_count, tag_ref_count,
+         self.source_size, self.source_mtime_ns) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise ValueError(f"Not a version {_SNAPSHOT_VERSION} directory snapshot: {path}")
+
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+
+        def section(count):
+            nonlocal offset
+            values = view[offset:offset + count * 4].cast("I")
+            offset += count * 4
+            if sys.byteorder != "little":
+                values = array("I", values)
+                values.byteswap()
+            return values
+
+        field_ids = section(field_count)
+        self._string_offsets = section(string_count + 1)
+        self._cells = section(record_count * field_count)
+        self._tag_offsets = section(record_count + 1)
+        self._tag_refs = section(tag_ref_count)
+        self._string_base = offset
+
+        self._strings = [None] * string_count
+        self._record_count = record_count
+        self._field_count = field_count
+        self.fields = tuple(self._string(string_id) for string_id in field_ids)
+        self._field_columns = {field: column for column, field in enumerate(self.fields)}
+
+    def _string(self, string_id):
+        """
+        Decode a string from the string table, caching the result.
+
+        Args:
+            string_id (int): String id
+
+        Returns:
+            str: Decoded string
+        """
+        value = self._strings[string_id]
+        if value is None:
+            start = self._string_base + self._string_offsets[string_id]
+            end = self._string_base + self._string_offsets[string_id + 1]
+            value = self._mmap[start:end].decode("utf-8")
+            self._strings[string_id] = value
+        return value
+
+    def _field_value(self, row, field):
+        """
+        Get one field of one record.
+
+        Args:
+            row (int): Record row
+            field (str): Field name
+
+        Returns:
+            Field value, or None if the record does not have the field
+        """
+        if field == "tags":
+            start, end = self._tag_offsets[row], self._tag_offsets[row + 1]
+            return [self._string(string_id) for string_id in self._tag_refs[start:end]]
+
+        column = self._field_columns.get(field)
+        if column is None:
+            return None
+        string_id = self._cells[row * self._field_count + column]
+        if string_id == _MISSING:
+            return None
+        return self._string(string_id)
+
+    def is_current(self, source_path):
+        """
+        Check whether the snapshot was built from the current version of a source file.
+
+        Args:
+            source_path (str): Source CSV/JSON path
+
+        Returns:
+            bool: True if size and modification time still match
+        """
+        try:
+            source_stat = os.stat(source_path)
+        except OSError:
+            return False
+        return (source_stat.st_size, source_stat.st_mtime_ns) == (self.source_size, self.source_mtime_ns)
+
+    def __len__(self):
+        return self._record_count
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[index] for index in range(*row.indices(self._record_count))]
+        if row < 0:
+            row += self._record_count
+        if not 0 <= row < self._record_count:
+            raise IndexError("snapshot record index out of range")
+        return SnapshotRecord(self, row)
+
+def build_snapshot(source_path, snapshot_path=None):
+    """
+    Convert a CSV/JSON directory file into a binary snapshot.
+
+    Args:
+        source_path (str): Source CSV/JSON path
+        snapshot_path (str, optional): Snapshot path, defaults to the source path plus ".mnsd"
+
+    Returns:
+        list: Service records read from the source
+    """
+    snapshot_path = snapshot_path or source_path + SNAPSHOT_SUFFIX
+    source_stat = os.stat(source_path)
+    services = read_services(source_path)
+    write_snapshot(services, snapshot_path, source_stat)
+    return services
+
+def load_directory(path, snapshot_path=None, backend=None):
+    """
+    Load a service directory from disk, using a snapshot when it is up to date.
+
+    A path ending in ".mnsd" is opened directly as a snapshot. Otherwise the
+    snapshot next to the source file is used if it matches the source's size
+    and modification time, and rebuilt from the source if not.
+
+    Args:
+        path (str): Directory file (CSV, JSON, JSON Lines or snapshot)
+        snapshot_path (str, optional): Snapshot path, defaults to the source path plus ".mnsd"
+        backend (str, optional): Directory backend, see services.directory.create_directory
+
+    Returns:
+        ServiceDirectory: Loaded directory
+    """
+    if path.endswith(SNAPSHOT_SUFFIX):
+        return create_directory(DirectorySnapshot(path), backend)
+
+    snapshot_path = snapshot_path or path + SNAPSHOT_SUFFIX
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = DirectorySnapshot(snapshot_path)
+        except ValueError:
+            snapshot = None
+        if snapshot is not None and snapshot.is_current(path):
+            return create_directory(snapshot, backend)
+
+    return create_directory(build_snapshot(path, snapshot_path), backend)
+
+def main(argv=None):
+    """
+    Command-line entry point: build a snapshot from a CSV/JSON directory file.
+
+    Args:
+        argv (list, optional): Command-line arguments
+
+    Returns:
+        int: Process exit status
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not 1 <= len(argv) <= 2:
+        print("Usage: python -m services.directory_loader SOURCE [SNAPSHOT]", file=sys.stderr)
+        return 2
+
+    source_path = argv[0]
+    snapshot_path = argv[1] if len(argv) == 2 else source_path + SNAPSHOT_SUFFIX
+    services = build_snapshot(source_path, snapshot_path)
+    print(f"Wrote {len(services)} services to {snapshot_path} ({os.path.getsize(snapshot_path)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Directory hot reloading for the Manaaki Navigator Streamlit MVP.
+This module watches the directory file named by MANAAKI_DIRECTORY_PATH and, when it
+changes, loads the new directory and builds all of its indexes on a background
+thread before swapping it in. Sessions already holding the previous directory keep
+using it unchanged, and no session ever sees a partly built directory.
+"""
+
+import os
+import threading
+import time
+
+from services.directory_loader import load_directory
+from services.mock_data import get_directory, set_directory
+from services.search import get_search_index
+
+# Seconds between checks of the directory file; 0 disables watching
+DEFAULT_POLL_SECONDS = 5.0
+
+def file_signature(path):
+    """
+    Get what identifies one version of a file.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        tuple: (modification time in ns, size, inode), or None if the file is missing
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def prepare_directory(directory):
+    """
+    Build every index a directory would otherwise build on first use.
+
+    Args:
+        directory (ServiceDirectory): Directory to prepare
+
+    Returns:
+        ServiceDirectory: The same directory, ready to serve
+    """
+    directory.warm_localized_views()
+    get_search_index(directory)
+    return directory
+
+class DirectoryWatcher:
+    """
+    Polls a directory file and swaps in a fully built directory when it changes.
+
+    A change is applied once the file has looked the same on two consecutive
+    checks, so a file that is still being written is not loaded half-way.
+    Directories are never modified after they are built: a reload builds a new
+    one and replaces the active (directory, version) pair in a single step.
+    """
+
+    def __init__(self, path, interval=DEFAULT_POLL_SECONDS, backend=None):
+        """
+        Create a watcher for a directory file.
+
+        Args:
+            path (str): Directory file (CSV, JSON, JSON Lines or snapshot)
+            interval (float): Seconds between checks
+            backend (str, optional): Directory backend, see services.directory.create_directory
+        """
+        self.path = path
+        self.interval = interval
+        self.backend = backend
+        self._loaded_signature = file_signature(path)
+        self._pending_signature = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._reloads = 0
+        self._failures = 0
+        self._last_reload_seconds = None
+        self._last_error = None
+
+    def start(self):
+        """Start checking the file on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="directory-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop checking the file.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread to finish
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        # Build the initial directory's indexes here rather than in the first request
+        prepare_directory(get_directory())
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """
+        Check the file once and reload it if it has changed and settled.
+
+        Returns:
+            bool: True if a new directory was swapped in
+        """
+        signature = file_signature(self.path)
+        if signature is None or signature == self._loaded_signature:
+            self._pending_signature = None
+            return False
+        if signature != self._pending_signature:
+            # Changed since the last check; wait for it to stop changing
+            self._pending_signature = signature
+            return False
+        return self.reload(signature)
+
+    def reload(self, signature=None):
+        """
+        Load and prepare the directory file now, then make it active.
+
+        If loading fails the active directory is kept, and the same version of
+        the file is not tried again.
+
+        Args:
+            signature (tuple, optional): File signature read before loading
+
+        Returns:
+            bool: True if a new directory was swapped in
+        """
+        signature = signature or file_signature(self.path)
+        self._loaded_signature = signature
+        self._pending_signature = None
+        start = time.perf_counter()
+        try:
+            directory = prepare_directory(load_directory(self.path, backend=self.backend))
+        except Exception as error:  # keep serving the previous directory
+            self._failures += 1
+            self._last_error = f"{type(error).__name__}: {error}"
+            return False
+        set_directory(directory)
+        self._reloads += 1
+        self._last_reload_seconds = time.perf_counter() - start
+        self._last_error = None
+        return True
+
+    def stats(self):
+        """
+        Get reload statistics.
+
+        Returns:
+            dict: path, running, reloads, failures, last_reload_seconds and last_error
+        """
+        return {
+            "path": self.path,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "reloads": self._reloads,
+            "failures": self._failures,
+            "last_reload_seconds": self._last_reload_seconds,
+            "last_error": self._last_error
+        }
+
+# Process-wide watcher; Streamlit reruns the app script on every interaction
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def start_directory_watcher(path=None, interval=None, backend=None):
+    """
+    Start watching the directory file, once per process.
+
+    Args:
+        path (str, optional): Directory file, defaults to MANAAKI_DIRECTORY_PATH
+        interval (float, optional): Seconds between checks, defaults to
+            MANAAKI_DIRECTORY_POLL_SECONDS or DEFAULT_POLL_SECONDS
+        backend (str, optional): Directory backend, see services.directory.create_directory
+
+    Returns:
+        DirectoryWatcher: The running watcher, or None if there is no file to
+            watch or watching is disabled
+    """
+    global _watcher
+    if _watcher is not None:
+        return _watcher
+
+    path = path or os.environ.get("MANAAKI_DIRECTORY_PATH")
+    if interval is None:
+        interval = float(os.environ.get("MANAAKI_DIRECTORY_POLL_SECONDS", DEFAULT_POLL_SECONDS))
+    if not path or interval <= 0:
+        return None
+
+    with _watcher_lock:
+        if _watcher is None:
+            watcher = DirectoryWatcher(path, interval, backend)
+            watcher.start()
+            _watcher = watcher
+    return _watcher
+
+def get_directory_watcher():
+    """
+    Get the process-wide watcher.
+
+    Returns:
+        DirectoryWatcher: The watcher, or None if it has not been started
+    """
+    return _watcher
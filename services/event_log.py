@@ -0,0 +1,424 @@
+"""
+Conversation event log for the Manaaki Navigator Streamlit MVP.
+This module appends one JSON Lines record per conversation turn (session, the
+entities remembered from earlier turns, input, intent, entities, latency and the
+response with its service IDs) to the file named
+by MANAAKI_EVENT_LOG_PATH. Records are handed to a background writer thread through
+a bounded queue, so a chat turn never waits on disk I/O. The writer writes records
+in batches, fsyncs at most once per FSYNC_SECONDS, and rotates the file once it
+reaches MAX_BYTES; a separate thread compresses rotated files into gzip archives.
+Write errors are counted and reported in stats(), and the writer keeps draining
+the queue, so a failing disk never blocks a turn.
+"""
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+
+from services.metrics import Counter
+
+# What log() does when the queue is full: drop the record, or wait for space
+POLICY_DROP = "drop"
+POLICY_BLOCK = "block"
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+# Longest time log() waits for queue space under POLICY_BLOCK before dropping
+BLOCK_TIMEOUT = 1.0
+FSYNC_SECONDS = 1.0
+MAX_BYTES = 64 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Context entities carried over from earlier turns, logged as they were before
+# each turn so a turn can be replayed without the ones before it
+CONTEXT_FIELDS = ("location", "locality", "service_type", "urgency")
+
+# Queued by close() to stop the writer once every earlier record is written
+_STOP = object()
+
+EVENTS_DROPPED = Counter(
+    "manaaki_event_log_dropped_total", "Conversation events dropped because the event log queue was full."
+)
+
+def archive_path(path, index):
+    """
+    Get the path of a rotated, compressed log file.
+
+    Args:
+        path (str): Active log file
+        index (int): Archive number, 1 being the most recent
+
+    Returns:
+        str: Archive path, e.g. events.jsonl.1.gz
+    """
+    return f"{path}.{index}.gz"
+
+def turn_record(input_text, context, result, elapsed_seconds):
+    """
+    Build the event record for one turn.
+
+    Args:
+        input_text (str): User's input text
+        context (dict): Conversation context before the turn
+        result (dict): Result of process_user_input
+        elapsed_seconds (float): Time the turn took
+
+    Returns:
+        dict: JSON-serializable record
+    """
+    response = result["response"]
+    return {
+        "ts": round(time.time(), 3),
+        "session_id": context.get("session_id"),
+        "language": context.get("language"),
+        "cultural_mode": context.get("cultural_mode"),
+        "context": {field: context[field] for field in CONTEXT_FIELDS if field in context},
+        "input": input_text,
+        "intent": result["intent"],
+        "entities": result["entities"],
+        "corrections": [list(pair) for pair in result.get("corrections", ())],
+        "latency_ms": round(elapsed_seconds * 1000, 3),
+        "service_ids": [service["id"] for service in response.get("services", ())],
+        "response": response["text"],
+        "options": list(response.get("options", ()))
+    }
+
+class EventLog:
+    """
+    Append-only JSON Lines log written by a background thread.
+
+    log() only puts the record on a bounded queue. With POLICY_DROP a full
+    queue drops the record and counts it; with POLICY_BLOCK the caller waits
+    up to block_timeout for the writer to free space before dropping it, and
+    never touches the file itself.
+    """
+
+    def __init__(self, path, queue_size=DEFAULT_QUEUE_SIZE, policy=POLICY_DROP, batch_size=DEFAULT_BATCH_SIZE,
+                 fsync_seconds=FSYNC_SECONDS, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT,
+                 block_timeout=BLOCK_TIMEOUT):
+        """
+        Create a log; call start() to begin writing.
+
+        Args:
+            path (str): Log file, appended to if it exists
+            queue_size (int): Records that can wait for the writer
+            policy (str): POLICY_DROP or POLICY_BLOCK
+            batch_size (int): Most records written in one batch
+            fsync_seconds (float): Longest time written records may wait for an fsync
+            max_bytes (int): Size at which the file is rotated; 0 disables rotation
+            backup_count (int): Compressed archives kept
+            block_timeout (float): Longest wait for queue space under POLICY_BLOCK
+        """
+        if policy not in (POLICY_DROP, POLICY_BLOCK):
+            raise ValueError(f"Unknown event log policy: {policy}")
+        self.path = path
+        self.policy = policy
+        self.batch_size = batch_size
+        self.fsync_seconds = fsync_seconds
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._compressor = None
+        self._rotated = 0
+        self._file = None
+        self._size = 0
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._fsyncs = 0
+        self._rotations = 0
+        self._errors = 0
+        self.last_error = None
+
+    def start(self):
+        """Open the log file and start the writer thread."""
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout=5.0):
+        """
+        Write every queued record, fsync and stop the writer.
+
+        Args:
+            timeout (float): Seconds to wait for the writer, and then for the
+                last compression, to finish
+        """
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            # The writer is not draining; give up rather than hang the caller
+            self._errors += 1
+            self.last_error = "Event log writer did not drain the queue before close"
+        else:
+            self._thread.join(timeout)
+            if self._compressor is not None:
+                self._compressor.join(timeout)
+        self._thread = None
+
+    def log(self, record):
+        """
+        Queue a record for writing.
+
+        Args:
+            record (dict): JSON-serializable record
+
+        Returns:
+            bool: True if the record was queued, False if it was dropped
+        """
+        try:
+            if self.policy == POLICY_BLOCK:
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._dropped += 1
+            EVENTS_DROPPED.inc()
+            return False
+        return True
+
+    def log_turn(self, input_text, context, result, elapsed_seconds):
+        """
+        Queue the record for one turn; see turn_record.
+
+        Returns:
+            bool: True if the record was queued, False if it was dropped
+        """
+        return self.log(turn_record(input_text, context, result, elapsed_seconds))
+
+    def stats(self):
+        """
+        Get writer statistics.
+
+        Returns:
+            dict: queued, written, dropped, batches, fsyncs, rotations, errors and last_error
+        """
+        return {
+            "queued": self._queue.qsize(),
+            "written": self._written,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "fsyncs": self._fsyncs,
+            "rotations": self._rotations,
+            "errors": self._errors,
+            "last_error": self.last_error
+        }
+
+    def _open(self):
+        """
+        Open the log file for appending.
+
+        Returns:
+            bool: True if the file is open; on failure the error is recorded
+                and the next batch tries again
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+            self._size = self._file.tell()
+        except OSError as error:
+            self._file = None
+            self._errors += 1
+            self.last_error = str(error)
+            return False
+        return True
+
+    def _report(self, error):
+        """Record an unexpected writer error; the writer keeps running."""
+        self._errors += 1
+        self.last_error = repr(error)
+
+    def _run(self):
+        """Writer loop: write batches, fsync when due, rotate when full."""
+        unsynced = False
+        last_sync = time.monotonic()
+        while True:
+            # Wait for the next record; with unsynced data, only until the fsync is due
+            timeout = max(0.0, last_sync + self.fsync_seconds - time.monotonic()) if unsynced else None
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()
+                unsynced = False
+                last_sync = time.monotonic()
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _STOP
+            if stopping:
+                batch.pop()
+
+            # Nothing here may end the thread, or queued records would never drain
+            try:
+                if batch:
+                    self._write(batch)
+                    unsynced = True
+                if unsynced and (stopping or time.monotonic() - last_sync >= self.fsync_seconds):
+                    self._sync()
+                    unsynced = False
+                    last_sync = time.monotonic()
+                if self.max_bytes and self._size >= self.max_bytes:
+                    self._rotate()
+                    unsynced = False
+                    last_sync = time.monotonic()
+            except Exception as error:
+                self._report(error)
+            if stopping:
+                if self._file is not None:
+                    self._file.close()
+                return
+
+    def _write(self, batch):
+        """
+        Append a batch of records in one write.
+
+        Args:
+            batch (list): Records to write
+        """
+        if self._file is None and not self._open():
+            return
+        lines = []
+        for record in batch:
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            self._file.write(data)
+            self._file.flush()
+        except OSError as error:
+            self._errors += 1
+            self.last_error = str(error)
+            return
+        self._size += len(data)
+        self._written += len(batch)
+        self._batches += 1
+
+    def _sync(self):
+        """Flush written records to disk."""
+        if self._file is None:
+            return
+        try:
+            os.fsync(self._file.fileno())
+            self._fsyncs += 1
+        except OSError as error:
+            self._errors += 1
+            self.last_error = str(error)
+
+    def _rotate(self):
+        """Move the full log aside, reopen it, and compress the old file on another thread."""
+        if self._file is None:
+            return
+        self._sync()
+        self._file.close()
+        self._file = None
+        self._rotated += 1
+        rotated = f"{self.path}.rotating.{self._rotated}"
+        try:
+            os.replace(self.path, rotated)
+        except OSError as error:
+            self._errors += 1
+            self.last_error = str(error)
+            rotated = None
+        self._open()
+        if rotated is None:
+            return
+        # Archives are shifted in rotation order, so wait for the previous compression
+        if self._compressor is not None:
+            self._compressor.join()
+        self._compressor = threading.Thread(
+            target=self._compress, args=(rotated,), name="event-log-compressor", daemon=True
+        )
+        self._compressor.start()
+
+    def _compress(self, rotated):
+        """
+        Compress a rotated log into archive 1, shifting older archives up.
+
+        Args:
+            rotated (str): Log file moved aside by _rotate
+        """
+        try:
+            # Keep at most backup_count archives; the oldest is overwritten
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(archive_path(self.path, index)):
+                    os.replace(archive_path(self.path, index), archive_path(self.path, index + 1))
+            if self.backup_count > 0:
+                pending = f"{rotated}.gz"
+                with open(rotated, "rb") as source, gzip.open(pending, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                os.replace(pending, archive_path(self.path, 1))
+            os.remove(rotated)
+            self._rotations += 1
+        except OSError as error:
+            self._errors += 1
+            self.last_error = str(error)
+
+# Process-wide log; Streamlit reruns the app script on every interaction
+_event_log = None
+_event_log_lock = threading.Lock()
+
+def start_event_log(path=None, policy=None, **options):
+    """
+    Start the event log, once per process.
+
+    Args:
+        path (str, optional): Log file, defaults to MANAAKI_EVENT_LOG_PATH
+        policy (str, optional): Full-queue policy, defaults to
+            MANAAKI_EVENT_LOG_POLICY or POLICY_DROP
+        **options: Other EventLog arguments; max_bytes defaults to
+            MANAAKI_EVENT_LOG_MAX_BYTES and queue_size to MANAAKI_EVENT_LOG_QUEUE_SIZE
+
+    Returns:
+        EventLog: The running log, or None if no path is configured
+    """
+    global _event_log
+    if _event_log is not None:
+        return _event_log
+
+    path = path or os.environ.get("MANAAKI_EVENT_LOG_PATH")
+    if not path:
+        return None
+    policy = policy or os.environ.get("MANAAKI_EVENT_LOG_POLICY", POLICY_DROP)
+    options.setdefault("max_bytes", int(os.environ.get("MANAAKI_EVENT_LOG_MAX_BYTES", MAX_BYTES)))
+    options.setdefault("queue_size", int(os.environ.get("MANAAKI_EVENT_LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)))
+
+    with _event_log_lock:
+        if _event_log is None:
+            event_log = EventLog(path, policy=policy, **options)
+            event_log.start()
+            # Write out whatever is still queued when the server exits
+            atexit.register(event_log.close)
+            _event_log = event_log
+    return _event_log
+
+def get_event_log():
+    """
+    Get the process-wide event log.
+
+    Returns:
+        EventLog: The log, or None if it has not been started
+    """
+    return _event_log
+
+def stop_event_log():
+    """Write out queued records and stop the event log if it is running."""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is not None:
+            _event_log.close()
+            _event_log = None
@@ -0,0 +1,628 @@
+"""
+Place-name gazetteer for the Manaaki Navigator Streamlit MVP.
+This module maps English, te reo Māori and macron-less place names to a canonical
+service region, and finds place names in user input with a single longest-match
+pass over the preprocessed tokens.
+
+The seed table covers the service regions and a few hundred towns and suburbs. Set
+MANAAKI_GAZETTEER_PATH to a CSV file with the columns name, name_maori, region,
+latitude, longitude, aliases (separated by ";") and optionally ambiguous to add
+localities to the seed table.
+"""
+
+import csv
+import os
+import threading
+
+from services.nlu import fold_macrons, normalize_text, preprocess_input, split_words, tokenize
+
+# Seed localities: (name, te reo Māori name, region, latitude, longitude, extra aliases).
+# A locality whose region is its own name is a service region; directory records
+# use the English region names as their location.
+SEED_PLACES = [
+    # Service regions
+    ("Auckland", "Tāmaki Makaurau", "Auckland", -36.8485, 174.7633, ("akl", "auckland central", "auckland cbd")),
+    ("Wellington", "Te Whanganui-a-Tara", "Wellington", -41.2865, 174.7762, ("wgtn", "welly", "Pōneke")),
+    ("Christchurch", "Ōtautahi", "Christchurch", -43.5321, 172.6362, ("chch",)),
+    ("Hamilton", "Kirikiriroa", "Hamilton", -37.7870, 175.2793, ()),
+    ("Tauranga", "Tauranga Moana", "Tauranga", -37.6878, 176.1651, ()),
+    ("Dunedin", "Ōtepoti", "Dunedin", -45.8788, 170.5028, ()),
+    ("Palmerston North", "Te Papaioea", "Palmerston North", -40.3523, 175.6082, ("palmy",)),
+    ("Nelson", "Whakatū", "Nelson", -41.2706, 173.2840, ()),
+    ("Rotorua", None, "Rotorua", -38.1368, 176.2497, ()),
+    ("Whangārei", None, "Whangārei", -35.7251, 174.3237, ()),
+    ("Invercargill", "Waihōpai", "Invercargill", -46.4132, 168.3538, ()),
+    ("New Plymouth", "Ngāmotu", "New Plymouth", -39.0556, 174.0752, ()),
+    ("Whanganui", None, "Whanganui", -39.9301, 175.0479, ("wanganui",)),
+    ("Gisborne", "Tūranganui-a-Kiwa", "Gisborne", -38.6623, 178.0176, ()),
+    ("Timaru", "Te Tihi-o-Maru", "Timaru", -44.3970, 171.2550, ()),
+    ("Napier", "Ahuriri", "Napier", -39.4928, 176.9120, ()),
+    ("Hastings", "Heretaunga", "Hastings", -39.6390, 176.8390, ()),
+    ("Blenheim", "Waiharakeke", "Blenheim", -41.5140, 173.9600, ()),
+    ("Queenstown", "Tāhuna", "Queenstown", -45.0312, 168.6626, ()),
+    ("Taupō", "Taupō-nui-a-Tia", "Taupō", -38.6857, 176.0702, ()),
+    ("Whakatāne", None, "Whakatāne", -37.9530, 176.9900, ()),
+    ("Masterton", "Whakaoriori", "Masterton", -40.9510, 175.6570, ()),
+    ("Levin", "Taitoko", "Levin", -40.6220, 175.2860, ()),
+    ("Greymouth", "Māwhera", "Greymouth", -42.4500, 171.2100, ()),
+    ("Oamaru", None, "Oamaru", -45.0970, 170.9700, ()),
+    ("Ashburton", "Hakatere", "Ashburton", -43.9030, 171.7460, ()),
+    ("Kaitaia", None, "Kaitaia", -35.1130, 173.2630, ()),
+    ("Kerikeri", None, "Kerikeri", -35.2270, 173.9480, ()),
+    ("Dargaville", None, "Dargaville", -35.9400, 173.8700, ()),
+    ("Thames", None, "Thames", -37.1400, 175.5400, ()),
+    ("Tokoroa", None, "Tokoroa", -38.2200, 175.8700, ()),
+    ("Matamata", None, "Matamata", -37.8100, 175.7700, ()),
+    ("Te Kūiti", None, "Te Kūiti", -38.3300, 175.1600, ()),
+    ("Taumarunui", None, "Taumarunui", -38.8830, 175.2620, ()),
+    ("Hāwera", None, "Hāwera", -39.5900, 174.2800, ()),
+    ("Stratford", "Whakaahurangi", "Stratford", -39.3400, 174.2800, ()),
+    ("Dannevirke", None, "Dannevirke", -40.2100, 176.1000, ()),
+    ("Wairoa", None, "Wairoa", -39.0400, 177.4200, ()),
+    ("Waipukurau", None, "Waipukurau", -39.9950, 176.5560, ()),
+    ("Ōpōtiki", None, "Ōpōtiki", -38.0100, 177.2900, ()),
+    ("Kawerau", None, "Kawerau", -38.1000, 176.7000, ()),
+    ("Tūrangi", None, "Tūrangi", -38.9900, 175.8100, ()),
+    ("Westport", "Kawatiri", "Westport", -41.7500, 171.6000, ()),
+    ("Hokitika", None, "Hokitika", -42.7170, 170.9670, ()),
+    ("Kaikōura", None, "Kaikōura", -42.4000, 173.6800, ()),
+    ("Picton", "Waitohi", "Picton", -41.2900, 174.0000, ()),
+    ("Gore", "Maruawai", "Gore", -46.1000, 168.9400, ()),
+    ("Alexandra", "Manuherikia", "Alexandra", -45.2500, 169.3800, ()),
+    ("Wānaka", None, "Wānaka", -44.7000, 169.1400, ()),
+    ("Cromwell", None, "Cromwell", -45.0400, 169.2000, ()),
+    ("Balclutha", "Iwikatea", "Balclutha", -46.2400, 169.7400, ()),
+    ("Te Anau", None, "Te Anau", -45.4140, 167.7180, ()),
+    ("Marton", None, "Marton", -40.0700, 175.3800, ()),
+    ("Ōhakune", None, "Ōhakune", -39.4180, 175.3990, ()),
+    ("Morrinsville", None, "Morrinsville", -37.6600, 175.5300, ()),
+    ("Paeroa", None, "Paeroa", -37.3800, 175.6700, ()),
+    ("Waihī", None, "Waihī", -37.3900, 175.8400, ()),
+    ("Whitianga", None, "Whitianga", -36.8330, 175.7000, ()),
+
+    # Auckland localities
+    ("Manukau", None, "Auckland", -36.9928, 174.8799, ("manukau city",)),
+    ("Papakura", None, "Auckland", -37.0659, 174.9439, ()),
+    ("Pukekohe", None, "Auckland", -37.2000, 174.9000, ()),
+    ("Takapuna", None, "Auckland", -36.7875, 174.7730, ()),
+    ("North Shore", None, "Auckland", -36.8000, 174.7500, ()),
+    ("Henderson", None, "Auckland", -36.8786, 174.6307, ()),
+    ("Ponsonby", None, "Auckland", -36.8560, 174.7440, ()),
+    ("Ōtāhuhu", None, "Auckland", -36.9470, 174.8400, ()),
+    ("Ōtara", None, "Auckland", -36.9600, 174.8750, ()),
+    ("Māngere", None, "Auckland", -36.9680, 174.7990, ()),
+    ("Manurewa", None, "Auckland", -37.0230, 174.8960, ()),
+    ("Papatoetoe", None, "Auckland", -36.9780, 174.8480, ()),
+    ("Mount Albert", "Ōwairaka", "Auckland", -36.8840, 174.7200, ("mt albert",)),
+    ("Mount Eden", "Maungawhau", "Auckland", -36.8800, 174.7600, ("mt eden",)),
+    ("Mount Roskill", "Puketāpapa", "Auckland", -36.9130, 174.7370, ("mt roskill",)),
+    ("Mount Wellington", "Maungarei", "Auckland", -36.9050, 174.8400, ("mt wellington",)),
+    ("Newmarket", None, "Auckland", -36.8700, 174.7780, ()),
+    ("Remuera", None, "Auckland", -36.8800, 174.8000, ()),
+    ("Onehunga", None, "Auckland", -36.9240, 174.7850, ()),
+    ("Glen Innes", None, "Auckland", -36.8770, 174.8570, ()),
+    ("Panmure", None, "Auckland", -36.9000, 174.8500, ()),
+    ("Pakuranga", None, "Auckland", -36.9100, 174.8800, ()),
+    ("Howick", None, "Auckland", -36.8950, 174.9300, ()),
+    ("Botany", None, "Auckland", -36.9300, 174.9100, ("botany downs",)),
+    ("Flat Bush", None, "Auckland", -36.9600, 174.9100, ()),
+    ("East Tāmaki", None, "Auckland", -36.9400, 174.8950, ()),
+    ("Albany", None, "Auckland", -36.7300, 174.7000, ()),
+    ("Glenfield", None, "Auckland", -36.7800, 174.7200, ()),
+    ("Devonport", None, "Auckland", -36.8300, 174.7950, ()),
+    ("Birkenhead", None, "Auckland", -36.8100, 174.7250, ()),
+    ("New Lynn", None, "Auckland", -36.9080, 174.6850, ()),
+    ("Avondale", None, "Auckland", -36.8970, 174.6960, ()),
+    ("Titirangi", None, "Auckland", -36.9380, 174.6560, ()),
+    ("Te Atatū", None, "Auckland", -36.8450, 174.6500, ()),
+    ("Waitākere", None, "Auckland", -36.8500, 174.5400, ()),
+    ("Point Chevalier", None, "Auckland", -36.8650, 174.7100, ("pt chevalier",)),
+    ("Grey Lynn", None, "Auckland", -36.8600, 174.7350, ()),
+    ("Parnell", None, "Auckland", -36.8550, 174.7800, ()),
+    ("Epsom", None, "Auckland", -36.8900, 174.7700, ()),
+    ("Ellerslie", None, "Auckland", -36.8980, 174.8080, ()),
+    ("Penrose", None, "Auckland", -36.9100, 174.8150, ()),
+    ("Ōrewa", None, "Auckland", -36.5870, 174.6940, ()),
+    ("Silverdale", None, "Auckland", -36.6170, 174.6780, ()),
+    ("Whangaparāoa", None, "Auckland", -36.6300, 174.7400, ()),
+    ("Warkworth", None, "Auckland", -36.4000, 174.6600, ()),
+    ("Helensville", None, "Auckland", -36.6800, 174.4500, ()),
+    ("Kumeū", None, "Auckland", -36.7770, 174.5560, ()),
+    ("Waiuku", None, "Auckland", -37.2500, 174.7300, ()),
+    ("Drury", None, "Auckland", -37.1000, 174.9500, ()),
+    ("Waiheke Island", "Te Motu-arai-roa", "Auckland", -36.8000, 175.1000, ("waiheke",)),
+
+    # Wellington localities
+    ("Newtown", None, "Wellington", -41.3120, 174.7790, ()),
+    ("Lower Hutt", "Te Awakairangi", "Wellington", -41.2167, 174.9167, ("hutt", "hutt valley")),
+    ("Upper Hutt", None, "Wellington", -41.1244, 175.0708, ()),
+    ("Porirua", None, "Wellington", -41.1333, 174.8500, ()),
+    ("Petone", "Pito-one", "Wellington", -41.2270, 174.8720, ()),
+    ("Wainuiomata", None, "Wellington", -41.2600, 174.9500, ()),
+    ("Eastbourne", None, "Wellington", -41.2900, 174.9000, ()),
+    ("Naenae", None, "Wellington", -41.2000, 174.9500, ()),
+    ("Taitā", None, "Wellington", -41.1800, 174.9600, ()),
+    ("Stokes Valley", None, "Wellington", -41.1750, 174.9800, ()),
+    ("Johnsonville", None, "Wellington", -41.2230, 174.8050, ()),
+    ("Karori", None, "Wellington", -41.2850, 174.7400, ()),
+    ("Kilbirnie", None, "Wellington", -41.3170, 174.7950, ()),
+    ("Miramar", None, "Wellington", -41.3150, 174.8150, ()),
+    ("Island Bay", None, "Wellington", -41.3400, 174.7750, ()),
+    ("Te Aro", None, "Wellington", -41.2930, 174.7750, ()),
+    ("Thorndon", None, "Wellington", -41.2750, 174.7800, ()),
+    ("Tawa", None, "Wellington", -41.1700, 174.8300, ()),
+    ("Khandallah", None, "Wellington", -41.2450, 174.7900, ()),
+    ("Titahi Bay", None, "Wellington", -41.1050, 174.8350, ()),
+    ("Cannons Creek", None, "Wellington", -41.1400, 174.8650, ()),
+    ("Whitby", None, "Wellington", -41.1100, 174.8900, ()),
+    ("Paraparaumu", None, "Wellington", -40.9146, 175.0058, ()),
+    ("Waikanae", None, "Wellington", -40.8750, 175.0640, ()),
+    ("Ōtaki", None, "Wellington", -40.7560, 175.1500, ()),
+    ("Kāpiti", None, "Wellington", -40.9100, 175.0100, ("kapiti coast",)),
+
+    # Christchurch localities
+    ("Riccarton", "Pūtaringamotu", "Christchurch", -43.5300, 172.5950, ()),
+    ("Rolleston", None, "Christchurch", -43.5900, 172.3800, ()),
+    ("Rangiora", None, "Christchurch", -43.3040, 172.5960, ()),
+    ("Kaiapoi", None, "Christchurch", -43.3780, 172.6570, ()),
+    ("Lyttelton", "Ōhinehou", "Christchurch", -43.6030, 172.7190, ()),
+    ("Lincoln", None, "Christchurch", -43.6400, 172.4860, ()),
+    ("Prebbleton", None, "Christchurch", -43.5800, 172.5150, ()),
+    ("Hornby", None, "Christchurch", -43.5420, 172.5250, ()),
+    ("Papanui", None, "Christchurch", -43.4950, 172.6080, ()),
+    ("Sydenham", None, "Christchurch", -43.5500, 172.6400, ()),
+    ("Linwood", None, "Christchurch", -43.5350, 172.6700, ()),
+    ("Aranui", None, "Christchurch", -43.5150, 172.7000, ()),
+    ("New Brighton", None, "Christchurch", -43.5070, 172.7300, ()),
+    ("Sumner", None, "Christchurch", -43.5700, 172.7600, ()),
+    ("Halswell", None, "Christchurch", -43.5850, 172.5700, ()),
+    ("Burnside", None, "Christchurch", -43.4950, 172.5700, ()),
+    ("Bishopdale", None, "Christchurch", -43.4850, 172.5850, ()),
+    ("Addington", None, "Christchurch", -43.5420, 172.6150, ()),
+    ("Merivale", None, "Christchurch", -43.5100, 172.6200, ()),
+    ("St Albans", None, "Christchurch", -43.5150, 172.6350, ("saint albans",)),
+    ("Woolston", None, "Christchurch", -43.5500, 172.6800, ()),
+    ("Wigram", None, "Christchurch", -43.5550, 172.5500, ()),
+
+    # Other localities
+    ("Te Rapa", None, "Hamilton", -37.7450, 175.2350, ()),
+    ("Frankton", None, "Hamilton", -37.7950, 175.2600, ()),
+    ("Hillcrest", None, "Hamilton", -37.8000, 175.3200, ()),
+    ("Chartwell", None, "Hamilton", -37.7550, 175.2750, ()),
+    ("Nawton", None, "Hamilton", -37.7800, 175.2250, ()),
+    ("Ngāruawāhia", None, "Hamilton", -37.6680, 175.1470, ()),
+    ("Cambridge", "Kemureti", "Hamilton", -37.8850, 175.4700, ()),
+    ("Te Awamutu", None, "Hamilton", -38.0100, 175.3250, ()),
+    ("Huntly", "Rāhui Pōkeka", "Hamilton", -37.5600, 175.1600, ()),
+    ("Raglan", "Whāingaroa", "Hamilton", -37.8000, 174.8700, ()),
+    ("Mount Maunganui", "Mauao", "Tauranga", -37.6400, 176.1850, ("the mount", "mt maunganui")),
+    ("Pāpāmoa", None, "Tauranga", -37.7000, 176.2850, ()),
+    ("Greerton", None, "Tauranga", -37.7300, 176.1350, ()),
+    ("Bethlehem", None, "Tauranga", -37.6950, 176.1100, ()),
+    ("Welcome Bay", None, "Tauranga", -37.7250, 176.1850, ()),
+    ("Te Puke", None, "Tauranga", -37.7850, 176.3250, ()),
+    ("Katikati", None, "Tauranga", -37.5500, 175.9170, ()),
+    ("Ōmokoroa", None, "Tauranga", -37.6550, 176.0450, ()),
+    ("Mosgiel", None, "Dunedin", -45.8750, 170.3480, ()),
+    ("Port Chalmers", "Koputai", "Dunedin", -45.8160, 170.6200, ()),
+    ("South Dunedin", None, "Dunedin", -45.8950, 170.5000, ()),
+    ("St Kilda", None, "Dunedin", -45.9000, 170.5050, ()),
+    ("Caversham", None, "Dunedin", -45.8970, 170.4850, ()),
+    ("North East Valley", None, "Dunedin", -45.8500, 170.5250, ()),
+    ("Mornington", None, "Dunedin", -45.8850, 170.4850, ()),
+    ("Green Island", None, "Dunedin", -45.9000, 170.4300, ()),
+    ("Feilding", None, "Palmerston North", -40.2250, 175.5650, ()),
+    ("Ashhurst", None, "Palmerston North", -40.2950, 175.7550, ()),
+    ("Highbury", None, "Palmerston North", -40.3600, 175.5800, ()),
+    ("Awapuni", None, "Palmerston North", -40.3750, 175.5850, ()),
+    ("Foxton", "Te Awahou", "Levin", -40.4700, 175.2850, ()),
+    ("Stoke", None, "Nelson", -41.3150, 173.2300, ()),
+    ("Tāhunanui", None, "Nelson", -41.2900, 173.2400, ()),
+    ("Richmond", None, "Nelson", -41.3400, 173.1850, ()),
+    ("Motueka", None, "Nelson", -41.1100, 173.0100, ()),
+    ("Māpua", None, "Nelson", -41.2550, 173.0950, ()),
+    ("Taradale", None, "Napier", -39.5350, 176.8500, ()),
+    ("Tamatea", None, "Napier", -39.5100, 176.8700, ()),
+    ("Flaxmere", None, "Hastings", -39.6200, 176.7800, ()),
+    ("Havelock North", None, "Hastings", -39.6700, 176.8800, ()),
+    ("Ngongotahā", None, "Rotorua", -38.0800, 176.2100, ()),
+    ("Kamo", None, "Whangārei", -35.6800, 174.3000, ()),
+    ("Tikipunga", None, "Whangārei", -35.6850, 174.3350, ()),
+    ("Onerahi", None, "Whangārei", -35.7650, 174.3650, ()),
+    ("Ruakākā", None, "Whangārei", -35.9100, 174.4500, ()),
+    ("Bluff", "Awarua", "Invercargill", -46.6000, 168.3330, ()),
+    ("Riverton", "Aparima", "Invercargill", -46.3550, 168.0150, ()),
+    ("Waitara", None, "New Plymouth", -39.0000, 174.2350, ()),
+    ("Bell Block", None, "New Plymouth", -39.0300, 174.1400, ()),
+    ("Inglewood", None, "New Plymouth", -39.1550, 174.2050, ()),
+    ("Castlecliff", None, "Whanganui", -39.9450, 174.9950, ()),
+    ("Aramoho", None, "Whanganui", -39.9100, 175.0600, ()),
+    ("Kaiti", None, "Gisborne", -38.6700, 178.0350, ()),
+    ("Carterton", None, "Masterton", -41.0250, 175.5300, ()),
+    ("Greytown", None, "Masterton", -41.0800, 175.4600, ()),
+    ("Featherston", None, "Masterton", -41.1150, 175.3250, ()),
+    ("Martinborough", None, "Masterton", -41.2200, 175.4600, ()),
+    ("Arrowtown", None, "Queenstown", -44.9400, 168.8300, ())
+]
+
+# Kinds of ambiguous English names. A WORD place name is also an everyday word
+# ("no bluff"), so it is a place when written with a capital letter; a NAME place
+# name is also a person's or another country's place name ("my daughter
+# Alexandra"), so capitalisation does not tell them apart.
+AMBIGUOUS_WORD = "word"
+AMBIGUOUS_NAME = "name"
+
+# Seed places whose English name is ambiguous. Bare mentions only count as the
+# place after a location cue ("in Gore"), when the message is just the name, or
+# for AMBIGUOUS_WORD names, when capitalised after the first word.
+AMBIGUOUS_PLACES = {
+    "Bluff": AMBIGUOUS_WORD,
+    "Gore": AMBIGUOUS_WORD,
+    "Botany": AMBIGUOUS_WORD,
+    "Stoke": AMBIGUOUS_WORD,
+    "Alexandra": AMBIGUOUS_NAME,
+    "Albany": AMBIGUOUS_NAME,
+    "Cambridge": AMBIGUOUS_NAME,
+    "Cromwell": AMBIGUOUS_NAME,
+    "Henderson": AMBIGUOUS_NAME,
+    "Lincoln": AMBIGUOUS_NAME,
+    "Richmond": AMBIGUOUS_NAME,
+    "Thames": AMBIGUOUS_NAME
+}
+
+# Words that introduce a place, in English and te reo Māori
+LOCATION_CUES = frozenset({
+    "in", "at", "near", "from", "around", "to", "into", "live", "lives", "living", "based", "ki", "kei"
+})
+
+# Trie key marking the end of an alias
+_TERMINAL = None
+
+class Place:
+    """
+    A locality in the gazetteer.
+    """
+
+    __slots__ = ("id", "name", "name_maori", "region", "latitude", "longitude", "ambiguous")
+
+    def __init__(self, name, name_maori, region, latitude, longitude, ambiguous=None):
+        """
+        Create a place.
+
+        Args:
+            name (str): English name
+            name_maori (str, optional): Te reo Māori name; None if it is the same
+            region (str): Canonical id of the service region the place belongs to
+            latitude (float): Latitude of the place's centre
+            longitude (float): Longitude of the place's centre
+            ambiguous (str, optional): AMBIGUOUS_WORD or AMBIGUOUS_NAME if the
+                English name has another common meaning
+
+        Raises:
+            ValueError: If ambiguous is not a known kind
+        """
+        if ambiguous not in (None, AMBIGUOUS_WORD, AMBIGUOUS_NAME):
+            raise ValueError(f"Unknown ambiguity for {name}: {ambiguous}")
+        self.id = place_id(name)
+        self.name = name
+        self.name_maori = name_maori or name
+        self.region = region
+        self.latitude = latitude
+        self.longitude = longitude
+        self.ambiguous = ambiguous
+
+    @property
+    def coordinates(self):
+        """(latitude, longitude) of the place's centre."""
+        return (self.latitude, self.longitude)
+
+    def __repr__(self):
+        return f"Place({self.name!r}, region={self.region!r})"
+
+def place_id(name):
+    """
+    Get the canonical id for a place name.
+
+    Args:
+        name (str): Place name, with or without macrons
+
+    Returns:
+        str: Lower-case, macron-free id, e.g. "palmerston north"
+    """
+    return " ".join(tokenize(name))
+
+def _macron_spellings(name):
+    """
+    Get the ways a name is commonly typed: with macrons, without, and with doubled vowels.
+
+    Args:
+        name (str): Name as written with macrons
+
+    Returns:
+        set: Spellings (tokenize() folds macrons, so the first two coincide)
+    """
+    normalized = normalize_text(name)
+    doubled = normalized
+    for macron_vowel, vowel in zip("āēīōū", "aeiou"):
+        doubled = doubled.replace(macron_vowel, vowel * 2)
+    return {normalized, fold_macrons(normalized), doubled}
+
+class Gazetteer:
+    """
+    Alias index from place names to places.
+
+    Aliases are stored in a token trie, so finding places in a turn walks each
+    start position only as far as the input keeps matching an alias, and the
+    cost does not grow with the number of places.
+    """
+
+    def __init__(self):
+        self._places = {}
+        self._trie = {}
+        self._alias_count = 0
+        # Alias tokens -> kind, for aliases that need context to count as a place
+        self._ambiguous = {}
+
+    def __len__(self):
+        return len(self._places)
+
+    @property
+    def alias_count(self):
+        """Number of distinct aliases indexed."""
+        return self._alias_count
+
+    def vocabulary(self):
+        """
+        Get every token that appears in an alias, e.g. for spelling correction.
+
+        Returns:
+            set: Alias tokens
+        """
+        tokens = set()
+        nodes = [self._trie]
+        while nodes:
+            node = nodes.pop()
+            for token, child in node.items():
+                if token is not _TERMINAL:
+                    tokens.add(token)
+                    nodes.append(child)
+        return tokens
+
+    def add_place(self, place, aliases=()):
+        """
+        Add a place and index its names.
+
+        The English name, te reo Māori name, their macron-less and doubled-vowel
+        spellings and any extra aliases all resolve to the place. If an alias is
+        already taken, the place added first keeps it.
+
+        Args:
+            place (Place): Place to add
+            aliases (iterable): Extra names for the place
+        """
+        self._places.setdefault(place.id, place)
+        spellings = set()
+        for name in (place.name, place.name_maori, *aliases):
+            spellings |= _macron_spellings(name)
+        for spelling in spellings:
+            self._add_alias(tokenize(spelling), place)
+        # Only the English name is ambiguous; te reo names and aliases are not
+        if place.ambiguous:
+            for spelling in _macron_spellings(place.name):
+                self._ambiguous.setdefault(tuple(tokenize(spelling)), place.ambiguous)
+
+    def _add_alias(self, tokens, place):
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERMINAL not in node:
+            node[_TERMINAL] = place
+            self._alias_count += 1
+
+    def get(self, place_id_or_name):
+        """
+        Get a place by id or by any of its names.
+
+        Args:
+            place_id_or_name (str): Place id or name
+
+        Returns:
+            Place: The place, or None if it is unknown
+        """
+        if not place_id_or_name:
+            return None
+        node = self._trie
+        for token in tokenize(place_id_or_name):
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(_TERMINAL)
+
+    def region_of(self, place):
+        """
+        Get the service region a place belongs to.
+
+        Args:
+            place (Place): Place
+
+        Returns:
+            Place: Region place (the place itself for a region)
+        """
+        return self._places.get(place.region, place)
+
+    def find_all(self, text):
+        """
+        Find every place named in the text, preferring the longest alias at each position.
+
+        An ambiguous alias (see AMBIGUOUS_PLACES) only counts when it follows a
+        location cue, is the whole message, or is an AMBIGUOUS_WORD name
+        capitalised after the first word.
+
+        Args:
+            text (str or ProcessedInput): Text to search
+
+        Returns:
+            list: (start token, end token, Place) tuples in input order, non-overlapping
+        """
+        processed = preprocess_input(text)
+        tokens = processed.tokens
+        trie = self._trie
+        matches = []
+        start = 0
+        while start < len(tokens):
+            node = trie
+            longest = None
+            position = start
+            while position < len(tokens):
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                position += 1
+                if _TERMINAL in node:
+                    longest = (position, node[_TERMINAL])
+            if longest is None:
+                start += 1
+                continue
+            end, place = longest
+            kind = self._ambiguous.get(tokens[start:end])
+            if kind is not None and not _is_place_mention(processed, start, end, kind):
+                start += 1
+                continue
+            matches.append((start, end, place))
+            start = end
+        return matches
+
+    def find(self, text):
+        """
+        Find the first place named in the text.
+
+        Args:
+            text (str or ProcessedInput): Text to search
+
+        Returns:
+            Place: First place mentioned, or None
+        """
+        matches = self.find_all(text)
+        return matches[0][2] if matches else None
+
+def _is_place_mention(processed, start, end, kind):
+    """
+    Check whether an ambiguous alias is used as a place.
+
+    Args:
+        processed (ProcessedInput): Preprocessed input
+        start (int): First token of the alias
+        end (int): Token after the alias
+        kind (str): AMBIGUOUS_WORD or AMBIGUOUS_NAME
+
+    Returns:
+        bool: True if the alias names the place
+    """
+    tokens = processed.tokens
+    if start == 0 and end == len(tokens):
+        return True
+    if start > 0 and tokens[start - 1] in LOCATION_CUES:
+        return True
+    if kind == AMBIGUOUS_WORD and start > 0:
+        words = split_words(processed.text)
+        # The corrector replaces tokens one for one, so positions line up
+        return len(words) == len(tokens) and words[start][:1].isupper()
+    return False
+
+def read_places(path):
+    """
+    Read extra localities from a CSV file.
+
+    Args:
+        path (str): CSV with name, name_maori, region, latitude, longitude,
+            aliases (separated by ";") and optional ambiguous ("word" or "name") columns
+
+    Returns:
+        list: (Place, aliases) pairs
+
+    Raises:
+        ValueError: If a row is missing its name, region or coordinates
+    """
+    places = []
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        for row_number, row in enumerate(csv.DictReader(csv_file), start=1):
+            try:
+                place = Place(
+                    row["name"].strip(),
+                    (row.get("name_maori") or "").strip() or None,
+                    place_id(row["region"]),
+                    float(row["latitude"]),
+                    float(row["longitude"]),
+                    (row.get("ambiguous") or "").strip().lower() or None
+                )
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"Row {row_number}: invalid gazetteer entry ({error})") from error
+            if not place.id or not place.region:
+                raise ValueError(f"Row {row_number}: missing name or region")
+            aliases = [alias.strip() for alias in (row.get("aliases") or "").split(";") if alias.strip()]
+            places.append((place, aliases))
+    return places
+
+def build_gazetteer(extra_path=None):
+    """
+    Build a gazetteer from the seed table and an optional CSV file.
+
+    Args:
+        extra_path (str, optional): CSV of extra localities (see read_places)
+
+    Returns:
+        Gazetteer: Indexed gazetteer
+    """
+    gazetteer = Gazetteer()
+    for name, name_maori, region, latitude, longitude, aliases in SEED_PLACES:
+        place = Place(name, name_maori, place_id(region), latitude, longitude, AMBIGUOUS_PLACES.get(name))
+        gazetteer.add_place(place, aliases)
+    if extra_path:
+        for place, aliases in read_places(extra_path):
+            gazetteer.add_place(place, aliases)
+    return gazetteer
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+def get_gazetteer():
+    """
+    Get the process-wide gazetteer, building it on first use.
+
+    Returns:
+        Gazetteer: The gazetteer
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = build_gazetteer(os.environ.get("MANAAKI_GAZETTEER_PATH"))
+    return _gazetteer
+
+def resolve_location(name):
+    """
+    Resolve a place name in English or te reo Māori.
+
+    Args:
+        name (str): Place name, with or without macrons
+
+    Returns:
+        Place: The place, or None if it is unknown
+    """
+    return get_gazetteer().get(name)
+
+def resolve_region(name):
+    """
+    Resolve a place name to the service region it belongs to.
+
+    Args:
+        name (str): Place name, with or without macrons
+
+    Returns:
+        Place: Region place, or None if the name is unknown
+    """
+    gazetteer = get_gazetteer()
+    place = gazetteer.get(name)
+    return gazetteer.region_of(place) if place else None
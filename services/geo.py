@@ -0,0 +1,188 @@
+"""
+Geospatial helpers for the Manaaki Navigator Streamlit MVP.
+This module resolves place names to coordinates through the gazetteer and provides
+a grid-based spatial index for "nearest services within R km" queries.
+"""
+
+import heapq
+import math
+
+from services.gazetteer import resolve_location
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Kilometres per degree of latitude along a great circle
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+def resolve_place(name):
+    """
+    Resolve a place name to coordinates.
+
+    Args:
+        name (str): Place name in English or te reo Māori, with or without macrons
+
+    Returns:
+        tuple: (latitude, longitude), or None if the place is unknown
+    """
+    place = resolve_location(name)
+    return place.coordinates if place else None
+
+def service_coordinates(service):
+    """
+    Get a service's coordinates.
+
+    Args:
+        service (dict): Service record
+
+    Returns:
+        tuple: (latitude, longitude), or None if the service has no usable coordinates
+    """
+    try:
+        return float(service["latitude"]), float(service["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def haversine_km(latitude1, longitude1, latitude2, longitude2):
+    """
+    Great-circle distance between two points.
+
+    Args:
+        latitude1 (float): Latitude of the first point
+        longitude1 (float): Longitude of the first point
+        latitude2 (float): Latitude of the second point
+        longitude2 (float): Longitude of the second point
+
+    Returns:
+        float: Distance in kilometres
+    """
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class GridIndex:
+    """
+    Spatial index bucketing points into fixed-size latitude/longitude cells.
+
+    A nearest-neighbour query scans rings of cells outwards from the query
+    point and stops as soon as no unvisited cell can hold a closer point, so
+    cost depends on local density rather than the size of the directory.
+    """
+
+    def __init__(self, points, cell_degrees=0.05):
+        """
+        Build the index.
+
+        Args:
+            points (iterable): (item, latitude, longitude) tuples
+            cell_degrees (float): Cell size in degrees (0.05° is roughly 5.5 km north-south)
+        """
+        self._cell_degrees = cell_degrees
+        self._cells = {}
+        for item, latitude, longitude in points:
+            self._cells.setdefault(self._cell(latitude, longitude), []).append((item, latitude, longitude))
+
+        self._size = sum(len(cell) for cell in self._cells.values())
+        if self._cells:
+            rows = [cell[0] for cell in self._cells]
+            columns = [cell[1] for cell in self._cells]
+            self._bounds = (min(rows), max(rows), min(columns), max(columns))
+        else:
+            self._bounds = None
+
+    @classmethod
+    def from_services(cls, services, cell_degrees=0.05):
+        """
+        Index services by row number, skipping services without coordinates.
+
+        Args:
+            services (list): Service records
+            cell_degrees (float): Cell size in degrees
+
+        Returns:
+            GridIndex: Index whose items are row numbers into services
+        """
+        points = []
+        for row, service in enumerate(services):
+            coordinates = service_coordinates(service)
+            if coordinates is not None:
+                points.append((row, *coordinates))
+        return cls(points, cell_degrees)
+
+    def __len__(self):
+        return self._size
+
+    def _cell(self, latitude, longitude):
+        return (math.floor(latitude / self._cell_degrees), math.floor(longitude / self._cell_degrees))
+
+    def _ring(self, row, column, ring):
+        """Yield the cells exactly `ring` cells away from (row, column)."""
+        if ring == 0:
+            yield (row, column)
+            return
+        for offset in range(-ring, ring + 1):
+            yield (row - ring, column + offset)
+            yield (row + ring, column + offset)
+        for offset in range(-ring + 1, ring):
+            yield (row + offset, column - ring)
+            yield (row + offset, column + ring)
+
+    def nearest(self, latitude, longitude, k=5, radius_km=None, accept=None):
+        """
+        Find the k nearest points to a location.
+
+        Args:
+            latitude (float): Query latitude
+            longitude (float): Query longitude
+            k (int): Maximum number of results
+            radius_km (float, optional): Ignore points further away than this
+            accept (callable, optional): Predicate on items; rejected items are skipped
+
+        Returns:
+            list: (distance_km, item) tuples, nearest first
+        """
+        if not self._bounds or k <= 0:
+            return []
+
+        row, column = self._cell(latitude, longitude)
+        min_row, max_row, min_column, max_column = self._bounds
+
+        # Distance from the query point to the nearest edge of its own cell, and
+        # the width of one ring of cells, using the narrower longitude span at
+        # the pole-ward edge of the cell so both are lower bounds
+        degrees = self._cell_degrees
+        km_per_longitude = KM_PER_DEGREE * math.cos(math.radians(min(89.0, abs(latitude) + degrees)))
+        edge_km = min(
+            (latitude - row * degrees) * KM_PER_DEGREE,
+            ((row + 1) * degrees - latitude) * KM_PER_DEGREE,
+            (longitude - column * degrees) * km_per_longitude,
+            ((column + 1) * degrees - longitude) * km_per_longitude
+        )
+        ring_km = degrees * km_per_longitude
+
+        last_ring = max(row - min_row, max_row - row, column - min_column, max_column - column)
+        if radius_km is not None:
+            last_ring = min(last_ring, int(radius_km / ring_km) + 1)
+
+        best = []
+        for ring in range(last_ring + 1):
+            for cell in self._ring(row, column, ring):
+                for item, point_latitude, point_longitude in self._cells.get(cell, ()):
+                    if accept is not None and not accept(item):
+                        continue
+                    distance = haversine_km(latitude, longitude, point_latitude, point_longitude)
+                    if radius_km is not None and distance > radius_km:
+                        continue
+                    entry = (-distance, item)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+
+            # Every unvisited cell is at least edge_km + ring * ring_km away
+            if len(best) == k and -best[0][0] <= edge_km + ring * ring_km:
+                break
+
+        return sorted((-negative_distance, item) for negative_distance, item in best)
@@ -0,0 +1,373 @@
+"""
+Stage timing instrumentation for the Manaaki Navigator Streamlit MVP.
+This module times each stage of a conversation turn (and other spans such as page
+rendering) with the monotonic nanosecond clock and keeps rolling latency
+histograms per stage and per intent. It is off unless MANAAKI_INSTRUMENTATION is
+set, and while off each instrumented stage costs a single flag check.
+"""
+
+import os
+import threading
+import time
+
+# Histograms cover the last ROLLING_WINDOW_SECONDS, kept as SLOT_SECONDS slots
+# that are reused as they age out
+ROLLING_WINDOW_SECONDS = 300
+SLOT_SECONDS = 10
+
+# Each power of two is split into 2**SUB_BUCKET_BITS buckets, so a reported
+# percentile is within 1/8 (12.5%) of the true value
+SUB_BUCKET_BITS = 3
+
+# Stage recording a whole turn, broken down by intent
+TURN_STAGE = "turn"
+
+_enabled = os.environ.get("MANAAKI_INSTRUMENTATION", "").lower() in ("1", "true", "yes", "on")
+
+def is_enabled():
+    """
+    Check whether timings are being recorded.
+
+    Returns:
+        bool: True if instrumentation is on
+    """
+    return _enabled
+
+def set_enabled(enabled=True):
+    """
+    Turn instrumentation on or off at runtime.
+
+    Args:
+        enabled (bool): Whether to record timings
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+def _bucket_index(value):
+    """
+    Get the histogram bucket of a duration.
+
+    Args:
+        value (int): Duration in nanoseconds
+
+    Returns:
+        int: Bucket index; buckets grow geometrically
+    """
+    if value < (1 << SUB_BUCKET_BITS):
+        return max(value, 0)
+    exponent = value.bit_length() - 1 - SUB_BUCKET_BITS
+    return ((exponent + 1) << SUB_BUCKET_BITS) + (value >> exponent) - (1 << SUB_BUCKET_BITS)
+
+def _bucket_upper_bound(index):
+    """
+    Get the largest duration that falls in a bucket.
+
+    Args:
+        index (int): Bucket index from _bucket_index
+
+    Returns:
+        int: Duration in nanoseconds
+    """
+    if index < (1 << SUB_BUCKET_BITS):
+        return index
+    exponent = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & ((1 << SUB_BUCKET_BITS) - 1)) + (1 << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << exponent) - 1
+
+class RollingHistogram:
+    """
+    Log-bucketed latency histogram over a sliding time window.
+
+    Samples go into the slot for the current SLOT_SECONDS interval; a slot is
+    cleared when the clock comes round to it again, so the histogram always
+    describes the last ROLLING_WINDOW_SECONDS without storing samples.
+    """
+
+    def __init__(self, window_seconds=ROLLING_WINDOW_SECONDS, slot_seconds=SLOT_SECONDS):
+        """
+        Create an empty histogram.
+
+        Args:
+            window_seconds (int): Length of the window
+            slot_seconds (int): Granularity at which old samples expire
+        """
+        self._slot_seconds = slot_seconds
+        self._slot_count = max(1, window_seconds // slot_seconds)
+        # Per slot: [interval number, count, total ns, max ns, {bucket: count}]
+        self._slots = [[-1, 0, 0, 0, {}] for _ in range(self._slot_count)]
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ns, now=None):
+        """
+        Add one duration.
+
+        Args:
+            elapsed_ns (int): Duration in nanoseconds
+            now (float, optional): Monotonic time in seconds, defaults to the current time
+        """
+        interval = int((time.monotonic() if now is None else now) // self._slot_seconds)
+        bucket = _bucket_index(elapsed_ns)
+        with self._lock:
+            slot = self._slots[interval % self._slot_count]
+            if slot[0] != interval:
+                slot[:] = [interval, 0, 0, 0, {}]
+            slot[1] += 1
+            slot[2] += elapsed_ns
+            if elapsed_ns > slot[3]:
+                slot[3] = elapsed_ns
+            buckets = slot[4]
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    def snapshot(self, now=None):
+        """
+        Add up the slots in the window.
+
+        Args:
+            now (float, optional): Monotonic time in seconds, defaults to the current time
+
+        Returns:
+            tuple: (count, total ns, max ns, {bucket: count}), see summarize
+        """
+        interval = int((time.monotonic() if now is None else now) // self._slot_seconds)
+        oldest = interval - self._slot_count + 1
+        count = total = maximum = 0
+        buckets = {}
+        with self._lock:
+            for slot_interval, slot_count, slot_total, slot_max, slot_buckets in self._slots:
+                if not oldest <= slot_interval <= interval:
+                    continue
+                count += slot_count
+                total += slot_total
+                maximum = max(maximum, slot_max)
+                for bucket, bucket_count in slot_buckets.items():
+                    buckets[bucket] = buckets.get(bucket, 0) + bucket_count
+        return (count, total, maximum, buckets)
+
+    def summary(self, now=None):
+        """
+        Summarize the samples in the window.
+
+        Args:
+            now (float, optional): Monotonic time in seconds, defaults to the current time
+
+        Returns:
+            dict: count, mean/p50/p95/p99/max in microseconds
+        """
+        return summarize(self.snapshot(now))
+
+def merge_snapshots(first, second):
+    """
+    Add two histogram snapshots, e.g. from different processes.
+
+    Args:
+        first (tuple): Snapshot from RollingHistogram.snapshot
+        second (tuple): Snapshot from RollingHistogram.snapshot
+
+    Returns:
+        tuple: Combined snapshot
+    """
+    buckets = dict(first[3])
+    for bucket, bucket_count in second[3].items():
+        buckets[bucket] = buckets.get(bucket, 0) + bucket_count
+    return (first[0] + second[0], first[1] + second[1], max(first[2], second[2]), buckets)
+
+def summarize(snapshot):
+    """
+    Summarize a histogram snapshot.
+
+    Args:
+        snapshot (tuple): Snapshot from RollingHistogram.snapshot or merge_snapshots
+
+    Returns:
+        dict: count, mean/p50/p95/p99/max in microseconds
+    """
+    count, total, maximum, buckets = snapshot
+    summary = {"count": count, "mean_us": total / count / 1000 if count else 0.0}
+    ordered = sorted(buckets.items())
+    for name, fraction in (("p50_us", 0.50), ("p95_us", 0.95), ("p99_us", 0.99)):
+        rank = max(1, -(-count * fraction // 1))
+        seen = 0
+        value = 0
+        for bucket, bucket_count in ordered:
+            seen += bucket_count
+            if seen >= rank:
+                # Never report more than the largest sample actually seen
+                value = min(_bucket_upper_bound(bucket), maximum)
+                break
+        summary[name] = value / 1000
+    summary["max_us"] = maximum / 1000
+    return summary
+
+# Stage name -> histogram, and intent -> histogram of whole turns
+_stage_histograms = {}
+_intent_histograms = {}
+_registry_lock = threading.Lock()
+
+# (window, slot) lengths in seconds for histograms created from now on
+_window = (ROLLING_WINDOW_SECONDS, SLOT_SECONDS)
+
+def set_window(window_seconds, slot_seconds=SLOT_SECONDS):
+    """
+    Change the window of the histograms, dropping every recorded timing.
+
+    Offline tools pass the same, very long length for both to keep every
+    sample of a run in a single slot.
+
+    Args:
+        window_seconds (int): Length of the window
+        slot_seconds (int): Granularity at which old samples expire
+    """
+    global _window
+    with _registry_lock:
+        _window = (window_seconds, slot_seconds)
+        _stage_histograms.clear()
+        _intent_histograms.clear()
+
+def _histogram(histograms, key):
+    """Get or create the histogram for a key."""
+    histogram = histograms.get(key)
+    if histogram is None:
+        with _registry_lock:
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = RollingHistogram(*_window)
+    return histogram
+
+def record(stage, elapsed_ns, intent=None):
+    """
+    Record the duration of a stage.
+
+    Args:
+        stage (str): Stage name
+        elapsed_ns (int): Duration in nanoseconds
+        intent (str, optional): Intent of the turn, also recorded per intent
+    """
+    _histogram(_stage_histograms, stage).record(elapsed_ns)
+    if intent is not None:
+        _histogram(_intent_histograms, intent).record(elapsed_ns)
+
+class TurnTimer:
+    """
+    Times consecutive stages of one turn: each lap records the time since the previous one.
+    """
+
+    __slots__ = ("_started", "_last")
+
+    def __init__(self):
+        self._started = self._last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        """
+        Record the stage that has just finished.
+
+        Args:
+            stage (str): Stage name
+        """
+        now = time.perf_counter_ns()
+        record(stage, now - self._last)
+        self._last = now
+
+    def skip(self):
+        """Leave the time since the previous lap out of the turn, e.g. other turns' work in a batch."""
+        now = time.perf_counter_ns()
+        self._started += now - self._last
+        self._last = now
+
+    def finish(self, intent):
+        """
+        Record the whole turn under its intent.
+
+        Args:
+            intent (str): Detected intent
+        """
+        record(TURN_STAGE, time.perf_counter_ns() - self._started, intent)
+
+def start_turn():
+    """
+    Start timing a turn.
+
+    Returns:
+        TurnTimer: Timer for the turn, or None when instrumentation is off
+    """
+    return TurnTimer() if _enabled else None
+
+class Span:
+    """Context manager that records how long its block took."""
+
+    __slots__ = ("_stage", "_started")
+
+    def __init__(self, stage):
+        self._stage = stage
+        self._started = 0
+
+    def __enter__(self):
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record(self._stage, time.perf_counter_ns() - self._started)
+        return False
+
+class _DisabledSpan:
+    """Shared no-op span used while instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_DISABLED_SPAN = _DisabledSpan()
+
+def span(stage):
+    """
+    Time a block of code, e.g. `with span("render"): ...`.
+
+    Args:
+        stage (str): Stage name
+
+    Returns:
+        Context manager recording the block's duration, or a no-op when instrumentation is off
+    """
+    return Span(stage) if _enabled else _DISABLED_SPAN
+
+def get_snapshots():
+    """
+    Get the raw histogram snapshots, which unlike summaries can be merged.
+
+    Returns:
+        dict: stages (stage -> snapshot) and intents (intent -> snapshot of whole turns)
+    """
+    with _registry_lock:
+        stages = dict(_stage_histograms)
+        intents = dict(_intent_histograms)
+    return {
+        "stages": {stage: histogram.snapshot() for stage, histogram in sorted(stages.items())},
+        "intents": {intent: histogram.snapshot() for intent, histogram in sorted(intents.items())}
+    }
+
+def get_timings():
+    """
+    Get rolling latency summaries.
+
+    Returns:
+        dict: enabled, window_seconds, stages (stage -> summary) and
+            intents (intent -> summary of whole turns)
+    """
+    with _registry_lock:
+        stages = dict(_stage_histograms)
+        intents = dict(_intent_histograms)
+    return {
+        "enabled": _enabled,
+        "window_seconds": _window[0],
+        "stages": {stage: histogram.summary() for stage, histogram in sorted(stages.items())},
+        "intents": {intent: histogram.summary() for intent, histogram in sorted(intents.items())}
+    }
+
+def reset_timings():
+    """Drop every recorded timing."""
+    with _registry_lock:
+        _stage_histograms.clear()
+        _intent_histograms.clear()
@@ -0,0 +1,546 @@
+"""
+Load-test harness for the Manaaki Navigator Streamlit MVP.
+This module drives many simulated browser sessions through scripted conversations
+against a local `streamlit run app.py` server, speaking the browser's websocket
+protocol, and reports rerun latency percentiles, server memory per session and the
+number of concurrent sessions at which reruns start to queue.
+
+Streamlit's AppTest runner is not used because it swaps a process-wide runtime in
+and out on every run, so only one simulated session could run at a time.
+
+Usage:
+    python -m services.load_test --profile mixed --ramp 1 10 25 50 100 200
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import HTTPRequest
+from tornado.websocket import websocket_connect
+
+from services.scenario_runner import percentile
+from services.scenarios import test_scenarios
+from utils.language import ENGLISH, MAORI, GENERAL, MAORI_RESPONSIVE
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Options of the sidebar selectboxes, in the order app.py lists them
+LANGUAGE_OPTIONS = (ENGLISH, MAORI)
+CULTURAL_MODE_OPTIONS = (GENERAL, MAORI_RESPONSIVE)
+
+DEFAULT_RAMP = (1, 5, 10, 25, 50, 100, 200)
+
+# A ramp level must add at least this much throughput over the previous one,
+# otherwise the server is saturated and extra sessions only wait in line
+SATURATION_GAIN = 1.10
+
+DEFAULT_TARGET_P95_MS = 500.0
+RERUN_TIMEOUT_SECONDS = 60.0
+SERVER_START_TIMEOUT_SECONDS = 60.0
+
+# How often the server's memory is sampled while a level runs
+RSS_SAMPLE_SECONDS = 0.1
+
+# Element types a session interacts with
+WIDGET_TYPES = ("selectbox", "text_input", "button")
+
+def build_profiles(scenarios=None):
+    """
+    Build load profiles from the conversation test scenarios.
+
+    Args:
+        scenarios (list, optional): Scenarios, defaults to the testing page scenarios
+
+    Returns:
+        dict: Profile name -> scenarios that sessions take turns playing; one
+            "scenario-<id>" profile per scenario plus "mixed" with all of them
+    """
+    scenarios = test_scenarios if scenarios is None else scenarios
+    profiles = {f"scenario-{scenario['id']}": [scenario] for scenario in scenarios}
+    profiles["mixed"] = list(scenarios)
+    return profiles
+
+PROFILES = build_profiles()
+
+def read_rss_bytes(pid):
+    """
+    Read a process's resident memory from /proc.
+
+    Args:
+        pid (int): Process id
+
+    Returns:
+        int: Resident set size in bytes, or None if unavailable (no pid, not Linux)
+    """
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+def _free_port():
+    """Get a TCP port nothing is listening on."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+def start_server(app_path=APP_PATH, port=None, timeout=SERVER_START_TIMEOUT_SECONDS):
+    """
+    Start a headless Streamlit server for the app and wait until it is healthy.
+
+    Args:
+        app_path (str): Streamlit script to serve
+        port (int, optional): Port, defaults to a free one
+        timeout (float): Seconds to wait for the server
+
+    Returns:
+        tuple: (subprocess.Popen, base URL)
+
+    Raises:
+        RuntimeError: If the server exits or does not become healthy in time
+    """
+    port = port or _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", app_path,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false"
+        ],
+        cwd=os.path.dirname(app_path),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Streamlit server did not start within {timeout:.0f}s")
+
+class SimulatedSession:
+    """
+    One browser tab connected to the app.
+
+    Each rerun sends the widget values the browser would send and waits for
+    the script run to finish, following any st.rerun() the app makes. The
+    widgets rendered by the last run are kept so the next interaction can
+    address them by id.
+    """
+
+    def __init__(self, base_url, timeout=RERUN_TIMEOUT_SECONDS):
+        """
+        Create an unconnected session.
+
+        Args:
+            base_url (str): Server URL, e.g. http://127.0.0.1:8501
+            timeout (float): Seconds to wait for one rerun
+        """
+        self._stream_url = base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self._origin = base_url
+        self._timeout = timeout
+        self._connection = None
+        self._widgets = {}
+        self.latencies_ms = []
+        self.app_exceptions = 0
+
+    async def connect(self):
+        """Open the websocket and run the app once, like loading the page."""
+        request = HTTPRequest(self._stream_url, headers={"Origin": self._origin})
+        self._connection = await websocket_connect(request, subprotocols=["streamlit"])
+        await self.rerun()
+
+    def close(self):
+        """Close the websocket."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _widget_states(self, values, trigger):
+        """
+        Build the widget states for a rerun.
+
+        Args:
+            values (dict): Widget id -> WidgetState field values to send
+            trigger (str, optional): Id of the button being clicked
+
+        Returns:
+            list: WidgetState messages
+        """
+        states = []
+        for selectbox in self._widgets.get("selectbox", ()):
+            states.append(WidgetState(id=selectbox.id, **values.get(selectbox.id, {"int_value": selectbox.default})))
+        for text_input in self._widgets.get("text_input", ()):
+            if text_input.id in values:
+                states.append(WidgetState(id=text_input.id, **values[text_input.id]))
+        if trigger is not None:
+            states.append(WidgetState(id=trigger, trigger_value=True))
+        return states
+
+    async def rerun(self, values=None, trigger=None):
+        """
+        Ask the server to rerun the app and wait for the run to finish.
+
+        Args:
+            values (dict, optional): Widget id -> WidgetState field values
+            trigger (str, optional): Id of the button being clicked
+
+        Returns:
+            float: Rerun latency in milliseconds
+
+        Raises:
+            ConnectionError: If the server closes the connection
+            asyncio.TimeoutError: If the run does not finish in time
+        """
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        message.rerun_script.widget_states.widgets.extend(self._widget_states(values or {}, trigger))
+
+        started = time.perf_counter()
+        await self._connection.write_message(message.SerializeToString(), binary=True)
+        widgets = {}
+        while True:
+            data = await asyncio.wait_for(self._connection.read_message(), self._timeout)
+            if data is None:
+                raise ConnectionError("Streamlit server closed the session")
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                # A new script run (st.rerun() starts one); only its widgets count
+                widgets = {}
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in WIDGET_TYPES:
+                    widgets.setdefault(element_type, []).append(getattr(element, element_type))
+                elif element_type == "exception":
+                    self.app_exceptions += 1
+            elif kind == "script_finished" and forward.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                break
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._widgets = widgets
+        self.latencies_ms.append(latency_ms)
+        return latency_ms
+
+    async def set_preferences(self, language, cultural_mode):
+        """
+        Choose the language and cultural mode in the sidebar, one rerun each.
+
+        Args:
+            language (str): english or maori
+            cultural_mode (str): general or maori_responsive
+        """
+        for position, options, value in ((0, LANGUAGE_OPTIONS, language), (1, CULTURAL_MODE_OPTIONS, cultural_mode)):
+            selectbox = self._widgets["selectbox"][position]
+            index = options.index(value)
+            if selectbox.default != index:
+                await self.rerun({selectbox.id: {"int_value": index}})
+
+    async def send_message(self, text):
+        """
+        Type a message into the chat form and submit it.
+
+        Args:
+            text (str): Message text
+
+        Returns:
+            float: Rerun latency in milliseconds
+        """
+        text_input = self._widgets["text_input"][0]
+        submit = next(button for button in self._widgets["button"] if button.is_form_submitter)
+        return await self.rerun({text_input.id: {"string_value": text}}, trigger=submit.id)
+
+async def play_scenario(session, scenario, think_seconds=0.0):
+    """
+    Play one scenario in a session: load the page, set preferences, send each step.
+
+    Args:
+        session (SimulatedSession): Unconnected session
+        scenario (dict): Scenario with language, cultural_mode and steps
+        think_seconds (float): Pause before each message, like a user typing
+    """
+    await session.connect()
+    await session.set_preferences(scenario["language"], scenario["cultural_mode"])
+    for step in scenario["steps"]:
+        if think_seconds:
+            await asyncio.sleep(think_seconds)
+        await session.send_message(step["input"])
+
+def _latency_summary(latencies_ms):
+    """
+    Summarize rerun latencies.
+
+    Args:
+        latencies_ms (list): Latencies in milliseconds
+
+    Returns:
+        dict: p50/p95/p99/max latency in milliseconds
+    """
+    ordered = sorted(latencies_ms)
+    return {
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else 0.0
+    }
+
+async def _sample_peak_rss(pid, samples):
+    """
+    Record a process's resident memory until cancelled.
+
+    Args:
+        pid (int): Process id
+        samples (list): List the readings are appended to
+    """
+    while True:
+        rss = read_rss_bytes(pid)
+        if rss is not None:
+            samples.append(rss)
+        await asyncio.sleep(RSS_SAMPLE_SECONDS)
+
+async def run_level(base_url, scenarios, sessions, server_pid=None, think_seconds=0.0,
+                    timeout=RERUN_TIMEOUT_SECONDS, baseline_rss=None):
+    """
+    Run many sessions at once, each playing a scenario, and measure the server.
+
+    Sessions stay connected until all have finished, so the memory figure
+    covers that many live sessions. Memory per session is the level's peak
+    RSS above a fixed baseline, since RSS measured just before a level already
+    includes memory the previous level freed and this one reuses.
+
+    Args:
+        base_url (str): Server URL
+        scenarios (list): Scenarios the sessions take turns playing
+        sessions (int): Number of concurrent sessions
+        server_pid (int, optional): Server process id, for memory figures
+        think_seconds (float): Pause before each message
+        timeout (float): Seconds to wait for one rerun
+        baseline_rss (int, optional): Server RSS with no sessions, e.g. after
+            warm-up; defaults to the RSS when the level starts
+
+    Returns:
+        dict: Throughput, latency percentiles, failures and server memory for the level
+    """
+    if baseline_rss is None:
+        baseline_rss = read_rss_bytes(server_pid)
+    rss_samples = []
+    sampler = asyncio.create_task(_sample_peak_rss(server_pid, rss_samples)) if server_pid is not None else None
+    clients = [SimulatedSession(base_url, timeout) for _ in range(sessions)]
+    started = time.perf_counter()
+    try:
+        outcomes = await asyncio.gather(
+            *(play_scenario(client, scenario, think_seconds) for client, scenario in zip(clients, itertools.cycle(scenarios))),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+        rss_after = read_rss_bytes(server_pid)
+    finally:
+        if sampler is not None:
+            sampler.cancel()
+        for client in clients:
+            client.close()
+
+    if rss_after is not None:
+        rss_samples.append(rss_after)
+    peak_rss = max(rss_samples) if rss_samples else None
+    latencies = [latency for client in clients for latency in client.latencies_ms]
+    errors = [f"{type(outcome).__name__}: {outcome}" for outcome in outcomes if isinstance(outcome, BaseException)]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "elapsed_s": elapsed,
+        "reruns_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": _latency_summary(latencies),
+        "failed_sessions": len(errors),
+        "errors": sorted(set(errors)),
+        "app_exceptions": sum(client.app_exceptions for client in clients),
+        "rss_bytes": peak_rss,
+        "rss_per_session_bytes": (
+            (peak_rss - baseline_rss) / sessions if baseline_rss is not None and peak_rss is not None else None
+        )
+    }
+
+def find_saturation(levels, target_p95_ms=DEFAULT_TARGET_P95_MS):
+    """
+    Find where adding sessions stops adding throughput or breaks the latency target.
+
+    Args:
+        levels (list): Level results from run_level, in increasing session order
+        target_p95_ms (float): Acceptable p95 rerun latency
+
+    Returns:
+        dict: saturated_at (sessions, or None if never saturated), reason
+            ("throughput" or "latency") and max_sessions_within_target
+    """
+    saturation = {"saturated_at": None, "reason": None, "max_sessions_within_target": None}
+    previous = None
+    for level in levels:
+        within_target = level["latency"]["p95_ms"] <= target_p95_ms and not level["failed_sessions"]
+        if within_target:
+            saturation["max_sessions_within_target"] = level["sessions"]
+        if saturation["saturated_at"] is None:
+            if not within_target:
+                saturation.update(saturated_at=level["sessions"], reason="latency")
+            elif previous and level["reruns_per_second"] < previous["reruns_per_second"] * SATURATION_GAIN:
+                saturation.update(saturated_at=level["sessions"], reason="throughput")
+        previous = level
+    return saturation
+
+def run_load_test(base_url, scenarios, ramp, server_pid=None, think_seconds=0.0,
+                  target_p95_ms=DEFAULT_TARGET_P95_MS, timeout=RERUN_TIMEOUT_SECONDS):
+    """
+    Run a ramp of concurrency levels against a server.
+
+    Args:
+        base_url (str): Server URL
+        scenarios (list): Scenarios the sessions take turns playing
+        ramp (list): Session counts to run, in increasing order
+        server_pid (int, optional): Server process id, for memory figures
+        think_seconds (float): Pause before each message
+        target_p95_ms (float): Acceptable p95 rerun latency
+        timeout (float): Seconds to wait for one rerun
+
+    Returns:
+        dict: Report with one entry per level and the saturation point
+    """
+    baseline_rss = None
+
+    async def ramp_up():
+        nonlocal baseline_rss
+        # One untimed pass first, so imports and index builds on the server's
+        # first run are not counted against the first level
+        await run_level(base_url, scenarios, len(scenarios), None, 0.0, timeout)
+        baseline_rss = read_rss_bytes(server_pid)
+        return [
+            await run_level(base_url, scenarios, sessions, server_pid, think_seconds, timeout, baseline_rss)
+            for sessions in ramp
+        ]
+
+    levels = asyncio.run(ramp_up())
+    return {
+        "url": base_url,
+        "scenarios": [scenario["id"] for scenario in scenarios],
+        "think_seconds": think_seconds,
+        "target_p95_ms": target_p95_ms,
+        "baseline_rss_bytes": baseline_rss,
+        "levels": levels,
+        "saturation": find_saturation(levels, target_p95_ms)
+    }
+
+def format_report(report):
+    """
+    Format a load test report as plain text.
+
+    Args:
+        report (dict): Report returned by run_load_test
+
+    Returns:
+        str: Human-readable report
+    """
+    lines = [
+        f"{'sessions':>8} {'reruns':>7} {'reruns/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'failed':>6} {'RSS/session':>12}"
+    ]
+    for level in report["levels"]:
+        latency = level["latency"]
+        per_session = level["rss_per_session_bytes"]
+        lines.append(
+            f"{level['sessions']:>8} {level['reruns']:>7} {level['reruns_per_second']:>9.1f} "
+            f"{latency['p50_ms']:>7.1f}ms {latency['p95_ms']:>7.1f}ms {latency['p99_ms']:>7.1f}ms {latency['max_ms']:>7.1f}ms "
+            f"{level['failed_sessions']:>6} "
+            + (f"{per_session / 1024:>9.0f} KiB" if per_session is not None else f"{'n/a':>12}")
+        )
+        for error in level["errors"]:
+            lines.append(f"         {error}")
+
+    lines.append("")
+    if report["baseline_rss_bytes"] is not None:
+        lines.append(f"Server RSS after warm-up: {report['baseline_rss_bytes'] / 2**20:.1f} MiB")
+    saturation = report["saturation"]
+    if saturation["saturated_at"] is None:
+        lines.append("Saturation: not reached")
+    else:
+        lines.append(f"Saturation: {saturation['saturated_at']} concurrent sessions ({saturation['reason']})")
+    lines.append(
+        f"Most sessions with p95 <= {report['target_p95_ms']:.0f}ms: "
+        f"{saturation['max_sessions_within_target'] if saturation['max_sessions_within_target'] is not None else 'none'}"
+    )
+    return "\n".join(lines)
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Command-line arguments
+
+    Returns:
+        int: Process exit status
+    """
+    parser = argparse.ArgumentParser(description="Load-test the Manaaki Navigator Streamlit app with simulated sessions.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed", help="scenarios the sessions play")
+    parser.add_argument("--sessions", type=int, help="run a single level with this many concurrent sessions")
+    parser.add_argument("--ramp", type=int, nargs="+", help="concurrent session counts to step through")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause before each message")
+    parser.add_argument("--target-p95-ms", type=float, default=DEFAULT_TARGET_P95_MS, help="acceptable p95 rerun latency")
+    parser.add_argument("--timeout", type=float, default=RERUN_TIMEOUT_SECONDS, help="seconds to wait for one rerun")
+    parser.add_argument("--url", help="test a server that is already running instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="process id of the --url server, for memory figures")
+    parser.add_argument("--app", default=APP_PATH, help="Streamlit script to serve when starting a server")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    ramp = [args.sessions] if args.sessions else sorted(set(args.ramp or DEFAULT_RAMP))
+    if min(ramp) < 1:
+        parser.error("session counts must be at least 1")
+
+    process = None
+    if args.url:
+        base_url, server_pid = args.url.rstrip("/"), args.server_pid
+    else:
+        process, base_url = start_server(args.app)
+        server_pid = process.pid
+    try:
+        report = run_load_test(
+            base_url, PROFILES[args.profile], ramp, server_pid,
+            args.think_ms / 1000, args.target_p95_ms, args.timeout
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
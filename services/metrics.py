@@ -0,0 +1,333 @@
+"""
+Metrics for the Manaaki Navigator Streamlit MVP.
+This module counts conversation turns by intent, times directory queries, records
+result-set sizes and reports cache efficiency in the Prometheus text format, served
+by a small local HTTP endpoint next to the Streamlit server.
+
+Counters are kept per thread and only added up when metrics are scraped, so
+recording a sample never takes a lock shared with other sessions.
+
+Set MANAAKI_METRICS_PORT to serve metrics, e.g. at http://127.0.0.1:9464/metrics.
+"""
+
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+RESULT_SIZE_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+# Per-thread values: (metric name, label values) -> counter value or histogram
+# counts. Streamlit runs each script run on a new thread, so shards of finished
+# threads are folded into _retired whenever a thread registers or metrics are
+# scraped; the shard list stays as long as the number of live threads.
+_local = threading.local()
+_shards = []
+_retired = {}
+_shards_lock = threading.Lock()
+
+# Metrics in registration order, and cache name -> stats function
+_metrics = []
+_caches = {}
+
+def _shard():
+    """Get the calling thread's values, registering them on first use."""
+    try:
+        return _local.values
+    except AttributeError:
+        values = _local.values = {}
+        with _shards_lock:
+            _fold_finished_shards()
+            _shards.append((threading.current_thread(), values))
+        return values
+
+def _fold_finished_shards():
+    """Fold the shards of finished threads into _retired; call with _shards_lock held."""
+    live = []
+    for thread, values in _shards:
+        if thread.is_alive():
+            live.append((thread, values))
+        else:
+            _merge(_retired, values)
+    _shards[:] = live
+
+def _merge(into, values):
+    """Add one set of per-thread values into another."""
+    for key, value in list(values.items()):
+        if isinstance(value, list):
+            total = into.get(key)
+            if total is None:
+                into[key] = list(value)
+            else:
+                for index, count in enumerate(value):
+                    total[index] += count
+        else:
+            into[key] = into.get(key, 0) + value
+
+def collect():
+    """
+    Add up every thread's values.
+
+    Returns:
+        dict: (metric name, label values) -> counter value or histogram counts
+    """
+    with _shards_lock:
+        _fold_finished_shards()
+        merged = {}
+        _merge(merged, _retired)
+        for _, values in _shards:
+            _merge(merged, values)
+    return merged
+
+def reset():
+    """Zero every counter and histogram."""
+    with _shards_lock:
+        for _, values in _shards:
+            values.clear()
+        _retired.clear()
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Create and register a counter.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (tuple): Label names, in the order values are passed
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        """
+        Increase the counter.
+
+        Args:
+            *labels (str): Label values
+            amount (float): Amount to add
+        """
+        values = _shard()
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def samples(self, merged):
+        """Yield (suffix, labels, value) for an exposition."""
+        for (name, labels), value in sorted(merged.items()):
+            if name == self.name:
+                yield "", dict(zip(self.labelnames, labels)), value
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        """
+        Create and register a histogram.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            buckets (tuple): Bucket upper bounds in ascending order
+            labelnames (tuple): Label names, in the order values are passed
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        _metrics.append(self)
+
+    def observe(self, value, *labels):
+        """
+        Record a value.
+
+        Args:
+            value (float): Observed value
+            *labels (str): Label values
+        """
+        values = _shard()
+        key = (self.name, labels)
+        counts = values.get(key)
+        if counts is None:
+            # One count per bucket plus +Inf, then the sum and the count
+            counts = values[key] = [0] * (len(self.buckets) + 3)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    def samples(self, merged):
+        """Yield (suffix, labels, value) for an exposition."""
+        for (name, labels), counts in sorted(merged.items()):
+            if name != self.name:
+                continue
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                yield "_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield "_sum", base, counts[-2]
+            yield "_count", base, counts[-1]
+
+TURNS = Counter("manaaki_turns_total", "Conversation turns processed, by detected intent.", ("intent",))
+TURN_SECONDS = Histogram("manaaki_turn_duration_seconds", "Time to process one conversation turn.", LATENCY_BUCKETS)
+DIRECTORY_QUERY_SECONDS = Histogram(
+    "manaaki_directory_query_duration_seconds", "Time spent in service directory queries.", LATENCY_BUCKETS, ("query",)
+)
+DIRECTORY_RESULTS = Histogram(
+    "manaaki_directory_results", "Number of services returned by a directory query.", RESULT_SIZE_BUCKETS, ("query",)
+)
+
+def record_turn(intent, elapsed_seconds=None):
+    """
+    Count a conversation turn.
+
+    Args:
+        intent (str): Detected intent ("unknown" for the fallback response)
+        elapsed_seconds (float, optional): Time the turn took, if measured
+    """
+    TURNS.inc(intent)
+    if elapsed_seconds is not None:
+        TURN_SECONDS.observe(elapsed_seconds)
+
+def record_directory_query(query, elapsed_seconds, result_count):
+    """
+    Record one directory query.
+
+    Args:
+        query (str): Query kind, e.g. "services_by_location" or "search"
+        elapsed_seconds (float): Time the query took
+        result_count (int): Number of services returned
+    """
+    DIRECTORY_QUERY_SECONDS.observe(elapsed_seconds, query)
+    DIRECTORY_RESULTS.observe(result_count, query)
+
+def register_cache(name, stats_source):
+    """
+    Report a cache's efficiency on every scrape.
+
+    Args:
+        name (str): Cache name, used as the "cache" label
+        stats_source (callable): Returns a dict with hits, misses, evictions,
+            size and hit_ratio, like utils.cache.LRUCache.stats
+    """
+    _caches[name] = stats_source
+
+# Cache metrics read from the registered stats functions: (name, type, help, stats key)
+CACHE_METRICS = (
+    ("manaaki_cache_hits_total", "counter", "Cache lookups that found an entry.", "hits"),
+    ("manaaki_cache_misses_total", "counter", "Cache lookups that found nothing.", "misses"),
+    ("manaaki_cache_evictions_total", "counter", "Entries evicted to stay within the cache size.", "evictions"),
+    ("manaaki_cache_entries", "gauge", "Entries currently cached.", "size"),
+    ("manaaki_cache_hit_ratio", "gauge", "Fraction of lookups that were hits since startup.", "hit_ratio")
+)
+
+def _format_value(value):
+    """Format a sample value or bucket bound."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+def _escape_label_value(value):
+    """Escape backslashes, quotes and newlines in a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels):
+    """Format labels as {name="value",...}."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+def render_metrics():
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text
+    """
+    merged = collect()
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for suffix, labels, value in metric.samples(merged):
+            lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    cache_stats = {name: stats_source() for name, stats_source in sorted(_caches.items())}
+    for name, metric_type, documentation, key in CACHE_METRICS:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for cache, stats in cache_stats.items():
+            lines.append(f"{name}{_format_labels({'cache': cache})} {_format_value(stats[key])}")
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves render_metrics() at /metrics."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the Streamlit console
+        pass
+
+# Process-wide server; Streamlit reruns the app script on every interaction
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port=None, host=None):
+    """
+    Serve metrics over HTTP on a daemon thread, once per process.
+
+    Args:
+        port (int, optional): Port, defaults to MANAAKI_METRICS_PORT
+        host (str, optional): Interface, defaults to MANAAKI_METRICS_HOST or 127.0.0.1
+
+    Returns:
+        ThreadingHTTPServer: The running server, or None if no port is configured
+    """
+    global _server
+    if _server is not None:
+        return _server
+
+    port = port if port is not None else os.environ.get("MANAAKI_METRICS_PORT")
+    if port in (None, ""):
+        return None
+    host = host or os.environ.get("MANAAKI_METRICS_HOST", "127.0.0.1")
+
+    with _server_lock:
+        if _server is None:
+            server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _server = server
+    return _server
+
+def stop_metrics_server():
+    """Stop the metrics server if it is running."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
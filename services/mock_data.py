@@ -1,8 +1,17 @@
 """
 Mock service data for the Manaaki Navigator Streamlit MVP.
 This simulates a service directory with health, housing, financial, and social services.
+
+Set MANAAKI_DIRECTORY_PATH to a CSV, JSON or snapshot file to serve a real
+directory instead; the lookup functions below work the same on either.
 """
 
+import os
+import threading
+
+from services.directory import create_directory
+from services.gazetteer import resolve_location, resolve_region
+
 # Mock service data
 mock_service_data = [
     # Auckland Health Services
@@ -12,6 +21,8 @@ mock_service_data = [
         "name_maori": "Te Tari Hauora o Te Mīhana o Tāmaki Makaurau",
         "location": "Auckland",
         "address": "23 Union Street, Auckland Central",
+        "latitude": -36.8566,
+        "longitude": 174.7580,
         "phone": "09 303 9200",
         "website": "https://www.aucklandcitymission.org.nz/health-services/",
         "type": "general_practitioner",
@@ -28,6 +39,8 @@ mock_service_data = [
         "name_maori": "Hauora Tāmaki",
         "location": "Auckland",
         "address": "Multiple locations across Auckland",
+        "latitude": -36.8485,
+        "longitude": 174.7633,
         "phone": "09 274 7823",
         "website": "https://www.tamakihealth.co.nz",
         "type": "general_practitioner",
@@ -44,6 +57,8 @@ mock_service_data = [
         "name_maori": "Ngā Ratonga Hauora Tuatahi o Waitematā",
         "location": "Auckland",
         "address": "North Shore and Waitakere",
+        "latitude": -36.7800,
+        "longitude": 174.7560,
         "phone": "09 486 8900",
         "website": "https://www.waitematadhb.govt.nz",
         "type": "health_services",
@@ -62,6 +77,8 @@ mock_service_data = [
         "name_maori": "Tū Ora Compass Health",
         "location": "Wellington",
         "address": "Level 4, 22-28 Willeston Street, Wellington",
+        "latitude": -41.2868,
+        "longitude": 174.7765,
         "phone": "04 801 7808",
         "website": "https://www.tuora.org.nz",
         "type": "general_practitioner",
@@ -78,6 +95,8 @@ mock_service_data = [
         "name_maori": "Te Hōhipera o Te Whanganui-a-Tara",
         "location": "Wellington",
         "address": "Riddiford Street, Newtown, Wellington",
+        "latitude": -41.3087,
+        "longitude": 174.7790,
         "phone": "04 385 5999",
         "website": "https://www.ccdhb.org.nz",
         "type": "hospital",
@@ -94,6 +113,8 @@ mock_service_data = [
         "name_maori": "Te Ratonga Hauora Uniana o Newtown",
         "location": "Wellington",
         "address": "14 Hall Street, Newtown, Wellington",
+        "latitude": -41.3110,
+        "longitude": 174.7795,
         "phone": "04 389 2040",
         "website": "https://www.newtownunionhealthservice.org.nz",
         "type": "general_practitioner",
@@ -112,6 +133,8 @@ mock_service_data = [
         "name_maori": "Hauora Pegasus",
         "location": "Christchurch",
         "address": "160 Bealey Avenue, Christchurch",
+        "latitude": -43.5220,
+        "longitude": 172.6370,
         "phone": "03 379 1739",
         "website": "https://www.pegasus.health.nz",
         "type": "general_practitioner",
@@ -128,6 +151,8 @@ mock_service_data = [
         "name_maori": "Te Hōhipera o Ōtautahi",
         "location": "Christchurch",
         "address": "2 Riccarton Avenue, Christchurch",
+        "latitude": -43.5340,
+        "longitude": 172.6260,
         "phone": "03 364 0640",
         "website": "https://www.cdhb.health.nz",
         "type": "hospital",
@@ -210,34 +235,92 @@ mock_service_data = [
     }
 ]
 
-def get_services_by_location(location, service_type=None):
+# Active directory and its version, swapped together as one tuple so readers
+# always see a matching pair; loaded on first use
+_active_state = None
+_directory_lock = threading.Lock()
+
+def get_directory_state():
+    """
+    Get the active service directory together with its version.
+    
+    Returns:
+        tuple: (directory, version), where version increases each time the directory is replaced
+    """
+    global _active_state
+    state = _active_state
+    if state is None:
+        with _directory_lock:
+            if _active_state is None:
+                path = os.environ.get("MANAAKI_DIRECTORY_PATH")
+                if path:
+                    from services.directory_loader import load_directory
+                    _active_state = (load_directory(path), 0)
+                else:
+                    _active_state = (create_directory(mock_service_data), 0)
+            state = _active_state
+    return state
+
+def get_directory():
+    """
+    Get the active service directory, loading it on first use.
+    
+    Returns:
+        ServiceDirectory: Directory loaded from MANAAKI_DIRECTORY_PATH, or the mock data,
+            built with the backend named by MANAAKI_DIRECTORY_BACKEND
+    """
+    return get_directory_state()[0]
+
+def get_directory_version():
+    """
+    Get the version of the active directory.
+    
+    Returns:
+        int: Counter incremented each time the directory is replaced
+    """
+    return get_directory_state()[1]
+
+def set_directory(directory):
+    """
+    Replace the active service directory.
+    
+    Args:
+        directory (ServiceDirectory): Directory to serve from now on
+    """
+    global _active_state
+    with _directory_lock:
+        version = _active_state[1] + 1 if _active_state is not None else 1
+        _active_state = (directory, version)
+
+def load_directory_file(path, backend=None):
+    """
+    Load a directory from a CSV, JSON or snapshot file and make it active.
+    
+    Args:
+        path (str): Directory file path
+        backend (str, optional): Directory backend, see services.directory.create_directory
+    
+    Returns:
+        ServiceDirectory: The loaded directory
+    """
+    from services.directory_loader import load_directory
+    directory = load_directory(path, backend=backend)
+    set_directory(directory)
+    return directory
+
+def get_services_by_location(location, service_type=None, limit=None):
     """
     Filter services by location and optionally by service type.
     
     Args:
         location (str): Location to filter by
         service_type (str, optional): Service type to filter by
+        limit (int, optional): Maximum number of services to return
     
     Returns:
         list: Filtered list of services
     """
-    # Normalize location name
-    normalized_location = location.lower()
-    
-    # Filter services by location
-    services = [
-        service for service in mock_service_data 
-        if service["location"].lower() == normalized_location or service["location"].lower() == "nationwide"
-    ]
-    
-    # Further filter by service type if provided
-    if service_type:
-        services = [
-            service for service in services 
-            if service["type"] == service_type or service_type in service["tags"]
-        ]
-    
-    return services
+    return get_directory().get_services_by_location(get_region_name(location), service_type, limit)
 
 def get_service_by_id(service_id):
     """
@@ -249,31 +332,59 @@ def get_service_by_id(service_id):
     Returns:
         dict: Service data or None if not found
     """
-    for service in mock_service_data:
-        if service["id"] == service_id:
-            return service
-    return None
+    return get_directory().get_service_by_id(service_id)
+
+def get_services_by_ids(service_ids):
+    """
+    Get several services by ID, e.g. to render a page of service cards.
+    
+    Args:
+        service_ids (iterable): IDs of the services to retrieve
+    
+    Returns:
+        list: Services in the order requested, skipping unknown IDs
+    """
+    return get_directory().get_services_by_ids(service_ids)
 
 def get_maori_location_name(location):
     """
     Get the Māori name for a location.
     
     Args:
-        location (str): English location name
+        location (str): Location name in English or te reo Māori
     
     Returns:
         str: Māori location name or original name if not found
     """
-    location_map = {
-        "auckland": "Tāmaki Makaurau",
-        "wellington": "Te Whanganui-a-Tara",
-        "christchurch": "Ōtautahi",
-        "hamilton": "Kirikiriroa",
-        "dunedin": "Ōtepoti",
-        "tauranga": "Tauranga Moana"
-    }
+    place = resolve_location(location)
+    return place.name_maori if place else location
+
+def get_region_name(location):
+    """
+    Get the service region a place belongs to, as services are listed under it.
+    
+    Args:
+        location (str): City, town or suburb in English or te reo Māori
+    
+    Returns:
+        str: Region name, e.g. "Auckland" for "Tāmaki Makaurau", or the name
+            unchanged if it is not in the gazetteer
+    """
+    region = resolve_region(location)
+    return region.name if region else location
+
+def get_english_location_name(location):
+    """
+    Get the English name for a location.
+    
+    Args:
+        location (str): Location name in English or te reo Māori
     
-    return location_map.get(location.lower(), location)
+    Returns:
+        str: English location name or original name if not found
+    """
+    place = resolve_location(location)
+    return place.name if place else location
 
 def get_all_locations():
     """
@@ -282,12 +393,7 @@ def get_all_locations():
     Returns:
         list: List of unique locations
     """
-    locations = set()
-    for service in mock_service_data:
-        if service["location"].lower() != "nationwide":
-            locations.add(service["location"])
-    
-    return sorted(list(locations))
+    return get_directory().get_all_locations()
 
 def get_all_service_types():
     """
@@ -296,10 +402,4 @@ def get_all_service_types():
     Returns:
         list: List of unique service types
     """
-    service_types = set()
-    for service in mock_service_data:
-        service_types.add(service["type"])
-        for tag in service["tags"]:
-            service_types.add(tag)
-    
-    return sorted(list(service_types))
+    return get_directory().get_all_service_types()
@@ -0,0 +1,205 @@
+"""
+Natural language helpers for the Manaaki Navigator Streamlit MVP.
+This module provides a shared preprocessing stage that normalizes and tokenizes
+user input once per turn, and a compiled keyword matcher that works on its output.
+"""
+
+import re
+import unicodedata
+
+# Words are runs of letters/digits, so "whanganui-a-tara" and "GP/Family" split cleanly
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Longest keyword phrase (in tokens) that the n-gram sets cover
+MAX_NGRAM_LENGTH = 4
+
+# Combining marks dropped when folding macrons; a diaeresis is a common
+# stand-in for a macron on keyboards without te reo Māori support
+_MACRON_MARKS = str.maketrans({"\u0304": None, "\u0308": None})
+
+def normalize_text(text):
+    """
+    Normalize text for matching: Unicode NFC, casefolded, trimmed.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: Normalized text
+    """
+    return unicodedata.normalize("NFC", text).casefold().strip()
+
+def fold_macrons(text):
+    """
+    Remove macrons so "tākuta" and "takuta" compare equal.
+
+    Args:
+        text (str): Text to fold
+
+    Returns:
+        str: Text without macrons
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return unicodedata.normalize("NFC", decomposed.translate(_MACRON_MARKS))
+
+def tokenize(text):
+    """
+    Split text into normalized, macron-folded word tokens.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Word tokens
+    """
+    return _TOKEN_PATTERN.findall(fold_macrons(normalize_text(text)))
+
+def split_words(text):
+    """
+    Split text into macron-folded word tokens, keeping their case.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: Word tokens, one per token of tokenize(text)
+    """
+    return _TOKEN_PATTERN.findall(fold_macrons(unicodedata.normalize("NFC", text)))
+
+class ProcessedInput:
+    """
+    User input normalized, tokenized and split into n-grams exactly once.
+
+    One instance is shared by intent detection and every entity extractor,
+    which then only need hash lookups against the n-gram set.
+    """
+
+    __slots__ = ("text", "tokens", "corrections", "ngrams")
+
+    def __init__(self, text, corrector=None):
+        """
+        Preprocess the input text.
+
+        Args:
+            text (str): Raw user input
+            corrector (SpellingCorrector, optional): Corrects typos in the tokens
+                before n-grams are built
+        """
+        self.text = text
+        self.tokens = tuple(tokenize(text))
+        # (original, corrected) pairs, reported with the turn's result
+        self.corrections = ()
+        if corrector is not None:
+            self.tokens, self.corrections = corrector.correct_tokens(self.tokens)
+        self.ngrams = frozenset(
+            " ".join(self.tokens[start:start + length])
+            for start in range(len(self.tokens))
+            for length in range(1, min(MAX_NGRAM_LENGTH, len(self.tokens) - start) + 1)
+        )
+
+def preprocess_input(text, corrector=None):
+    """
+    Run the shared preprocessing stage over user input.
+
+    Args:
+        text (str or ProcessedInput): Raw user input, or already processed input
+        corrector (SpellingCorrector, optional): Corrects typos in raw input
+
+    Returns:
+        ProcessedInput: Normalized tokens and n-grams
+    """
+    if isinstance(text, ProcessedInput):
+        return text
+    return ProcessedInput(text, corrector)
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher compiled once from a priority-ordered table.
+
+    Keywords are stored as normalized phrases in a hash table and matched
+    against the n-grams of a ProcessedInput, so a turn costs one lookup per
+    n-gram no matter how many keywords the table holds. Matches only count
+    on whole words, so "hi" does not fire inside "this". A single-word
+    keyword ending in "*" is a stem that also matches inflected and compound
+    forms, so "health*" matches "healthcare" and "stress*" matches "stressful".
+    """
+
+    def __init__(self, keyword_table):
+        """
+        Compile a keyword table.
+
+        Args:
+            keyword_table (list): (label, keywords) pairs, highest priority first
+
+        Raises:
+            ValueError: If a keyword is longer than MAX_NGRAM_LENGTH words, or a
+                stem keyword has more than one word
+        """
+        self._phrases = {}
+        self._stems = {}
+
+        for priority, (label, keywords) in enumerate(keyword_table):
+            for keyword in keywords:
+                is_stem = keyword.endswith("*")
+                tokens = tokenize(keyword)
+                if not tokens:
+                    continue
+                if len(tokens) > MAX_NGRAM_LENGTH:
+                    raise ValueError(
+                        f"Keyword '{keyword}' is longer than {MAX_NGRAM_LENGTH} words"
+                    )
+                if is_stem and len(tokens) > 1:
+                    raise ValueError(f"Stem keyword '{keyword}' must be a single word")
+                table = self._stems if is_stem else self._phrases
+                labels = table.setdefault(" ".join(tokens), [])
+                if (priority, label) not in labels:
+                    labels.append((priority, label))
+
+        # Stem lengths, so a token is only sliced at lengths some stem has
+        self._stem_lengths = sorted({len(stem) for stem in self._stems})
+
+    def find_all(self, text):
+        """
+        Find every keyword that occurs in the text.
+
+        Args:
+            text (str or ProcessedInput): Text to search
+
+        Returns:
+            list: (priority, label, phrase) tuples, highest priority first
+        """
+        phrases = self._phrases
+        hits = []
+
+        processed = preprocess_input(text)
+        for ngram in processed.ngrams:
+            for priority, label in phrases.get(ngram, ()):
+                hits.append((priority, label, ngram))
+
+        if self._stems:
+            stems = self._stems
+            for token in set(processed.tokens):
+                for length in self._stem_lengths:
+                    if length > len(token):
+                        break
+                    for priority, label in stems.get(token[:length], ()):
+                        hits.append((priority, label, token))
+
+        hits.sort()
+        return hits
+
+    def match(self, text, default=None):
+        """
+        Get the highest-priority label whose keywords appear in the text.
+
+        Args:
+            text (str or ProcessedInput): Text to search
+            default: Value returned when nothing matches
+
+        Returns:
+            str: Matched label or the default
+        """
+        hits = self.find_all(text)
+        if not hits:
+            return default
+        return hits[0][1]
@@ -0,0 +1,105 @@
+"""
+Localized service projections for the Manaaki Navigator Streamlit MVP.
+This module builds read-only English and te reo Māori views of service records once
+per directory, so display code can return shared views instead of building new
+dicts on every request.
+"""
+
+import threading
+from types import MappingProxyType
+
+from utils.language import ENGLISH, MAORI
+
+# Fields shown on a service's detail page
+DETAIL_FIELDS = ("name", "description", "address", "phone", "website", "hours", "cost", "eligibility")
+
+# Fields shown on a recommendation card
+SUMMARY_FIELDS = ("id", "name", "description", "address", "phone", "hours", "cost")
+
+VIEW_FIELDS = {
+    "details": DETAIL_FIELDS,
+    "summary": SUMMARY_FIELDS
+}
+
+# Fields with a te reo Māori variant, falling back to English when missing
+MAORI_FIELDS = {
+    "name": "name_maori",
+    "description": "description_maori"
+}
+
+# Guards publishing a finished projection; building happens outside the lock
+_build_lock = threading.Lock()
+
+def localize_service(service, language, fields):
+    """
+    Build a read-only localized projection of one service.
+
+    Args:
+        service (dict): Service record
+        language (str): Language for the projection (english or maori)
+        fields (tuple): Fields to include
+
+    Returns:
+        MappingProxyType: Read-only view of the localized fields
+    """
+    projection = {}
+    for field in fields:
+        if language == MAORI and field in MAORI_FIELDS:
+            projection[field] = service.get(MAORI_FIELDS[field], service.get(field, ""))
+        else:
+            projection[field] = service.get(field, "")
+    return MappingProxyType(projection)
+
+class LocalizedViewsMixin:
+    """
+    Adds per-language service projections to a directory class.
+
+    Each (language, view) projection is built the first time it is needed and
+    then kept for the lifetime of the directory, so reloading the directory
+    rebuilds them and nothing is copied per request.
+    """
+
+    def localized_view(self, language=ENGLISH, view="summary"):
+        """
+        Get the projection of every service for a language.
+
+        Args:
+            language (str): Language (english or maori); other values fall back to English
+            view (str): "summary" (recommendation cards) or "details" (detail page)
+
+        Returns:
+            MappingProxyType: Read-only mapping of service id to localized view
+        """
+        language = MAORI if language == MAORI else ENGLISH
+        key = (language, view)
+        views = self.__dict__.setdefault("_localized_views", {})
+        projection = views.get(key)
+        if projection is None:
+            fields = VIEW_FIELDS[view]
+            projection = MappingProxyType({
+                service["id"]: localize_service(service, language, fields) for service in self
+            })
+            with _build_lock:
+                projection = views.setdefault(key, projection)
+        return projection
+
+    def warm_localized_views(self):
+        """Build every language and view projection ahead of first use."""
+        for language in (ENGLISH, MAORI):
+            for view in VIEW_FIELDS:
+                self.localized_view(language, view)
+
+    def get_localized_services(self, service_ids, language=ENGLISH, view="summary"):
+        """
+        Get localized views for several services.
+
+        Args:
+            service_ids (iterable): Service IDs
+            language (str): Language (english or maori)
+            view (str): "summary" or "details"
+
+        Returns:
+            list: Read-only views in the order requested, skipping unknown IDs
+        """
+        projection = self.localized_view(language, view)
+        return [projection[service_id] for service_id in service_ids if service_id in projection]
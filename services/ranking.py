@@ -0,0 +1,96 @@
+"""
+Top-k ranking helpers for the Manaaki Navigator Streamlit MVP.
+This module selects the best few services from a lazily streamed set of directory
+candidates with a bounded heap, under a ranking chosen by name, so showing three
+cards never costs a full sort of every matching service.
+"""
+
+import heapq
+
+def top_k(candidates, key, limit=None):
+    """
+    Select the best candidates without sorting all of them.
+
+    Args:
+        candidates (iterable): (row, service) pairs, e.g. from a directory's iter_candidates
+        key (callable): key(row, service) -> sort key, lower is better
+        limit (int, optional): Number of services to keep; None sorts every candidate
+
+    Returns:
+        list: Services, best first
+    """
+    def pair_key(candidate):
+        return key(*candidate)
+
+    if limit is None:
+        selected = sorted(candidates, key=pair_key)
+    else:
+        # Keeps a heap of `limit` entries: O(n log limit) instead of O(n log n)
+        selected = heapq.nsmallest(limit, candidates, key=pair_key)
+    return [service for _, service in selected]
+
+def load_order_ranker(context):
+    """
+    Rank services in the order they were loaded into the directory.
+
+    Args:
+        context (dict): Query context (unused)
+
+    Returns:
+        callable: Key function
+    """
+    def key(row, service):
+        return row
+    return key
+
+def type_match_ranker(context):
+    """
+    Rank exact service type matches before tag matches, then by load order.
+
+    Args:
+        context (dict): Query context with an optional "service_type"
+
+    Returns:
+        callable: Key function
+    """
+    service_type = context.get("service_type")
+
+    def key(row, service):
+        return (0 if not service_type or service["type"] == service_type else 1, row)
+    return key
+
+# Ranking name -> factory building a key function from the query context
+RANKERS = {
+    "load_order": load_order_ranker,
+    "type_match": type_match_ranker
+}
+
+def register_ranker(name, factory):
+    """
+    Add or replace a ranking.
+
+    Args:
+        name (str): Ranking name, used in cache keys
+        factory (callable): factory(context) -> key(row, service), lower is better
+    """
+    RANKERS[name] = factory
+
+def get_ranker(name, context):
+    """
+    Build the key function for a named ranking.
+
+    Args:
+        name (str): Ranking name
+        context (dict): Query context (location, service_type, ...)
+
+    Returns:
+        callable: Key function
+
+    Raises:
+        ValueError: If the ranking is unknown
+    """
+    try:
+        factory = RANKERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown ranking: {name} (expected one of {', '.join(RANKERS)})") from None
+    return factory(context)
@@ -0,0 +1,419 @@
+"""
+Offline conversation replay for the Manaaki Navigator Streamlit MVP.
+This module replays event logs written by services.event_log through
+process_user_input, e.g. to size hardware or check that an optimization does not
+change any response. Logs are streamed one record at a time, and sessions are
+spread over worker processes by a hash of their session ID. Each session's turns
+therefore run in their recorded order on one worker. Each turn starts from the
+context logged with it; logs written before that context was recorded fall back
+to the context rebuilt from the session's earlier turns.
+
+Run from the repository root:
+
+    python -m services.replay logs/events.jsonl --workers 4
+"""
+
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import zlib
+
+from services import instrumentation
+from services.conversation import process_user_input
+from services.event_log import archive_path
+
+# Records sent to a worker at a time, and chunks that may wait per worker
+CHUNK_SIZE = 500
+QUEUE_CHUNKS = 8
+
+# Seconds between checks that the workers are still running while waiting on them
+POLL_SECONDS = 1.0
+
+# Differences kept as examples per worker
+MAX_EXAMPLES = 20
+
+# Rebuilt contexts kept per worker for sessions logged without one; the least
+# recently replayed session is dropped beyond this
+MAX_CONTEXTS = 10000
+
+# Fields compared between the recorded and replayed turn
+COMPARED_FIELDS = ("intent", "entities", "service_ids", "response", "options")
+
+# Keep every timing of a replay: one slot spanning about 30 years
+REPLAY_WINDOW_SECONDS = 10 ** 9
+
+def expand_log_paths(path):
+    """
+    Get the files of a log in the order they were written.
+
+    Args:
+        path (str): Log file; if it is the active file of an event log, its
+            rotated archives are included, oldest first
+
+    Returns:
+        list: File paths
+    """
+    archives = []
+    index = 1
+    while os.path.exists(archive_path(path, index)):
+        archives.append(archive_path(path, index))
+        index += 1
+    paths = archives[::-1]
+    if os.path.exists(path) or not paths:
+        paths.append(path)
+    return paths
+
+def read_events(paths):
+    """
+    Stream event records from JSON Lines files, plain or gzip-compressed.
+
+    Args:
+        paths (list): Files in the order to read them
+
+    Yields:
+        dict: One record per non-empty line
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+def partition(session_id, workers):
+    """
+    Get the worker a session is replayed on.
+
+    Args:
+        session_id (str): Session ID, None for records without one
+        workers (int): Number of workers
+
+    Returns:
+        int: Worker index, the same for every turn of a session
+    """
+    # crc32 rather than hash(): string hashes differ between processes
+    return zlib.crc32(str(session_id).encode("utf-8")) % workers
+
+def replay_turn(record, contexts):
+    """
+    Replay one recorded turn and compare the result.
+
+    Only turns logged without a context leave theirs in contexts, so memory
+    grows with the sessions of old logs, up to MAX_CONTEXTS, and not at all
+    for logs that record the context of every turn.
+
+    Args:
+        record (dict): Event record
+        contexts (dict): Session ID -> context after the session's previous turn,
+            used when the record has no logged context; kept in replay order
+
+    Returns:
+        list: Names of the fields that differ from the recording
+    """
+    session_id = record.get("session_id")
+    if "context" in record:
+        contexts.pop(session_id, None)
+        context = {"session_id": session_id, **record["context"]}
+    else:
+        context = dict(contexts.get(session_id) or {"session_id": session_id})
+    # The sidebar settings are not turns, so take them from the record
+    for key in ("language", "cultural_mode"):
+        if record.get(key) is not None:
+            context[key] = record[key]
+
+    result = process_user_input(record["input"], context)
+    if "context" not in record:
+        # Re-insert so the least recently replayed session comes first
+        contexts.pop(session_id, None)
+        contexts[session_id] = result["context"]
+        if len(contexts) > MAX_CONTEXTS:
+            del contexts[next(iter(contexts))]
+
+    response = result["response"]
+    replayed = {
+        "intent": result["intent"],
+        "entities": result["entities"],
+        "service_ids": [service["id"] for service in response.get("services", ())],
+        "response": response["text"],
+        "options": list(response.get("options", ()))
+    }
+    # Round-trip through JSON so tuples and lists compare equal
+    replayed = json.loads(json.dumps(replayed, default=str))
+    return [field for field in COMPARED_FIELDS if field in record and record[field] != replayed[field]]
+
+class Replayer:
+    """Replays the turns of the sessions assigned to one worker."""
+
+    def __init__(self):
+        self.contexts = {}
+        self.sessions = set()
+        self.turns = 0
+        self.errors = 0
+        self.differences = dict.fromkeys(COMPARED_FIELDS, 0)
+        self.differing_turns = 0
+        self.examples = []
+        self.seconds = 0.0
+
+    def replay(self, records):
+        """
+        Replay records in order.
+
+        Args:
+            records (iterable): Event records
+        """
+        started = time.perf_counter()
+        for record in records:
+            self.turns += 1
+            self.sessions.add(record.get("session_id"))
+            try:
+                fields = replay_turn(record, self.contexts)
+            except Exception as error:
+                self.errors += 1
+                fields = []
+                if len(self.examples) < MAX_EXAMPLES:
+                    self.examples.append({"session_id": record.get("session_id"), "input": record.get("input"),
+                                          "error": repr(error)})
+            if fields:
+                self.differing_turns += 1
+                for field in fields:
+                    self.differences[field] += 1
+                if len(self.examples) < MAX_EXAMPLES:
+                    self.examples.append({"session_id": record.get("session_id"), "input": record.get("input"),
+                                          "fields": fields})
+        self.seconds += time.perf_counter() - started
+
+    def result(self):
+        """
+        Get what this worker replayed, in a form that can cross processes.
+
+        Returns:
+            dict: Counts, differences, examples, busy seconds and timing snapshots
+        """
+        return {
+            "turns": self.turns,
+            "sessions": len(self.sessions),
+            "errors": self.errors,
+            "differing_turns": self.differing_turns,
+            "differences": self.differences,
+            "examples": self.examples,
+            "seconds": self.seconds,
+            "snapshots": instrumentation.get_snapshots()
+        }
+
+def _start_timing():
+    """Record stage timings for the whole replay in this process."""
+    instrumentation.set_window(REPLAY_WINDOW_SECONDS, REPLAY_WINDOW_SECONDS)
+    instrumentation.set_enabled(True)
+
+def _worker(chunks, results):
+    """
+    Worker process: replay chunks until None arrives, then send the result.
+
+    Args:
+        chunks (multiprocessing.Queue): Lists of records for this worker's sessions
+        results (multiprocessing.Queue): Where to put the worker's result
+    """
+    _start_timing()
+    replayer = Replayer()
+    for chunk in iter(chunks.get, None):
+        replayer.replay(chunk)
+    results.put(replayer.result())
+
+def _check_workers(processes):
+    """
+    Fail if a worker process has died.
+
+    Args:
+        processes (list): Worker processes
+
+    Raises:
+        RuntimeError: If a worker exited with an error
+    """
+    if any(process.exitcode not in (None, 0) for process in processes):
+        raise RuntimeError("A replay worker exited without reporting its result")
+
+def _send(chunks, item, processes):
+    """
+    Put an item on a worker's bounded queue, waiting only while every worker is alive.
+
+    Args:
+        chunks (multiprocessing.Queue): Worker's chunk queue
+        item: Chunk of records, or None to stop the worker
+        processes (list): Worker processes
+
+    Raises:
+        RuntimeError: If a worker exits with an error while the queue is full
+    """
+    while True:
+        try:
+            chunks.put(item, timeout=POLL_SECONDS)
+            return
+        except queue.Full:
+            _check_workers(processes)
+
+def _merge_results(results):
+    """Combine worker results into one."""
+    merged = {
+        "turns": 0, "sessions": 0, "errors": 0, "differing_turns": 0,
+        "differences": dict.fromkeys(COMPARED_FIELDS, 0), "examples": [], "worker_seconds": [],
+        "snapshots": {"stages": {}, "intents": {}}
+    }
+    for result in results:
+        for key in ("turns", "sessions", "errors", "differing_turns"):
+            merged[key] += result[key]
+        for field, count in result["differences"].items():
+            merged["differences"][field] += count
+        merged["examples"].extend(result["examples"])
+        merged["worker_seconds"].append(result["seconds"])
+        for group, snapshots in result["snapshots"].items():
+            for name, snapshot in snapshots.items():
+                existing = merged["snapshots"][group].get(name)
+                merged["snapshots"][group][name] = snapshot if existing is None else (
+                    instrumentation.merge_snapshots(existing, snapshot)
+                )
+    return merged
+
+def run_replay(paths, workers=1, limit=None, chunk_size=CHUNK_SIZE):
+    """
+    Replay event logs and compare every turn with its recording.
+
+    Args:
+        paths (list): Log files in the order they were written
+        workers (int): Worker processes; 1 replays in this process
+        limit (int, optional): Stop after this many turns
+        chunk_size (int): Records sent to a worker at a time
+
+    Returns:
+        dict: Report with turns, sessions, throughput, stage and intent
+            latency summaries, difference counts and examples
+    """
+    records = read_events(paths)
+    if limit is not None:
+        records = (record for index, record in zip(range(limit), records))
+
+    started = time.perf_counter()
+    if workers <= 1:
+        _start_timing()
+        replayer = Replayer()
+        replayer.replay(records)
+        results = [replayer.result()]
+    else:
+        result_queue = multiprocessing.Queue()
+        # Bounded queues keep the reader at most a few chunks ahead of each worker
+        chunk_queues = [multiprocessing.Queue(QUEUE_CHUNKS) for _ in range(workers)]
+        processes = [
+            multiprocessing.Process(target=_worker, args=(chunk_queues[index], result_queue), daemon=True)
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            buffers = [[] for _ in range(workers)]
+            for record in records:
+                index = partition(record.get("session_id"), workers)
+                buffers[index].append(record)
+                if len(buffers[index]) >= chunk_size:
+                    _send(chunk_queues[index], buffers[index], processes)
+                    buffers[index] = []
+            for index in range(workers):
+                if buffers[index]:
+                    _send(chunk_queues[index], buffers[index], processes)
+                _send(chunk_queues[index], None, processes)
+
+            results = []
+            while len(results) < workers:
+                try:
+                    results.append(result_queue.get(timeout=POLL_SECONDS))
+                except queue.Empty:
+                    _check_workers(processes)
+        except BaseException:
+            # Don't leave the surviving workers waiting for chunks that will never come
+            for process in processes:
+                process.terminate()
+            raise
+        for process in processes:
+            process.join()
+    elapsed = time.perf_counter() - started
+
+    merged = _merge_results(results)
+    snapshots = merged.pop("snapshots")
+    merged["workers"] = max(1, workers)
+    merged["elapsed_s"] = elapsed
+    merged["turns_per_second"] = merged["turns"] / elapsed if elapsed else 0.0
+    merged["stages"] = {stage: instrumentation.summarize(snapshot) for stage, snapshot in snapshots["stages"].items()}
+    merged["intents"] = {intent: instrumentation.summarize(snapshot) for intent, snapshot in snapshots["intents"].items()}
+    merged["examples"] = merged["examples"][:MAX_EXAMPLES]
+    return merged
+
+def format_report(report):
+    """
+    Format a replay report as plain text.
+
+    Args:
+        report (dict): Report returned by run_replay
+
+    Returns:
+        str: Human-readable report
+    """
+    lines = [
+        f"Turns: {report['turns']} from {report['sessions']} session(s) in {report['elapsed_s']:.3f}s "
+        f"({report['turns_per_second']:.0f} turns/s over {report['workers']} worker(s))"
+    ]
+    busiest = max(report["worker_seconds"], default=0.0)
+    lines.append(f"Busiest worker: {busiest:.3f}s replaying")
+
+    for title, summaries in (("Stage", report["stages"]), ("Intent", report["intents"])):
+        lines.append("")
+        lines.append(f"{title:<20} {'count':>8} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'max us':>9}")
+        for name, summary in summaries.items():
+            lines.append(
+                f"{name:<20} {summary['count']:>8} {summary['p50_us']:>9.1f} {summary['p95_us']:>9.1f} "
+                f"{summary['p99_us']:>9.1f} {summary['max_us']:>9.1f}"
+            )
+
+    lines.append("")
+    lines.append(f"Turns differing from the recording: {report['differing_turns']}, errors: {report['errors']}")
+    for field, count in report["differences"].items():
+        if count:
+            lines.append(f"  {field}: {count}")
+    for example in report["examples"]:
+        detail = example.get("error") or ", ".join(example["fields"])
+        lines.append(f"  session {example['session_id']}: {example['input']!r} -> {detail}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Command-line arguments
+
+    Returns:
+        int: Process exit status
+    """
+    parser = argparse.ArgumentParser(description="Replay Manaaki Navigator event logs through the conversation pipeline.")
+    parser.add_argument("paths", nargs="+", help="event log files (.jsonl or .gz); an active log includes its archives")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (1 replays in-process)")
+    parser.add_argument("--limit", type=int, help="stop after this many turns")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records sent to a worker at a time")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 if any turn differs or fails")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        paths.extend(expand_log_paths(path))
+    report = run_replay(paths, args.workers, args.limit, args.chunk_size)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    if args.strict and (report["differing_turns"] or report["errors"]):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
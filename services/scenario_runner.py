@@ -0,0 +1,261 @@
+"""
+Headless scenario runner for the Manaaki Navigator Streamlit MVP.
+This module runs the conversation test scenarios through process_user_input without
+the Streamlit UI, checks each step automatically and reports pipeline throughput.
+
+Usage:
+    python -m services.scenario_runner --iterations 200 --warmup 10 --allocations
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from services.conversation import get_spelling_index_stats, process_user_input
+from services.scenarios import test_scenarios
+
+def percentile(sorted_values, pct):
+    """
+    Get a percentile from sorted values using the nearest-rank method.
+
+    Args:
+        sorted_values (list): Values in ascending order
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def run_scenario(scenario, trace_allocations=False):
+    """
+    Run every step of a scenario from a fresh conversation context.
+
+    Args:
+        scenario (dict): Scenario with language, cultural_mode and steps
+        trace_allocations (bool): Record bytes allocated per step (tracemalloc must be running)
+
+    Returns:
+        list: Step results with pass/fail, latency and allocation data
+    """
+    context = {
+        "language": scenario["language"],
+        "cultural_mode": scenario["cultural_mode"]
+    }
+    step_results = []
+
+    for index, step in enumerate(scenario["steps"]):
+        if trace_allocations:
+            tracemalloc.reset_peak()
+            allocated_before = tracemalloc.get_traced_memory()[0]
+
+        started = time.perf_counter_ns()
+        result = process_user_input(step["input"], context)
+        latency_ns = time.perf_counter_ns() - started
+
+        allocated_bytes = None
+        if trace_allocations:
+            allocated_bytes = tracemalloc.get_traced_memory()[1] - allocated_before
+
+        context = result["context"]
+        response_text = result["response"]["text"]
+        step_results.append({
+            "scenario_id": scenario["id"],
+            "step": index + 1,
+            "input": step["input"],
+            "expected_contains": step["expected_contains"],
+            "passed": step["expected_contains"] in response_text,
+            "intent": result["intent"],
+            "response": response_text,
+            "latency_ns": latency_ns,
+            "allocated_bytes": allocated_bytes
+        })
+
+    return step_results
+
+def _latency_summary(latencies_ns):
+    """
+    Summarize step latencies.
+
+    Args:
+        latencies_ns (list): Latencies in nanoseconds
+
+    Returns:
+        dict: p50/p95/p99/max latency in microseconds
+    """
+    ordered = sorted(latencies_ns)
+    return {
+        "p50_us": percentile(ordered, 50) / 1000,
+        "p95_us": percentile(ordered, 95) / 1000,
+        "p99_us": percentile(ordered, 99) / 1000,
+        "max_us": (ordered[-1] if ordered else 0) / 1000
+    }
+
+def run_scenarios(scenarios=None, iterations=1, warmup=0, trace_allocations=False):
+    """
+    Run scenarios repeatedly and collect correctness and performance figures.
+
+    Latency is measured in its own loop; when allocations are requested they
+    are measured in one extra pass so tracemalloc overhead does not skew timings.
+
+    Args:
+        scenarios (list, optional): Scenarios to run, defaults to all test scenarios
+        iterations (int): Number of timed passes over the scenarios
+        warmup (int): Number of untimed passes run first
+        trace_allocations (bool): Measure bytes allocated per step
+
+    Returns:
+        dict: Report with per-step checks, latency percentiles and throughput
+    """
+    scenarios = test_scenarios if scenarios is None else scenarios
+
+    for _ in range(warmup):
+        for scenario in scenarios:
+            run_scenario(scenario)
+
+    latencies = {}
+    step_results = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for scenario in scenarios:
+            for step_result in run_scenario(scenario):
+                key = (step_result["scenario_id"], step_result["step"])
+                latencies.setdefault(key, []).append(step_result["latency_ns"])
+                if len(step_results) < len(latencies):
+                    step_results.append(step_result)
+    elapsed = time.perf_counter() - started
+
+    allocations = {}
+    if trace_allocations:
+        tracemalloc.start()
+        try:
+            for scenario in scenarios:
+                for step_result in run_scenario(scenario, trace_allocations=True):
+                    key = (step_result["scenario_id"], step_result["step"])
+                    allocations[key] = step_result["allocated_bytes"]
+        finally:
+            tracemalloc.stop()
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    steps = []
+    for step_result in step_results:
+        key = (step_result["scenario_id"], step_result["step"])
+        steps.append({
+            "scenario_id": step_result["scenario_id"],
+            "step": step_result["step"],
+            "input": step_result["input"],
+            "expected_contains": step_result["expected_contains"],
+            "passed": step_result["passed"],
+            "intent": step_result["intent"],
+            "response": step_result["response"],
+            "latency": _latency_summary(latencies[key]),
+            "allocated_bytes": allocations.get(key)
+        })
+
+    turns = len(all_latencies)
+    return {
+        "iterations": iterations,
+        "turns": turns,
+        "elapsed_s": elapsed,
+        "turns_per_second": turns / elapsed if elapsed else 0.0,
+        "latency": _latency_summary(all_latencies),
+        "passed": sum(1 for step in steps if step["passed"]),
+        "failed": sum(1 for step in steps if not step["passed"]),
+        "allocated_bytes_per_turn": (
+            sum(allocations.values()) / len(allocations) if allocations else None
+        ),
+        "spelling_index": get_spelling_index_stats(),
+        "steps": steps
+    }
+
+def format_report(report):
+    """
+    Format a runner report as plain text.
+
+    Args:
+        report (dict): Report returned by run_scenarios
+
+    Returns:
+        str: Human-readable report
+    """
+    lines = []
+    for step in report["steps"]:
+        status = "PASS" if step["passed"] else "FAIL"
+        latency = step["latency"]
+        line = (
+            f"[{status}] scenario {step['scenario_id']} step {step['step']}: "
+            f"{step['input']!r} -> {step['intent']} "
+            f"(p50 {latency['p50_us']:.1f}us, p95 {latency['p95_us']:.1f}us, p99 {latency['p99_us']:.1f}us"
+        )
+        if step["allocated_bytes"] is not None:
+            line += f", {step['allocated_bytes']} B allocated"
+        lines.append(line + ")")
+        if not step["passed"]:
+            lines.append(f"       expected to contain {step['expected_contains']!r}")
+
+    latency = report["latency"]
+    lines.append("")
+    lines.append(f"Steps passed: {report['passed']}/{report['passed'] + report['failed']}")
+    lines.append(
+        f"Turns: {report['turns']} in {report['elapsed_s']:.3f}s "
+        f"({report['turns_per_second']:.0f} turns/s over {report['iterations']} iteration(s))"
+    )
+    lines.append(
+        f"Latency: p50 {latency['p50_us']:.1f}us, p95 {latency['p95_us']:.1f}us, "
+        f"p99 {latency['p99_us']:.1f}us, max {latency['max_us']:.1f}us"
+    )
+    if report["allocated_bytes_per_turn"] is not None:
+        lines.append(f"Allocations: {report['allocated_bytes_per_turn']:.0f} B per turn (peak)")
+    spelling = report["spelling_index"]
+    lines.append(
+        f"Spelling index: {spelling['words']} words, {spelling['deletes']} delete entries, "
+        f"{spelling['memory_bytes'] / 1024:.0f} KiB"
+    )
+    return "\n".join(lines)
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Command-line arguments
+
+    Returns:
+        int: Process exit status
+    """
+    parser = argparse.ArgumentParser(description="Run Manaaki Navigator conversation scenarios headlessly.")
+    parser.add_argument("--iterations", type=int, default=1, help="timed passes over all scenarios")
+    parser.add_argument("--warmup", type=int, default=0, help="untimed passes run before timing")
+    parser.add_argument("--scenario", type=int, action="append", help="only run the scenario with this id (repeatable)")
+    parser.add_argument("--allocations", action="store_true", help="measure bytes allocated per step with tracemalloc")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 if any step fails")
+    args = parser.parse_args(argv)
+
+    scenarios = test_scenarios
+    if args.scenario:
+        scenarios = [scenario for scenario in test_scenarios if scenario["id"] in args.scenario]
+
+    report = run_scenarios(
+        scenarios,
+        iterations=max(1, args.iterations),
+        warmup=max(0, args.warmup),
+        trace_allocations=args.allocations
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report))
+
+    if args.strict and report["failed"]:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Conversation test scenarios for the Manaaki Navigator Streamlit MVP.
+These scenarios drive both the interactive testing page and the headless scenario runner.
+"""
+
+from utils.language import ENGLISH, MAORI, GENERAL, MAORI_RESPONSIVE
+
+# Define test scenarios
+test_scenarios = [
+    {
+        "id": 1,
+        "name": "Health Services Scenario - English",
+        "description": "User seeking GP services in Auckland",
+        "language": ENGLISH,
+        "cultural_mode": GENERAL,
+        "steps": [
+            {"input": "Hello", "expected_contains": "help connect you with support services"},
+            {"input": "I need to find a doctor", "expected_contains": "health services"},
+            {"input": "Auckland", "expected_contains": "Auckland"},
+            {"input": "GP/Family doctor", "expected_contains": "Community Services Card"}
+        ]
+    },
+    {
+        "id": 2,
+        "name": "Housing Assistance Scenario - English",
+        "description": "User seeking emergency housing",
+        "language": ENGLISH,
+        "cultural_mode": GENERAL,
+        "steps": [
+            {"input": "I need housing help", "expected_contains": "housing assistance"},
+            {"input": "Emergency housing", "expected_contains": "Emergency Housing Special Needs Grant"},
+            {"input": "How do I apply?", "expected_contains": "apply"}
+        ]
+    },
+    {
+        "id": 3,
+        "name": "Māori Cultural Adaptation Scenario",
+        "description": "User interacting in te reo Māori",
+        "language": MAORI,
+        "cultural_mode": MAORI_RESPONSIVE,
+        "steps": [
+            {"input": "Tēnā koe", "expected_contains": "Tēnā koe"},
+            {"input": "He āwhina hauora", "expected_contains": "ratonga hauora"},
+            {"input": "Tāmaki Makaurau", "expected_contains": "Tāmaki Makaurau"}
+        ]
+    },
+    {
+        "id": 4,
+        "name": "Financial Support Scenario - English with Māori Responsive",
+        "description": "User seeking financial assistance with cultural adaptation",
+        "language": ENGLISH,
+        "cultural_mode": MAORI_RESPONSIVE,
+        "steps": [
+            {"input": "Kia ora", "expected_contains": "Kia ora"},
+            {"input": "I need financial help", "expected_contains": "financial assistance"},
+            {"input": "Benefits & payments", "expected_contains": "Work and Income"}
+        ]
+    },
+    {
+        "id": 5,
+        "name": "Mental Health Support Scenario",
+        "description": "User seeking mental health support",
+        "language": ENGLISH,
+        "cultural_mode": GENERAL,
+        "steps": [
+            {"input": "I'm feeling anxious", "expected_contains": "mental health"},
+            {"input": "Talk to someone now", "expected_contains": "1737"}
+        ]
+    }
+]
@@ -0,0 +1,235 @@
+"""
+Free-text service search for the Manaaki Navigator Streamlit MVP.
+This module ranks services against what the user wrote with BM25 over their
+English and te reo Māori names, descriptions, tags and eligibility. Term scores
+are precomputed into impact-ordered postings, so a query only reads the head of
+each posting list it needs instead of scanning the directory.
+"""
+
+import heapq
+import math
+import threading
+
+from services.directory import NATIONWIDE
+from services.nlu import preprocess_input, tokenize
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Searched fields and how much an occurrence in each counts
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "name_maori": 3.0,
+    "tags": 2.0,
+    "description": 1.0,
+    "description_maori": 1.0,
+    "eligibility": 1.0
+}
+
+# Words too common to say anything about a service
+STOPWORDS = frozenset("""
+a an and are as at be by can for from have i in is it me my near need of on or
+please some that the to with you your e i te ki ko nga ngā o he mo mō
+""".split())
+
+# Guards attaching an index to a directory; building happens outside the lock
+_attach_lock = threading.Lock()
+
+def stem(token):
+    """
+    Strip a plural "s" so "doctors" and "doctor" share postings.
+
+    Args:
+        token (str): Normalized token
+
+    Returns:
+        str: Stemmed token
+    """
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+def search_terms(tokens):
+    """
+    Turn normalized tokens into index terms.
+
+    Args:
+        tokens (iterable): Tokens from nlu.tokenize or a ProcessedInput
+
+    Returns:
+        list: Terms, without stopwords
+    """
+    return [stem(token) for token in tokens if token not in STOPWORDS]
+
+def _field_text(service, field):
+    """
+    Get the searchable text of one field of a service.
+
+    Args:
+        service (Mapping): Service record
+        field (str): Field name
+
+    Returns:
+        str: Field text, empty if the field is missing
+    """
+    value = service.get(field)
+    if not value:
+        return ""
+    if field == "tags":
+        return " ".join(tag.replace("_", " ") for tag in value)
+    return value
+
+class SearchIndex:
+    """
+    BM25 inverted index over a directory's services.
+
+    Each posting stores the service's full BM25 contribution for the term, and
+    posting lists are sorted by that impact. A query walks its lists in step and
+    stops once the best k services found so far outscore anything the unread
+    remainder of the lists could add up to (the threshold algorithm).
+    """
+
+    def __init__(self, services, k1=BM25_K1, b=BM25_B):
+        """
+        Build the index.
+
+        Args:
+            services (iterable): Service records
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 length normalization
+        """
+        self._services = list(services)
+
+        # Directories repeat a lot of text (eligibility, shared descriptions),
+        # so each distinct field value is tokenized once
+        terms_by_text = {}
+        frequencies_by_row = []
+        for service in self._services:
+            frequencies = {}
+            for field, weight in FIELD_WEIGHTS.items():
+                text = _field_text(service, field)
+                terms = terms_by_text.get(text)
+                if terms is None:
+                    terms = terms_by_text[text] = search_terms(tokenize(text))
+                for term in terms:
+                    frequencies[term] = frequencies.get(term, 0.0) + weight
+            frequencies_by_row.append(frequencies)
+
+        lengths = [sum(frequencies.values()) for frequencies in frequencies_by_row]
+        average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        document_frequency = {}
+        for frequencies in frequencies_by_row:
+            for term in frequencies:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        count = len(self._services)
+        self._impacts = {}
+        for row, frequencies in enumerate(frequencies_by_row):
+            length_ratio = lengths[row] / average_length if average_length else 1.0
+            normalizer = k1 * (1 - b + b * length_ratio)
+            for term, frequency in frequencies.items():
+                frequency_in_corpus = document_frequency[term]
+                idf = math.log(1 + (count - frequency_in_corpus + 0.5) / (frequency_in_corpus + 0.5))
+                impact = idf * frequency * (k1 + 1) / (frequency + normalizer)
+                self._impacts.setdefault(term, {})[row] = impact
+
+        # Postings ordered by impact, highest first, ties in load order
+        self._postings = {
+            term: sorted(((impact, row) for row, impact in impacts.items()), key=lambda posting: (-posting[0], posting[1]))
+            for term, impacts in self._impacts.items()
+        }
+
+        # Precompute "location ∪ nationwide" for every location
+        location_rows = {}
+        for row, service in enumerate(self._services):
+            location_rows.setdefault(service["location"].lower(), set()).add(row)
+        self._nationwide_rows = frozenset(location_rows.get(NATIONWIDE, ()))
+        self._regional_rows = {
+            location: frozenset(rows | self._nationwide_rows)
+            for location, rows in location_rows.items() if location != NATIONWIDE
+        }
+
+    def __len__(self):
+        return len(self._postings)
+
+    def _allowed_rows(self, location):
+        """
+        Get the rows a location filter keeps: the location's services plus nationwide ones.
+
+        Args:
+            location (str, optional): Location, or None for no filter
+
+        Returns:
+            frozenset: Allowed rows, or None when not filtering
+        """
+        if not location:
+            return None
+        return self._regional_rows.get(location.lower(), self._nationwide_rows)
+
+    def search(self, query, location=None, limit=5):
+        """
+        Get the services that best match a query.
+
+        Args:
+            query (str or ProcessedInput): What the user wrote
+            location (str, optional): Only include services in this location or nationwide
+            limit (int): Maximum number of services to return
+
+        Returns:
+            list: (service, score) tuples, best first; services matching no term are left out
+        """
+        terms = list(dict.fromkeys(
+            term for term in search_terms(preprocess_input(query).tokens) if term in self._postings
+        ))
+        if not terms or limit <= 0:
+            return []
+
+        posting_lists = [self._postings[term] for term in terms]
+        impacts = [self._impacts[term] for term in terms]
+        allowed = self._allowed_rows(location)
+
+        best = []
+        seen = set()
+        for depth in range(max(len(postings) for postings in posting_lists)):
+            # Upper bound on the score of any service not read yet
+            threshold = 0.0
+            for postings in posting_lists:
+                if depth >= len(postings):
+                    continue
+                impact, row = postings[depth]
+                threshold += impact
+                if row in seen:
+                    continue
+                seen.add(row)
+                if allowed is not None and row not in allowed:
+                    continue
+                entry = (sum(term_impacts.get(row, 0.0) for term_impacts in impacts), -row)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+            if len(best) == limit and best[0][0] > threshold:
+                break
+
+        return [(self._services[-negative_row], score) for score, negative_row in sorted(best, reverse=True)]
+
+def get_search_index(directory):
+    """
+    Get a directory's search index, building it on first use.
+
+    The index is kept on the directory object, so a reloaded directory gets a
+    fresh index and queries never see a mix of old and new services.
+
+    Args:
+        directory (ServiceDirectory): Directory to index
+
+    Returns:
+        SearchIndex: The directory's index
+    """
+    index = directory.__dict__.get("_search_index")
+    if index is None:
+        index = SearchIndex(directory)
+        with _attach_lock:
+            index = directory.__dict__.setdefault("_search_index", index)
+    return index
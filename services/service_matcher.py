@@ -3,35 +3,194 @@ Service matching logic for the Manaaki Navigator Streamlit MVP.
 This module provides functions for matching user needs to appropriate services.
 """
 
-from services.mock_data import get_services_by_location, get_service_by_id, get_all_locations, get_all_service_types
+import math
+import time
 
-def match_services(user_context):
+from services.directory import NATIONWIDE
+from services.geo import resolve_place
+from services.metrics import record_directory_query, register_cache
+from services.mock_data import (
+    get_directory, get_directory_state, get_directory_version, get_all_locations, get_all_service_types, get_region_name
+)
+from services.nlu import preprocess_input
+from services.ranking import get_ranker, top_k
+from services.search import get_search_index
+from utils.cache import LRUCache
+
+# Services within this distance of a place count as local to it
+SEARCH_RADIUS_KM = 50
+
+# Maximum number of nearby services merged into a ranked match
+MAX_NEARBY_SERVICES = 20
+
+# Memoized results, invalidated together whenever the directory version changes
+MATCH_CACHE_SIZE = 1024
+_match_cache = LRUCache(MATCH_CACHE_SIZE, version_source=get_directory_version)
+_recommendation_cache = LRUCache(MATCH_CACHE_SIZE, version_source=get_directory_version)
+_search_cache = LRUCache(MATCH_CACHE_SIZE, version_source=get_directory_version)
+register_cache("match_services", _match_cache.stats)
+register_cache("recommendations", _recommendation_cache.stats)
+register_cache("search", _search_cache.stats)
+
+def configure_cache(maxsize):
+    """
+    Set the maximum number of entries kept by each matching cache.
+    
+    Args:
+        maxsize (int): Maximum entries per cache
+    """
+    _match_cache.resize(maxsize)
+    _recommendation_cache.resize(maxsize)
+    _search_cache.resize(maxsize)
+
+def get_cache_stats():
+    """
+    Get statistics for the matching caches, for tuning their size.
+    
+    Returns:
+        dict: Stats for the "match_services", "recommendations" and "search" caches
+    """
+    return {
+        "match_services": _match_cache.stats(),
+        "recommendations": _recommendation_cache.stats(),
+        "search": _search_cache.stats()
+    }
+
+def clear_caches():
+    """Drop every memoized match, recommendation and search."""
+    _match_cache.clear()
+    _recommendation_cache.clear()
+    _search_cache.clear()
+
+def match_services(user_context, limit=None):
     """
     Match services based on user context (location, needs, etc.)
     
     Args:
-        user_context (dict): User context including location, service type, etc.
+        user_context (dict): User context including location (any place name
+            the gazetteer knows), service type, etc.
+        limit (int, optional): Maximum number of services to return
     
     Returns:
         list: Matched services
     """
     location = user_context.get("location", "")
     service_type = user_context.get("service_type", "")
+    locality = user_context.get("locality")
     
     if not location:
         return []
+    location = get_region_name(location)
     
-    # Get services by location and optionally by service type
-    services = get_services_by_location(location, service_type)
+    cache_key = (location.lower(), service_type or None, locality, limit)
+    services = _match_cache.get(cache_key)
+    if services is None:
+        directory, version = get_directory_state()
+        started = time.perf_counter()
+        services = tuple(_rank_services(directory, location, service_type, locality, limit))
+        record_directory_query("match_services", time.perf_counter() - started, len(services))
+        _match_cache.put(cache_key, services, version)
     
-    # Sort services by relevance (simplified implementation)
-    # In a real implementation, this would use more sophisticated ranking
-    if service_type:
-        # Put exact type matches first
-        services.sort(key=lambda s: 0 if s["type"] == service_type else 
-                     (1 if service_type in s["tags"] else 2))
+    return list(services)
+
+def _rank_services(directory, location, service_type, locality=None, limit=None):
+    """
+    Rank services for a location without consulting the cache.
     
-    return services
+    Services listed under the location and services within SEARCH_RADIUS_KM of the
+    locality (or of the location itself) are ranked by type match (exact type
+    before tag), then local before nationwide, then by distance, then load order.
+    A town with no services of its own still gets its nearest local services.
+    
+    Args:
+        directory (ServiceDirectory): Directory to query
+        location (str): User's location
+        service_type (str, optional): Type of service needed
+        locality (str, optional): Suburb or town within the location
+        limit (int, optional): Maximum number of services to return
+    
+    Returns:
+        list: Ranked services
+    """
+    coordinates = resolve_place(locality or location)
+    nearby = []
+    if coordinates is not None:
+        nearby = directory.nearest_services(
+            *coordinates, service_type=service_type, k=MAX_NEARBY_SERVICES, radius_km=SEARCH_RADIUS_KM
+        )
+    
+    # The backend ranks the location's services by everything but distance.
+    # Nearby services outrank the rest of their group, so at most `limit` others
+    # can be needed once the nearby ones are set aside.
+    fetch = None if limit is None else limit + len(nearby)
+    ranked = directory.match_services(location, service_type, fetch)
+    if not nearby:
+        return ranked[:limit]
+    
+    distances = {service["id"]: distance for service, distance in nearby}
+    
+    def rank(position, service):
+        type_rank = 0 if not service_type or service["type"] == service_type else 1
+        is_nationwide = service["location"].lower() == NATIONWIDE
+        return (type_rank, is_nationwide, distances.get(service["id"], math.inf), position)
+    
+    others = [service for service in ranked if service["id"] not in distances][:limit]
+    candidates = [(position, service) for position, (service, _) in enumerate(nearby)]
+    candidates += [(position, service) for position, service in enumerate(others)]
+    return top_k(candidates, rank, limit)
+
+def find_nearest_services(location, service_type=None, limit=5, radius_km=SEARCH_RADIUS_KM):
+    """
+    Find the services nearest to a place.
+    
+    Args:
+        location (str): Place name (city, town or suburb, English or te reo Māori)
+        service_type (str, optional): Only include services of this type or tag
+        limit (int): Maximum number of services to return
+        radius_km (float, optional): Only include services within this distance
+    
+    Returns:
+        list: (service, distance_km) tuples, nearest first; empty if the place is unknown
+    """
+    coordinates = resolve_place(location)
+    if coordinates is None:
+        return []
+    started = time.perf_counter()
+    nearest = get_directory().nearest_services(*coordinates, service_type=service_type, k=limit, radius_km=radius_km)
+    record_directory_query("nearest", time.perf_counter() - started, len(nearest))
+    return nearest
+
+def search_services(query, location=None, language="english", limit=5):
+    """
+    Rank services by how well their names, descriptions, tags and eligibility match free text.
+    
+    Args:
+        query (str or ProcessedInput): What the user wrote, in English or te reo Māori
+        location (str, optional): Only include services in this location (English or
+            te reo Māori name) or nationwide
+        language (str): Language for service details
+        limit (int): Maximum number of services to return
+    
+    Returns:
+        list: Read-only services formatted for display, best match first
+    """
+    processed = preprocess_input(query)
+    if location:
+        location = get_region_name(location)
+    cache_key = (processed.tokens, location.lower() if location else None, language, limit)
+    results = _search_cache.get(cache_key)
+    if results is None:
+        directory, version = get_directory_state()
+        started = time.perf_counter()
+        projection = directory.localized_view(language, "summary")
+        results = tuple(
+            projection[service["id"]]
+            for service, _ in get_search_index(directory).search(processed, location, limit)
+        )
+        record_directory_query("search", time.perf_counter() - started, len(results))
+        _search_cache.put(cache_key, results, version)
+    
+    return list(results)
 
 def get_service_details(service_id, language="english"):
     """
@@ -42,73 +201,75 @@ def get_service_details(service_id, language="english"):
         language (str): Language for service details
     
     Returns:
-        dict: Service details formatted for display
-    """
-    service = get_service_by_id(service_id)
-    if not service:
-        return None
-    
-    # Format service details based on language
-    if language == "maori":
-        return {
-            "name": service.get("name_maori", service["name"]),
-            "description": service.get("description_maori", service["description"]),
-            "address": service["address"],
-            "phone": service["phone"],
-            "website": service["website"],
-            "hours": service["hours"],
-            "cost": service["cost"],
-            "eligibility": service["eligibility"]
-        }
-    else:  # english
-        return {
-            "name": service["name"],
-            "description": service["description"],
-            "address": service["address"],
-            "phone": service["phone"],
-            "website": service["website"],
-            "hours": service["hours"],
-            "cost": service["cost"],
-            "eligibility": service["eligibility"]
-        }
-
-def get_service_recommendations(location, service_type=None, language="english", limit=3):
+        Mapping: Read-only service details formatted for display, or None if not found
+    """
+    return get_directory().localized_view(language, "details").get(service_id)
+
+def get_services_for_display(service_ids, language="english", directory=None):
+    """
+    Resolve service IDs stored in chat history into card views for rendering.
+    
+    Args:
+        service_ids (iterable): IDs of the services to show
+        language (str): Language the services were recommended in
+        directory (ServiceDirectory, optional): Directory pinned for the whole
+            page render; defaults to the active directory
+    
+    Returns:
+        list: Read-only localized views, skipping services no longer in the directory
+    """
+    directory = directory or get_directory()
+    return directory.get_localized_services(service_ids, language, "summary")
+
+def get_service_recommendations(location, service_type=None, language="english", limit=3, ranking="load_order"):
     """
     Get service recommendations based on location and service type.
     
     Args:
+        location (str): User's location, e.g. "Auckland" or "Tāmaki Makaurau"
+        service_type (str, optional): Type of service needed
+        language (str): Language for service details
+        limit (int): Maximum number of recommendations to return
+        ranking (str): Name of a ranking registered in services.ranking
+    
+    Returns:
+        list: Read-only recommended services formatted for display
+    """
+    location = get_region_name(location)
+    cache_key = (location.lower(), service_type or None, language, limit, ranking)
+    recommendations = _recommendation_cache.get(cache_key)
+    if recommendations is None:
+        directory, version = get_directory_state()
+        started = time.perf_counter()
+        recommendations = tuple(_build_recommendations(directory, location, service_type, language, limit, ranking))
+        record_directory_query("recommendations", time.perf_counter() - started, len(recommendations))
+        _recommendation_cache.put(cache_key, recommendations, version)
+    
+    return list(recommendations)
+
+def _build_recommendations(directory, location, service_type, language, limit, ranking="load_order"):
+    """
+    Build service recommendations without consulting the cache.
+    
+    Args:
+        directory (ServiceDirectory): Directory to query
         location (str): User's location
         service_type (str, optional): Type of service needed
         language (str): Language for service details
         limit (int): Maximum number of recommendations to return
+        ranking (str): Name of a ranking registered in services.ranking
     
     Returns:
         list: Recommended services formatted for display
     """
-    services = get_services_by_location(location, service_type)
-    
-    # Format service recommendations based on language
-    recommendations = []
-    for service in services[:limit]:
-        if language == "maori":
-            recommendations.append({
-                "id": service["id"],
-                "name": service.get("name_maori", service["name"]),
-                "description": service.get("description_maori", service["description"]),
-                "address": service["address"],
-                "phone": service["phone"],
-                "hours": service["hours"],
-                "cost": service["cost"]
-            })
-        else:  # english
-            recommendations.append({
-                "id": service["id"],
-                "name": service["name"],
-                "description": service["description"],
-                "address": service["address"],
-                "phone": service["phone"],
-                "hours": service["hours"],
-                "cost": service["cost"]
-            })
-    
-    return recommendations
+    if ranking == "load_order":
+        # The directory's indexes already hold rows in load order, so the first
+        # `limit` are read off directly instead of scanning every candidate
+        services = directory.get_services_by_location(location, service_type, limit)
+    else:
+        # Candidates are streamed from the directory into a heap of `limit` entries
+        key = get_ranker(ranking, {"location": location, "service_type": service_type})
+        services = top_k(directory.iter_candidates(location, service_type), key, limit)
+    # Only the winners become precomputed read-only views for the language
+    projection = directory.localized_view(language, "summary")
+    return [projection[service["id"]] for service in services]
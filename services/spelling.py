@@ -0,0 +1,263 @@
+"""
+Spelling correction for the Manaaki Navigator Streamlit MVP.
+This module corrects typos in user input against the app's own vocabulary (intent
+keywords, service type keywords and place names) using a precomputed
+SymSpell-style delete index, so each token costs a fixed number of hash lookups
+however large the vocabulary grows. Only tokens that are not real English or
+te reo Māori words are corrected; the word lists are in services/data.
+"""
+
+import gzip
+import os
+import sys
+
+from services.nlu import tokenize
+from utils.cache import LRUCache
+
+# Tokens shorter than this are never corrected; short words are too easily
+# one edit away from an unrelated keyword ("hi" / "hu", "gp" / "go")
+MIN_CORRECTION_LENGTH = 5
+
+# Tokens at least this long may be corrected by two edits, shorter ones by one.
+# Shorter tokens are never corrected into place names: one edit separates many
+# everyday words from a town ("matua" / "Māpua", "stroke" / "Stoke").
+LONG_TOKEN_LENGTH = 8
+
+MAX_EDIT_DISTANCE = 2
+
+# Distinct misspellings whose correction is remembered
+CORRECTION_CACHE_SIZE = 4096
+
+# English (with NZ spellings) and te reo Māori word lists; see services/data/README.md
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+LEXICON_PATHS = (
+    os.path.join(DATA_DIRECTORY, "lexicon_en.txt.gz"),
+    os.path.join(DATA_DIRECTORY, "lexicon_mi.txt")
+)
+
+def load_lexicon(paths=LEXICON_PATHS):
+    """
+    Load word lists with one word per line, plain or gzip-compressed.
+
+    Args:
+        paths (iterable): Word list files
+
+    Returns:
+        frozenset: Normalized, macron-folded words
+    """
+    words = set()
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                words.update(tokenize(line))
+    return frozenset(words)
+
+class SpellingCorrector:
+    """
+    Typo corrector over a fixed vocabulary.
+
+    Every vocabulary word is indexed under each string obtained by deleting up
+    to MAX_EDIT_DISTANCE characters from it. A misspelt token is looked up by
+    its own deletions, which finds every word within that many edits (insertions,
+    deletions, substitutions and transpositions) without scanning the
+    vocabulary; candidates are then checked with the exact Damerau distance.
+    """
+
+    def __init__(self, vocabulary, places=(), lexicon=frozenset(), cache_size=CORRECTION_CACHE_SIZE):
+        """
+        Build the delete index.
+
+        Args:
+            vocabulary (iterable): Words or phrases to correct towards, highest
+                priority first (ties between equally close words go to the earlier one)
+            places (iterable): Place names to correct towards, after the vocabulary;
+                only tokens of LONG_TOKEN_LENGTH or more letters are corrected into them
+            lexicon (frozenset): Real words, which are never corrected
+            cache_size (int): Number of corrected tokens remembered
+        """
+        self._lexicon = lexicon
+        self._cache = LRUCache(cache_size)
+        self._words = {}
+        for phrase in vocabulary:
+            for token in tokenize(phrase):
+                if token.isalpha():
+                    self._words.setdefault(token, len(self._words))
+        self._places = set()
+        for phrase in places:
+            for token in tokenize(phrase):
+                if token.isalpha() and token not in self._words:
+                    self._words[token] = len(self._words)
+                    self._places.add(token)
+
+        self._deletes = {}
+        for word in self._words:
+            for variant in _deletions(word, MAX_EDIT_DISTANCE):
+                self._deletes.setdefault(variant, []).append(word)
+
+        self._memory_bytes = _deep_size(self._deletes) + _deep_size(self._words)
+
+    def stats(self):
+        """
+        Get index statistics.
+
+        Returns:
+            dict: words, deletes (index entries), lexicon (real words never
+                corrected), memory_bytes (approximate, index only) and correction cache stats
+        """
+        return {
+            "words": len(self._words),
+            "deletes": len(self._deletes),
+            "lexicon": len(self._lexicon),
+            "memory_bytes": self._memory_bytes,
+            "cache": self._cache.stats()
+        }
+
+    def correct(self, token):
+        """
+        Correct a single normalized token.
+
+        Args:
+            token (str): Token from nlu.tokenize
+
+        Returns:
+            str: The closest vocabulary word, or the token unchanged if it is
+                in the vocabulary or lexicon, too short or not close to anything
+        """
+        if (len(token) < MIN_CORRECTION_LENGTH or token in self._words
+                or token in self._lexicon or not token.isalpha()):
+            return token
+
+        correction = self._cache.get(token)
+        if correction is None:
+            correction = self._lookup(token)
+            self._cache.put(token, correction)
+        return correction
+
+    def _lookup(self, token):
+        """
+        Find the closest vocabulary word to a token using the delete index.
+
+        Args:
+            token (str): Token to correct
+
+        Returns:
+            str: Closest word, or the token if nothing is within range
+        """
+        is_long = len(token) >= LONG_TOKEN_LENGTH
+        limit = MAX_EDIT_DISTANCE if is_long else 1
+        best = None
+        seen = set()
+        for variant in _deletions(token, limit):
+            for word in self._deletes.get(variant, ()):
+                if word in seen or (not is_long and word in self._places):
+                    continue
+                seen.add(word)
+                distance = damerau_distance(token, word, limit)
+                if distance > limit:
+                    continue
+                rank = (distance, self._words[word])
+                if best is None or rank < best[0]:
+                    best = (rank, word)
+        return best[1] if best else token
+
+    def correct_tokens(self, tokens):
+        """
+        Correct a sequence of tokens.
+
+        Args:
+            tokens (iterable): Normalized tokens
+
+        Returns:
+            tuple: (corrected tokens, (original, corrected) pairs for changed tokens)
+        """
+        corrected = []
+        corrections = []
+        for token in tokens:
+            replacement = self.correct(token)
+            corrected.append(replacement)
+            if replacement != token:
+                corrections.append((token, replacement))
+        return tuple(corrected), tuple(corrections)
+
+def _deletions(word, distance):
+    """
+    Get every string made by deleting up to `distance` characters from a word.
+
+    Args:
+        word (str): Word
+        distance (int): Maximum number of deletions
+
+    Returns:
+        set: Variants, including the word itself
+    """
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {
+            variant[:index] + variant[index + 1:]
+            for variant in frontier if len(variant) > 1
+            for index in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+def damerau_distance(source, target, limit):
+    """
+    Optimal string alignment (restricted Damerau-Levenshtein) distance.
+
+    Only cells within `limit` of the diagonal are computed, since any
+    alignment that leaves that band already costs more than the limit.
+
+    Args:
+        source (str): First string
+        target (str): Second string
+        limit (int): Stop early once the distance is known to exceed this
+
+    Returns:
+        int: Edit distance, or limit + 1 if it exceeds the limit
+    """
+    too_far = limit + 1
+    if abs(len(source) - len(target)) > limit:
+        return too_far
+
+    target_length = len(target)
+    before_previous = None
+    previous = [column if column <= limit else too_far for column in range(target_length + 1)]
+    for i in range(1, len(source) + 1):
+        current = [too_far] * (target_length + 1)
+        if i <= limit:
+            current[0] = i
+        row_minimum = current[0]
+        for j in range(max(1, i - limit), min(target_length, i + limit) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_minimum:
+                row_minimum = value
+        if row_minimum > limit:
+            return too_far
+        before_previous, previous = previous, current
+    return min(previous[-1], too_far)
+
+def _deep_size(mapping):
+    """
+    Approximate the memory held by a dict of strings to strings, ints or lists of strings.
+
+    Args:
+        mapping (dict): Mapping to measure
+
+    Returns:
+        int: Bytes, counting shared strings once
+    """
+    seen = set()
+    total = sys.getsizeof(mapping)
+    for key, value in mapping.items():
+        for item in (key, value, *(value if isinstance(value, list) else ())):
+            if id(item) not in seen:
+                seen.add(id(item))
+                total += sys.getsizeof(item)
+    return total
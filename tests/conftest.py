@@ -0,0 +1,9 @@
+"""
+Test configuration for the Manaaki Navigator Streamlit MVP.
+Puts the repository root on sys.path so tests import services.* like app.py does.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,166 @@
+"""
+Tests for intent detection, entity extraction and responses in services.conversation.
+"""
+
+import json
+
+import pytest
+
+from services import instrumentation, metrics
+from services.conversation import (
+    clear_response_cache, detect_intent, extract_entities, generate_response,
+    get_response_cache_stats, process_user_input, process_user_inputs
+)
+from services.directory import create_directory
+from services.event_log import start_event_log, stop_event_log
+from services.mock_data import get_directory, get_directory_state, mock_service_data, set_directory
+from services.nlu import KeywordMatcher
+
+CONTEXT = {"language": "english", "cultural_mode": "general"}
+
+@pytest.mark.parametrize("text, intent", [
+    ("I need healthcare", "health_services"),
+    ("I need healthcare in Auckland", "health_services"),
+    ("homelessness", "housing_assistance"),
+    ("hospitalised", "health_services"),
+    ("stressful", "mental_health"),
+    ("supporting", "social_support"),
+    ("I need a doctor", "health_services"),
+    ("hi", "greeting"),
+    ("this is it", "unknown"),
+])
+def test_detect_intent_matches_inflected_and_compound_forms(text, intent):
+    assert detect_intent(text) == intent
+
+@pytest.mark.parametrize("text, service_type", [
+    ("childcare", "child_services"),
+    ("children", "child_services"),
+    ("homelessness", "emergency_housing"),
+    ("a counsellor", "mental_health"),
+    ("rental help", "rental_assistance"),
+])
+def test_extract_entities_matches_inflected_service_types(text, service_type):
+    assert extract_entities(text)["service_type"] == service_type
+
+def test_healthcare_in_auckland_keeps_location():
+    result = process_user_input("I need healthcare in Auckland", CONTEXT)
+    assert result["intent"] == "health_services"
+    assert result["entities"]["location"] == "Auckland"
+
+def test_stem_keywords_match_whole_word_prefixes_only():
+    matcher = KeywordMatcher([("health", ["health*"]), ("greeting", ["hi"])])
+    assert matcher.match("healthy eating") == "health"
+    assert matcher.match("unhealthy") is None
+    assert matcher.match("this") is None
+
+def test_stem_keywords_must_be_single_words():
+    with pytest.raises(ValueError):
+        KeywordMatcher([("label", ["mental health*"])])
+
+def test_generate_response_does_not_share_cached_lists():
+    context = {"language": "english", "cultural_mode": "general", "location": "Auckland"}
+    first = generate_response("health_services", context)
+    first["options"].append("mutated")
+    first["services"].clear()
+    second = generate_response("health_services", context)
+    assert "mutated" not in second["options"]
+    assert second["services"]
+
+BATCH = [
+    ("Hello", {**CONTEXT, "session_id": "a"}),
+    ("I need a doctor", {**CONTEXT, "session_id": "b", "location": "Auckland"}),
+    ("I need a doctor", {**CONTEXT, "session_id": "c", "location": "Auckland"}),
+    ("I need a doctor", {"language": "maori", "cultural_mode": "general", "session_id": "d", "location": "Auckland"}),
+    ("I need a doctor in Wellington", {**CONTEXT, "session_id": "e"}),
+    ("thanks", {**CONTEXT, "session_id": "f"}),
+]
+
+def run_and_measure(process, tmp_path):
+    """Run turns from cold caches, returning results, metric deltas, stage counts and logged records."""
+    clear_response_cache()
+    instrumentation.set_enabled(True)
+    instrumentation.reset_timings()
+    before = metrics.collect()
+    event_log = start_event_log(str(tmp_path / "events.jsonl"))
+    try:
+        results = process()
+    finally:
+        stop_event_log()
+        instrumentation.set_enabled(False)
+    after = metrics.collect()
+    deltas = {}
+    for key, value in after.items():
+        if key[0].startswith("manaaki_test"):
+            continue
+        if isinstance(value, list):
+            # Histograms: compare the number of observations only
+            change = value[-1] - (before.get(key) or [0])[-1]
+        else:
+            change = value - before.get(key, 0)
+        if change:
+            deltas[key] = change
+    stages = {stage: summary["count"] for stage, summary in instrumentation.get_timings()["stages"].items()}
+    with open(event_log.path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    for record in records:
+        del record["ts"], record["latency_ms"]
+    return [(result["intent"], result["response"]) for result in results], deltas, stages, records
+
+def test_batch_matches_sequential_turns(tmp_path):
+    sequential = run_and_measure(
+        lambda: [process_user_input(text, context) for text, context in BATCH], tmp_path / "sequential"
+    )
+    batched = run_and_measure(lambda: process_user_inputs(BATCH), tmp_path / "batched")
+    # The batch saves directory queries: English and Māori turns for Auckland share one
+    query_keys = [key for key in sequential[1] if key[0].startswith("manaaki_directory_")]
+    for key in query_keys:
+        assert sequential[1].pop(key) == 3
+        assert batched[1].pop(key) == 2
+    assert (sequential[2].pop("directory_query"), batched[2].pop("directory_query")) == (3, 2)
+    assert batched == sequential
+    _, deltas, stages, records = batched
+    assert deltas[("manaaki_turn_duration_seconds", ())] == len(BATCH)
+    assert stages["turn"] == len(BATCH)
+    assert len(records) == len(BATCH)
+
+def test_batch_skips_directory_queries_for_cached_responses():
+    clear_response_cache()
+    process_user_inputs(BATCH)
+    key = ("manaaki_directory_query_duration_seconds", ("services_by_location",))
+    before = metrics.collect()[key][-1]
+    process_user_inputs(BATCH)
+    assert metrics.collect()[key][-1] == before
+
+@pytest.fixture
+def restore_directory():
+    directory = get_directory()
+    yield
+    set_directory(directory)
+
+def test_response_cache_is_invalidated_when_the_directory_changes(restore_directory):
+    context = {"language": "english", "cultural_mode": "general", "location": "Auckland"}
+    first = generate_response("health_services", context)
+    assert generate_response("health_services", context) == first
+    invalidations = get_response_cache_stats()["invalidations"]
+
+    renamed = [dict(service, name=f"Renamed {service['name']}") for service in mock_service_data]
+    set_directory(create_directory(renamed))
+    second = generate_response("health_services", context)
+    assert get_response_cache_stats()["invalidations"] == invalidations + 1
+    assert [service["name"] for service in second["services"]] == [
+        f"Renamed {service['name']}" for service in first["services"]
+    ]
+    assert "Renamed " in second["text"]
+
+def test_response_built_from_a_replaced_directory_is_not_cached(restore_directory):
+    context = {"language": "english", "cultural_mode": "general", "location": "Wellington"}
+    clear_response_cache()
+    old_state = get_directory_state()
+    renamed = [dict(service, name=f"Renamed {service['name']}") for service in mock_service_data]
+    set_directory(create_directory(renamed))
+
+    # A turn that pinned the old directory still answers from it...
+    stale = generate_response("health_services", context, directory_state=old_state)
+    assert not stale["services"][0]["name"].startswith("Renamed ")
+    # ...but its response is not served to later turns
+    assert generate_response("health_services", context)["services"][0]["name"].startswith("Renamed ")
@@ -0,0 +1,206 @@
+"""
+Tests for the indexed and columnar directory backends and the directory loader.
+"""
+
+import json
+import os
+import struct
+
+import pytest
+
+from services.directory import create_directory
+from services.directory_loader import DirectorySnapshot, SnapshotRecord, load_directory, write_snapshot
+from services.mock_data import (
+    get_all_locations, get_all_service_types, get_directory, get_services_by_location, mock_service_data, set_directory
+)
+from services.ranking import get_ranker, top_k
+from services.service_matcher import get_cache_stats, get_service_recommendations, match_services, search_services
+
+LOCATIONS = list(get_all_locations()) + ["Nowhere"]
+SERVICE_TYPES = [None] + list(get_all_service_types())
+
+@pytest.fixture(scope="module")
+def directories():
+    return [create_directory(mock_service_data, backend) for backend in ("indexed", "columnar")]
+
+def ids(services):
+    return [service["id"] for service in services]
+
+@pytest.mark.parametrize("limit", [None, 1, 3])
+def test_backends_rank_matches_the_same(directories, limit):
+    indexed, columnar = directories
+    for location in LOCATIONS:
+        for service_type in SERVICE_TYPES:
+            assert ids(indexed.match_services(location, service_type, limit)) == ids(
+                columnar.match_services(location, service_type, limit)
+            )
+
+@pytest.mark.parametrize("limit", [None, 1, 3])
+def test_indexed_load_order_matches_top_k(directories, limit):
+    # Recommendations in load order read the directory's indexes instead of ranking candidates
+    key = get_ranker("load_order", {})
+    for directory in directories:
+        for location in LOCATIONS:
+            for service_type in SERVICE_TYPES:
+                assert ids(directory.get_services_by_location(location, service_type, limit)) == ids(
+                    top_k(directory.iter_candidates(location, service_type), key, limit)
+                )
+
+def test_columnar_directory_builds_records_from_columns(directories):
+    columnar = directories[1]
+    assert [dict(service) for service in columnar] == [dict(service) for service in mock_service_data]
+    service = columnar.get_service_by_id(mock_service_data[0]["id"])
+    assert not isinstance(service, dict)
+    assert dict(service) == mock_service_data[0]
+    with pytest.raises(TypeError):
+        service["name"] = "Changed"
+    assert ids(columnar.get_services_by_ids(["missing", mock_service_data[1]["id"]])) == [mock_service_data[1]["id"]]
+
+def test_match_services_lists_local_before_nationwide(directories):
+    for directory in directories:
+        services = directory.match_services("Auckland")
+        locations = [service["location"].lower() for service in services]
+        assert "nationwide" in locations
+        first_nationwide = locations.index("nationwide")
+        assert all(location == "nationwide" for location in locations[first_nationwide:])
+
+def test_match_services_prefers_exact_type(directories):
+    for directory in directories:
+        services = directory.match_services("Auckland", "mental_health")
+        types = [service["type"] == "mental_health" for service in services]
+        assert types == sorted(types, reverse=True)
+
+def test_service_matcher_finds_nearby_services_for_a_suburb():
+    services = match_services({"location": "Wellington", "locality": "Porirua"}, limit=3)
+    assert services
+
+@pytest.mark.parametrize("maori_name, english_name", [
+    ("Tāmaki Makaurau", "Auckland"),
+    ("Te Whanganui-a-Tara", "Wellington"),
+    ("Ōtautahi", "Christchurch"),
+])
+def test_public_lookups_resolve_maori_place_names(maori_name, english_name):
+    assert ids(get_service_recommendations(maori_name)) == ids(get_service_recommendations(english_name))
+    assert ids(get_services_by_location(maori_name)) == ids(get_services_by_location(english_name))
+    assert ids(match_services({"location": maori_name})) == ids(match_services({"location": english_name}))
+
+@pytest.mark.parametrize("backend", ["indexed", "columnar"])
+def test_localized_views_fall_back_to_english(backend):
+    english_only = {key: value for key, value in mock_service_data[0].items() if not key.endswith("_maori")}
+    del english_only["hours"]
+    directory = create_directory([english_only, mock_service_data[1]], backend)
+
+    maori = directory.localized_view("maori", "details")
+    assert maori[english_only["id"]]["name"] == english_only["name"]
+    assert maori[english_only["id"]]["description"] == english_only["description"]
+    assert maori[english_only["id"]]["hours"] == ""
+    assert maori[mock_service_data[1]["id"]]["name"] == mock_service_data[1]["name_maori"]
+
+    # Unknown languages get the English projection itself
+    assert directory.localized_view("french", "details") is directory.localized_view("english", "details")
+    assert directory.localized_view("maori", "details") is maori
+    with pytest.raises(TypeError):
+        maori[english_only["id"]]["name"] = "Changed"
+
+    services = directory.get_localized_services(["missing", english_only["id"]], "maori")
+    assert [dict(service) for service in services] == [{
+        "id": english_only["id"],
+        "name": english_only["name"],
+        "description": english_only["description"],
+        "address": english_only["address"],
+        "phone": english_only["phone"],
+        "hours": "",
+        "cost": english_only["cost"]
+    }]
+
+@pytest.fixture
+def restore_directory():
+    directory = get_directory()
+    yield
+    set_directory(directory)
+
+def test_memoized_results_are_invalidated_when_the_directory_changes(restore_directory):
+    def lookups():
+        return (
+            ids(match_services({"location": "Auckland"})),
+            ids(get_service_recommendations("Auckland")),
+            ids(search_services("doctor", "Auckland"))
+        )
+
+    before = lookups()
+    assert lookups() == before
+    invalidations = {name: stats["invalidations"] for name, stats in get_cache_stats().items()}
+
+    removed = before[0][0]
+    set_directory(create_directory([service for service in mock_service_data if service["id"] != removed]))
+    after = lookups()
+    assert all(removed not in result for result in after)
+    assert before[0][1:] == after[0][:len(before[0]) - 1]
+    assert all(
+        stats["invalidations"] == invalidations[name] + 1 for name, stats in get_cache_stats().items()
+    )
+
+def string_services(services):
+    # Snapshots store every field as text, as read from CSV or JSON
+    return [
+        {field: value if field == "tags" else str(value) for field, value in service.items()}
+        for service in services
+    ]
+
+def write_source(path, services):
+    with open(path, "w", encoding="utf-8") as source_file:
+        json.dump(services, source_file)
+
+def test_snapshot_round_trip(tmp_path):
+    services = string_services(mock_service_data)
+    del services[0]["name_maori"]
+    services[1]["tags"] = []
+    path = str(tmp_path / "services.mnsd")
+    write_snapshot(services, path)
+
+    snapshot = DirectorySnapshot(path)
+    assert len(snapshot) == len(services)
+    assert [dict(record) for record in snapshot] == services
+    assert "name_maori" not in snapshot[0]
+    assert snapshot[-1]["id"] == services[-1]["id"]
+    with pytest.raises(IndexError):
+        snapshot[len(services)]
+
+def test_load_directory_reuses_a_current_snapshot(tmp_path):
+    source_path = str(tmp_path / "services.json")
+    write_source(source_path, string_services(mock_service_data[:5]))
+
+    built = load_directory(source_path)
+    assert os.path.exists(source_path + ".mnsd")
+    assert not any(isinstance(service, SnapshotRecord) for service in built)
+
+    loaded = load_directory(source_path)
+    assert all(isinstance(service, SnapshotRecord) for service in loaded)
+    assert [dict(service) for service in loaded] == [dict(service) for service in built]
+
+def test_load_directory_rebuilds_a_stale_snapshot(tmp_path):
+    source_path = str(tmp_path / "services.json")
+    write_source(source_path, string_services(mock_service_data[:5]))
+    load_directory(source_path)
+
+    write_source(source_path, string_services(mock_service_data[:3]))
+    directory = load_directory(source_path)
+    assert ids(directory) == ids(mock_service_data[:3])
+    assert DirectorySnapshot(source_path + ".mnsd").is_current(source_path)
+
+def test_load_directory_rebuilds_a_snapshot_from_an_older_format(tmp_path):
+    source_path = str(tmp_path / "services.json")
+    snapshot_path = source_path + ".mnsd"
+    write_source(source_path, string_services(mock_service_data[:5]))
+    load_directory(source_path)
+
+    # Rewrite the header's format version as 1
+    with open(snapshot_path, "r+b") as snapshot_file:
+        snapshot_file.seek(4)
+        snapshot_file.write(struct.pack("<I", 1))
+    with pytest.raises(ValueError):
+        DirectorySnapshot(snapshot_path)
+
+    directory = load_directory(source_path)
+    assert ids(directory) == ids(mock_service_data[:5])
+    assert len(DirectorySnapshot(snapshot_path)) == 5
@@ -0,0 +1,78 @@
+"""
+Tests for directory hot reloading.
+"""
+
+import json
+import os
+
+import pytest
+
+from services.directory_watcher import DirectoryWatcher
+from services.mock_data import get_directory, get_directory_state, mock_service_data, set_directory
+from services.service_matcher import match_services
+
+@pytest.fixture
+def restore_directory():
+    directory = get_directory()
+    yield
+    set_directory(directory)
+
+def write_source(path, services, mtime_ns):
+    with open(path, "w", encoding="utf-8") as source_file:
+        json.dump(services, source_file)
+    # Give every version its own modification time, however fast the test runs
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def string_services(services):
+    return [
+        {field: value if field == "tags" else str(value) for field, value in service.items()}
+        for service in services
+    ]
+
+def test_changed_file_is_swapped_in_once_it_settles(tmp_path, restore_directory):
+    path = str(tmp_path / "services.json")
+    write_source(path, string_services(mock_service_data), 1_000_000_000)
+    watcher = DirectoryWatcher(path, interval=0)
+    old_directory, old_version = get_directory_state()
+
+    renamed = [dict(service, name=f"Renamed {service['name']}") for service in string_services(mock_service_data)]
+    write_source(path, renamed, 2_000_000_000)
+    assert not watcher.check()
+    assert get_directory_state() == (old_directory, old_version)
+
+    assert watcher.check()
+    directory, version = get_directory_state()
+    assert version == old_version + 1
+    assert [service["name"] for service in directory] == [service["name"] for service in renamed]
+    assert all(service["name"].startswith("Renamed ") for service in match_services({"location": "Auckland"}))
+    # A session still holding the old directory sees it unchanged
+    assert [service["name"] for service in old_directory] == [service["name"] for service in mock_service_data]
+
+    assert not watcher.check()
+    assert watcher.stats()["reloads"] == 1
+
+def test_bad_file_keeps_the_old_directory(tmp_path, restore_directory):
+    path = str(tmp_path / "services.json")
+    write_source(path, string_services(mock_service_data), 1_000_000_000)
+    watcher = DirectoryWatcher(path, interval=0)
+    state = get_directory_state()
+
+    broken = string_services(mock_service_data)
+    del broken[3]["location"]
+    write_source(path, broken, 2_000_000_000)
+    assert not watcher.check()
+    assert not watcher.check()
+    assert get_directory_state() == state
+    stats = watcher.stats()
+    assert stats["failures"] == 1 and stats["reloads"] == 0
+    assert "missing required field" in stats["last_error"]
+
+    # The same broken version is not loaded again
+    assert not watcher.check()
+    assert watcher.stats()["failures"] == 1
+
+    write_source(path, string_services(mock_service_data[:4]), 3_000_000_000)
+    assert not watcher.check()
+    assert watcher.check()
+    assert len(get_directory()) == 4
+    assert watcher.stats()["last_error"] is None
@@ -0,0 +1,75 @@
+"""
+Tests for conversation event records.
+"""
+
+import gzip
+import json
+import os
+import time
+
+from services.conversation import process_user_input
+from services.event_log import POLICY_BLOCK, POLICY_DROP, EventLog, archive_path, turn_record
+
+def test_turn_record_logs_the_context_before_the_turn():
+    context = {"session_id": "s1", "language": "english", "cultural_mode": "general"}
+    first = process_user_input("I need a doctor in Porirua", context)
+    second = process_user_input("something urgent", first["context"])
+    record = turn_record("something urgent", first["context"], second, 0.001)
+    assert record["context"] == {
+        "location": "Wellington", "locality": "Porirua", "service_type": "general_practitioner"
+    }
+    assert "session_id" not in record["context"]
+
+def test_turn_record_context_is_empty_for_a_new_session():
+    context = {"session_id": "s1", "language": "english", "cultural_mode": "general"}
+    result = process_user_input("Hello", context)
+    assert turn_record("Hello", context, result, 0.001)["context"] == {}
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+def test_rotation_keeps_backup_count_archives(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    event_log = EventLog(path, max_bytes=300, backup_count=2, batch_size=1, fsync_seconds=0)
+    event_log.start()
+    for index in range(60):
+        event_log.log({"n": index, "text": "x" * 50})
+    event_log.close()
+
+    assert os.path.exists(archive_path(path, 1))
+    assert os.path.exists(archive_path(path, 2))
+    assert not os.path.exists(archive_path(path, 3))
+    assert not [name for name in os.listdir(tmp_path) if ".rotating" in name]
+    # The newest records survive, in order, across the archives and the active file
+    kept = [record["n"] for name in (archive_path(path, 2), archive_path(path, 1), path) for record in read_lines(name)]
+    assert kept == list(range(60 - len(kept), 60))
+    assert event_log.stats()["rotations"] >= 2
+
+def test_drop_policy_counts_records_that_do_not_fit():
+    event_log = EventLog("unused.jsonl", queue_size=2, policy=POLICY_DROP)
+    assert [event_log.log({"n": index}) for index in range(3)] == [True, True, False]
+    assert event_log.stats()["dropped"] == 1
+
+def test_block_policy_gives_up_when_the_writer_does_not_drain():
+    event_log = EventLog("unused.jsonl", queue_size=1, policy=POLICY_BLOCK, block_timeout=0.05)
+    assert event_log.log({"n": 1})
+    started = time.monotonic()
+    assert not event_log.log({"n": 2})
+    assert time.monotonic() - started < 1.0
+    assert event_log.stats()["dropped"] == 1
+
+def test_writer_keeps_draining_when_the_file_cannot_be_opened(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    event_log = EventLog(str(blocker / "events.jsonl"), queue_size=2, policy=POLICY_BLOCK, block_timeout=1.0)
+    event_log.start()
+    for index in range(10):
+        assert event_log.log({"n": index})
+    started = time.monotonic()
+    event_log.close()
+    assert time.monotonic() - started < 2.0
+    stats = event_log.stats()
+    assert stats["queued"] == 0
+    assert stats["errors"] > 0 and stats["last_error"]
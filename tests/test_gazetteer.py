@@ -0,0 +1,52 @@
+"""
+Tests for place-name matching in the gazetteer.
+"""
+
+import pytest
+
+from services.conversation import extract_entities
+from services.gazetteer import AMBIGUOUS_WORD, build_gazetteer
+
+@pytest.mark.parametrize("text", [
+    "no bluff, I need food",
+    "my daughter Alexandra needs a GP",
+    "Lincoln needs a doctor",
+    "stoke the fire",
+    "that was a gore fest",
+    "Richmond and I need housing help",
+    "I studied botany",
+])
+def test_ambiguous_place_names_need_context(text):
+    assert "location" not in extract_entities(text)
+
+@pytest.mark.parametrize("text, location, locality", [
+    ("I live in Bluff", "Invercargill", "Bluff"),
+    ("Bluff", "Invercargill", "Bluff"),
+    ("I need a GP in Gore", "Gore", None),
+    ("gore", "Gore", None),
+    ("rent help Botany", "Auckland", "Botany"),
+    ("I'm near Alexandra", "Alexandra", None),
+    ("a doctor at stoke", "Nelson", "Stoke"),
+    ("botany downs", "Auckland", "Botany"),
+])
+def test_ambiguous_place_names_match_as_places(text, location, locality):
+    entities = extract_entities(text)
+    assert entities["location"] == location
+    assert entities.get("locality") == locality
+
+def test_te_reo_names_of_ambiguous_places_match_anywhere():
+    assert extract_entities("he tākuta mō Awarua")["location"] == "Invercargill"
+
+def test_csv_places_can_be_marked_ambiguous(tmp_path):
+    path = tmp_path / "places.csv"
+    path.write_text(
+        "name,name_maori,region,latitude,longitude,aliases,ambiguous\n"
+        "Frankton,,Hamilton,-37.79,175.26,,\n"
+        "Hope,,Nelson,-41.35,173.15,,word\n",
+        encoding="utf-8"
+    )
+    gazetteer = build_gazetteer(str(path))
+    assert gazetteer.get("Hope").ambiguous == AMBIGUOUS_WORD
+    assert gazetteer.find("I hope so") is None
+    assert gazetteer.find("I live in hope").name == "Hope"
+    assert gazetteer.find("I live by Frankton").name == "Frankton"
@@ -0,0 +1,77 @@
+"""
+Tests for the rolling latency histograms.
+"""
+
+import math
+import random
+
+import pytest
+
+from services.instrumentation import ROLLING_WINDOW_SECONDS, SLOT_SECONDS, RollingHistogram, merge_snapshots, summarize
+
+PERCENTILES = (("p50_us", 0.50), ("p95_us", 0.95), ("p99_us", 0.99))
+
+def exact_percentile(samples, fraction):
+    # Nearest-rank percentile
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_percentiles_are_within_one_eighth_above_the_true_value(seed):
+    rng = random.Random(seed)
+    samples = [int(rng.lognormvariate(13, 2)) for _ in range(rng.randint(1, 2000))]
+    histogram = RollingHistogram()
+    for sample in samples:
+        histogram.record(sample, now=0)
+
+    summary = histogram.summary(now=0)
+    assert summary["count"] == len(samples)
+    assert summary["mean_us"] == pytest.approx(sum(samples) / len(samples) / 1000)
+    assert summary["max_us"] == max(samples) / 1000
+    for name, fraction in PERCENTILES:
+        true_value = exact_percentile(samples, fraction)
+        assert true_value <= summary[name] * 1000 <= true_value * 1.125
+
+def test_small_durations_are_exact():
+    histogram = RollingHistogram()
+    for sample in range(8):
+        histogram.record(sample, now=0)
+    summary = histogram.summary(now=0)
+    assert summary["p50_us"] * 1000 == 3
+    assert summary["p99_us"] * 1000 == 7
+
+def test_percentiles_never_exceed_the_largest_sample():
+    histogram = RollingHistogram()
+    histogram.record(1_000_001, now=0)
+    summary = histogram.summary(now=0)
+    assert summary["p50_us"] == summary["p99_us"] == summary["max_us"] == 1000.001
+
+def test_samples_expire_after_the_window():
+    histogram = RollingHistogram()
+    histogram.record(1000, now=0)
+    histogram.record(5000, now=SLOT_SECONDS)
+    assert histogram.summary(now=ROLLING_WINDOW_SECONDS - 1)["count"] == 2
+    assert histogram.summary(now=ROLLING_WINDOW_SECONDS)["count"] == 1
+    assert histogram.summary(now=ROLLING_WINDOW_SECONDS)["max_us"] == 5
+
+    # A reused slot starts empty
+    histogram.record(2000, now=ROLLING_WINDOW_SECONDS)
+    summary = histogram.summary(now=ROLLING_WINDOW_SECONDS)
+    assert summary["count"] == 2
+    assert summary["mean_us"] == 3.5
+
+def test_merged_snapshots_summarize_like_one_histogram():
+    rng = random.Random(1)
+    first, second, combined = RollingHistogram(), RollingHistogram(), RollingHistogram()
+    for _ in range(500):
+        sample = rng.randint(1, 10_000_000)
+        (first if rng.random() < 0.3 else second).record(sample, now=0)
+        combined.record(sample, now=0)
+    merged = merge_snapshots(first.snapshot(now=0), second.snapshot(now=0))
+    assert merged == combined.snapshot(now=0)
+    assert summarize(merged) == combined.summary(now=0)
+
+def test_empty_histogram_summary():
+    assert RollingHistogram().summary(now=0) == {
+        "count": 0, "mean_us": 0.0, "p50_us": 0.0, "p95_us": 0.0, "p99_us": 0.0, "max_us": 0.0
+    }
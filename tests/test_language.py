@@ -0,0 +1,43 @@
+"""
+Tests for the CSS bundles in utils.language.
+"""
+
+import re
+
+import pytest
+
+from utils.language import GENERAL, MAORI_RESPONSIVE, get_common_css, get_css_for_cultural_mode, get_theme_css, minify_css
+
+def test_minify_css_removes_comments_and_whitespace():
+    css = """
+    /* Chat bubbles */
+    .chat-message  > div ,
+    .service-card h4 {
+        margin : 0 0 1rem ;   /* spacing */
+        font-family: "Segoe UI", sans-serif;
+    }
+    """
+    assert minify_css(css) == '.chat-message>div,.service-card h4{margin:0 0 1rem;font-family:"Segoe UI",sans-serif}'
+
+def test_minify_css_of_nothing_is_empty():
+    assert minify_css("  /* only a comment */\n") == ""
+
+def rules(css):
+    # Each selector with its declarations, ignoring comments and whitespace
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    return [
+        (" ".join(selector.split()), [re.sub(r"\s+", "", declaration) for declaration in body.split(";") if declaration.strip()])
+        for selector, body in re.findall(r"([^{}]+)\{([^{}]*)\}", css)
+    ]
+
+@pytest.mark.parametrize("cultural_mode", [GENERAL, MAORI_RESPONSIVE])
+def test_theme_css_keeps_every_rule(cultural_mode):
+    theme = get_theme_css(cultural_mode)
+    assert theme.startswith("<style>") and theme.endswith("</style>")
+    minified = theme[len("<style>"):-len("</style>")]
+    assert "\n" not in minified and "/*" not in minified
+    assert rules(minified) == rules(get_common_css() + get_css_for_cultural_mode(cultural_mode))
+
+def test_theme_css_is_built_once_per_mode():
+    assert get_theme_css(GENERAL) is get_theme_css(GENERAL)
+    assert get_theme_css(GENERAL) != get_theme_css(MAORI_RESPONSIVE)
@@ -0,0 +1,73 @@
+"""
+Tests for the per-thread metrics shards and the Prometheus exporter.
+"""
+
+import gc
+import threading
+import urllib.error
+import urllib.request
+import weakref
+
+import pytest
+
+from services import metrics
+from services.conversation import get_response_cache_stats
+
+def run_in_threads(function, count):
+    threads = []
+    for _ in range(count):
+        thread = threading.Thread(target=function)
+        thread.start()
+        thread.join()
+        threads.append(weakref.ref(thread))
+    return threads
+
+def test_finished_thread_shards_are_folded_without_a_scrape():
+    threads = run_in_threads(lambda: metrics.record_turn("test_shard"), 200)
+    gc.collect()
+    # Each new thread folds the shards of the threads that finished before it,
+    # so finished threads are not kept alive by their metrics
+    assert sum(1 for thread in threads if thread() is not None) < 10
+    assert metrics.collect()[("manaaki_turns_total", ("test_shard",))] == 200
+
+def sample_lines(text, name):
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+def test_render_metrics_exposition():
+    metrics.record_directory_query("test_render", 0.0003, 2)
+    metrics.record_directory_query("test_render", 2.0, 0)
+    metrics.record_turn('quoted "intent"\n')
+    text = metrics.render_metrics()
+
+    lines = [line for line in sample_lines(text, "manaaki_directory_query_duration_seconds") if "test_render" in line]
+    assert 'manaaki_directory_query_duration_seconds_bucket{query="test_render",le="0.00025"} 0' in lines
+    assert 'manaaki_directory_query_duration_seconds_bucket{query="test_render",le="0.0005"} 1' in lines
+    assert 'manaaki_directory_query_duration_seconds_bucket{query="test_render",le="1"} 1' in lines
+    assert 'manaaki_directory_query_duration_seconds_bucket{query="test_render",le="+Inf"} 2' in lines
+    assert 'manaaki_directory_query_duration_seconds_count{query="test_render"} 2' in lines
+    assert 'manaaki_directory_query_duration_seconds_sum{query="test_render"} 2.0003' in lines
+    assert 'manaaki_turns_total{intent="quoted \\"intent\\"\\n"} 1' in text.splitlines()
+    assert "# TYPE manaaki_directory_results histogram" in text
+    assert "# TYPE manaaki_cache_hit_ratio gauge" in text
+    assert f'manaaki_cache_entries{{cache="responses"}} {get_response_cache_stats()["size"]}' in text.splitlines()
+
+@pytest.fixture
+def metrics_server():
+    metrics.stop_metrics_server()
+    server = metrics.start_metrics_server(port=0)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    metrics.stop_metrics_server()
+
+def test_metrics_endpoint_serves_the_exposition(metrics_server):
+    for _ in range(3):
+        metrics.record_turn("test_scrape")
+    with urllib.request.urlopen(f"{metrics_server}/metrics", timeout=5) as response:
+        assert response.status == 200
+        assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+        body = response.read().decode("utf-8")
+    assert 'manaaki_turns_total{intent="test_scrape"} 3' in body.splitlines()
+    assert body.endswith("\n")
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(f"{metrics_server}/other", timeout=5)
+    assert error.value.code == 404
@@ -0,0 +1,21 @@
+"""
+Tests for the chat rendering helpers.
+"""
+
+from utils.rendering import render_bot_message, render_service_cards, render_user_message
+
+SCRIPT = "<script>alert(1)</script>"
+
+def test_service_card_fields_are_escaped():
+    cards = ((SCRIPT, "Food & support", '<img src=x onerror="alert(1)">', "0800 <1>", "9-5"),)
+    rendered = render_service_cards(cards, "service-card-general")
+    assert "<script>" not in rendered and "<img" not in rendered
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in rendered
+    assert "Food &amp; support" in rendered
+    assert rendered.count('<div class="service-card service-card-general">') == 1
+
+def test_messages_are_escaped_and_keep_line_breaks():
+    assert "<script>" not in render_user_message(SCRIPT)
+    rendered = render_bot_message(f"1. {SCRIPT}\n2. Clinic")
+    assert "<script>" not in rendered
+    assert "&lt;script&gt;" in rendered and "<br>2. Clinic" in rendered
@@ -0,0 +1,83 @@
+"""
+Tests for offline event log replay.
+"""
+
+import json
+import os
+
+import pytest
+
+from services import replay
+from services.conversation import process_user_input
+from services.event_log import turn_record
+
+def write_log(path, records):
+    with open(path, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+def record_turns(turns):
+    records = []
+    for input_text, context in turns:
+        result = process_user_input(input_text, context)
+        records.append(json.loads(json.dumps(turn_record(input_text, context, result, 0.001), default=str)))
+    return records
+
+def test_replay_uses_the_logged_context_after_a_cleared_chat(tmp_path):
+    context = {"session_id": "s1", "language": "english", "cultural_mode": "general"}
+    # Clear chat before the session ID was rotated: same ID, fresh context, so
+    # the second turn has no location to recommend services for
+    records = record_turns([("I need a doctor in Auckland", context), ("I need a doctor", dict(context))])
+    assert not records[1]["service_ids"]
+    path = tmp_path / "events.jsonl"
+    write_log(path, records)
+    report = replay.run_replay([str(path)], workers=1)
+    assert report["turns"] == 2
+    assert report["differing_turns"] == 0
+
+def test_replay_rebuilds_context_for_records_without_one():
+    context = {"session_id": "s1", "language": "english", "cultural_mode": "general"}
+    records = record_turns([("I need a doctor", context)])
+    first = process_user_input("I need a doctor", context)
+    records += record_turns([("in Wellington", first["context"])])
+    for record in records:
+        del record["context"]
+    contexts = {}
+    assert [replay.replay_turn(record, contexts) for record in records] == [[], []]
+
+def _exit_worker(chunks, results):
+    os._exit(1)
+
+def test_run_replay_fails_when_a_worker_dies(tmp_path, monkeypatch):
+    records = [{"session_id": "s1", "input": "Hello"} for _ in range(100)]
+    path = tmp_path / "events.jsonl"
+    write_log(path, records)
+    monkeypatch.setattr(replay, "_worker", _exit_worker)
+    monkeypatch.setattr(replay, "POLL_SECONDS", 0.1)
+    # One record per chunk fills the dead worker's bounded queue
+    with pytest.raises(RuntimeError):
+        replay.run_replay([str(path)], workers=2, chunk_size=1)
+
+def test_replay_keeps_no_context_for_records_that_log_one():
+    replayer = replay.Replayer()
+    for session in range(20):
+        context = {"session_id": f"s{session}", "language": "english", "cultural_mode": "general"}
+        replayer.replay(record_turns([("I need a doctor in Auckland", context)]))
+    assert replayer.contexts == {}
+    assert replayer.result()["sessions"] == 20
+    assert replayer.differing_turns == 0
+
+def test_rebuilt_contexts_are_bounded(monkeypatch):
+    monkeypatch.setattr(replay, "MAX_CONTEXTS", 3)
+    records = []
+    for session in range(5):
+        context = {"session_id": f"s{session}", "language": "english", "cultural_mode": "general"}
+        records += record_turns([("I need a doctor", context)])
+    for record in records:
+        del record["context"]
+    contexts = {}
+    for record in records:
+        replay.replay_turn(record, contexts)
+    # Replaying a session again makes it the most recent
+    replay.replay_turn(records[2], contexts)
+    assert list(contexts) == ["s3", "s4", "s2"]
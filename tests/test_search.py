@@ -0,0 +1,112 @@
+"""
+Tests for BM25 service search.
+"""
+
+import math
+import random
+
+import pytest
+
+from services.directory import NATIONWIDE, create_directory
+from services.mock_data import get_all_locations, mock_service_data
+from services.nlu import preprocess_input, tokenize
+from services.search import BM25_B, BM25_K1, FIELD_WEIGHTS, SearchIndex, get_search_index, search_terms
+
+QUERIES = [
+    "doctor",
+    "I need a doctor for my children",
+    "free counselling",
+    "mental health support for young people",
+    "emergency housing tonight",
+    "rongoā Māori",
+    "hauora",
+    "dentist dental",
+    "zzzz",
+    "",
+]
+
+def reference_scores(services, query):
+    # Score every service with the plain BM25 formula, no index
+    documents = []
+    for service in services:
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = service.get(field) or ""
+            if field == "tags":
+                value = " ".join(tag.replace("_", " ") for tag in value)
+            for term in search_terms(tokenize(value)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        documents.append(frequencies)
+
+    average_length = sum(sum(document.values()) for document in documents) / len(documents)
+    terms = set(search_terms(preprocess_input(query).tokens))
+    containing = {term: sum(1 for document in documents if term in document) for term in terms}
+    scores = []
+    for document in documents:
+        normalizer = BM25_K1 * (1 - BM25_B + BM25_B * sum(document.values()) / average_length)
+        score = 0.0
+        for term in terms & document.keys():
+            idf = math.log(1 + (len(documents) - containing[term] + 0.5) / (containing[term] + 0.5))
+            score += idf * document[term] * (BM25_K1 + 1) / (document[term] + normalizer)
+        scores.append(score)
+    return scores
+
+def reference_search(services, query, location=None, limit=5):
+    scores = reference_scores(services, query)
+    rows = [
+        row for row, service in enumerate(services)
+        if scores[row] > 0 and (
+            not location or service["location"].lower() in (location.lower(), NATIONWIDE)
+        )
+    ]
+    rows.sort(key=lambda row: (-scores[row], row))
+    return [(services[row]["id"], scores[row]) for row in rows[:limit]]
+
+@pytest.fixture(scope="module")
+def index():
+    return SearchIndex(mock_service_data)
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("location", [None, *get_all_locations(), "Nowhere"])
+@pytest.mark.parametrize("limit", [1, 3, 100])
+def test_search_matches_brute_force_bm25(index, query, location, limit):
+    results = [(service["id"], score) for service, score in index.search(query, location, limit)]
+    expected = reference_search(mock_service_data, query, location, limit)
+    assert [service_id for service_id, _ in results] == [service_id for service_id, _ in expected]
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected])
+
+def synthetic_services(count, seed=7):
+    # Many services sharing a small vocabulary, so posting lists are long and
+    # queries stop early on the threshold
+    rng = random.Random(seed)
+    words = "doctor clinic health mental housing food whānau hauora support free youth night rent dental".split()
+    locations = ["Auckland", "Wellington", "Nationwide"]
+    return [
+        {
+            "id": f"service-{row}",
+            "name": " ".join(rng.choices(words, k=2)),
+            "location": rng.choice(locations),
+            "type": "general_practitioner",
+            "tags": rng.sample(words, 2),
+            "description": " ".join(rng.choices(words, k=rng.randint(3, 20)))
+        }
+        for row in range(count)
+    ]
+
+@pytest.mark.parametrize("query", ["doctor", "free dental clinic", "whānau support at night", "hauora youth rent"])
+@pytest.mark.parametrize("location", [None, "Auckland"])
+@pytest.mark.parametrize("limit", [1, 5, 20])
+def test_search_matches_brute_force_bm25_on_a_large_directory(query, location, limit):
+    services = synthetic_services(500)
+    results = [(service["id"], score) for service, score in SearchIndex(services).search(query, location, limit)]
+    expected = reference_search(services, query, location, limit)
+    assert [service_id for service_id, _ in results] == [service_id for service_id, _ in expected]
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected])
+
+def test_search_with_no_limit_returns_nothing(index):
+    assert index.search("doctor", limit=0) == []
+
+def test_search_index_is_kept_on_its_directory():
+    directory = create_directory(mock_service_data)
+    assert get_search_index(directory) is get_search_index(directory)
+    assert get_search_index(create_directory(mock_service_data)) is not get_search_index(directory)
@@ -0,0 +1,76 @@
+"""
+Tests for the delete index, Damerau distance and lexicon gating in services.spelling.
+"""
+
+import pytest
+
+from services.conversation import process_user_input
+from services.spelling import SpellingCorrector, _deletions, damerau_distance, load_lexicon
+
+CONTEXT = {"language": "english", "cultural_mode": "general"}
+
+def test_deletions_include_the_word_and_every_single_deletion():
+    assert _deletions("abc", 1) == {"abc", "bc", "ac", "ab"}
+
+def test_deletions_up_to_two_edits():
+    assert _deletions("abc", 2) == {"abc", "bc", "ac", "ab", "a", "b", "c"}
+
+def test_deletions_never_produce_an_empty_string():
+    assert "" not in _deletions("ab", 2)
+
+@pytest.mark.parametrize("source, target, distance", [
+    ("doctor", "doctor", 0),
+    ("docter", "doctor", 1),
+    ("helth", "health", 1),
+    ("hauroa", "hauora", 1),
+    ("wellingon", "wellington", 1),
+    ("ab", "ba", 1),
+    ("kitten", "sitting", 3),
+])
+def test_damerau_distance(source, target, distance):
+    assert damerau_distance(source, target, 3) == distance
+
+def test_damerau_distance_stops_past_the_limit():
+    assert damerau_distance("kitten", "sitting", 1) == 2
+    assert damerau_distance("a", "abcd", 2) == 3
+
+def test_delete_index_finds_words_within_range():
+    corrector = SpellingCorrector(["doctor", "health"])
+    assert corrector.correct("docter") == "doctor"
+    assert corrector.correct("helth") == "health"
+    assert corrector.correct("zzzzz") == "zzzzz"
+    assert corrector.stats()["words"] == 2
+
+def test_lexicon_words_are_never_corrected():
+    corrector = SpellingCorrector(["urgently", "money"], lexicon=frozenset({"currently", "honey"}))
+    assert corrector.correct("currently") == "currently"
+    assert corrector.correct("honey") == "honey"
+    assert corrector.correct("urgentyl") == "urgently"
+
+def test_short_tokens_are_not_corrected_into_place_names():
+    corrector = SpellingCorrector([], places=["Māpua", "Wellington"])
+    assert corrector.correct("matua") == "matua"
+    assert corrector.correct("wellingon") == "wellington"
+
+def test_lexicon_covers_english_and_te_reo():
+    lexicon = load_lexicon()
+    for word in ("currently", "building", "patients", "hospitalised", "matua", "hapori", "whanau"):
+        assert word in lexicon
+    for typo in ("helth", "docter", "wellingon"):
+        assert typo not in lexicon
+
+@pytest.mark.parametrize("text, intent, entities", [
+    ("I am currently looking for a doctor", "health_services", {"service_type": "general_practitioner"}),
+    ("My building has no heating, I need a doctor", "health_services", {"service_type": "general_practitioner"}),
+    ("He comes to see me", "unknown", {}),
+    ("I want to share my story", "unknown", {}),
+    ("Can you help patients in Auckland", "unknown", {"location": "Auckland"}),
+    ("honey", "unknown", {}),
+    ("matua", "unknown", {}),
+    ("I need a docter in wellingon", "health_services",
+     {"location": "Wellington", "service_type": "general_practitioner"}),
+])
+def test_real_words_keep_their_meaning_end_to_end(text, intent, entities):
+    result = process_user_input(text, CONTEXT)
+    assert result["intent"] == intent
+    assert result["entities"] == entities
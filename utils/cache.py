@@ -0,0 +1,136 @@
+"""
+Caching utilities for the Manaaki Navigator Streamlit MVP.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Marks a cache whose data version has not been read yet
+_UNSET = object()
+
+class LRUCache:
+    """
+    Thread-safe bounded least-recently-used cache with hit/miss/eviction counters.
+
+    If a version source is given, the cache empties itself whenever the
+    version it reports changes, e.g. when the service directory is reloaded.
+    """
+
+    def __init__(self, maxsize=256, version_source=None):
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept
+            version_source (callable, optional): Returns the current data version
+        """
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = max(1, maxsize)
+        self._version_source = version_source
+        self._version = _UNSET
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _check_version(self):
+        """Drop every entry if the data version has changed. Caller holds the lock."""
+        if self._version_source is None:
+            return
+        version = self._version_source()
+        if version != self._version:
+            if self._version is not _UNSET:
+                self._entries.clear()
+                self._invalidations += 1
+            self._version = version
+
+    def get(self, key, default=None):
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or the default
+        """
+        with self._lock:
+            self._check_version()
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value, version=_UNSET):
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            version (optional): Data version the value was computed from; the value
+                is discarded if the data has changed since
+        """
+        with self._lock:
+            self._check_version()
+            if version is not _UNSET and version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def resize(self, maxsize):
+        """
+        Change the maximum size, evicting entries if needed.
+
+        Args:
+            maxsize (int): New maximum number of entries
+        """
+        with self._lock:
+            self._maxsize = max(1, maxsize)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: hits, misses, evictions, invalidations, size, maxsize and hit_ratio
+        """
+        with self._lock:
+            self._check_version()
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "hit_ratio": self._hits / lookups if lookups else 0.0
+            }
+
+    def __contains__(self, key):
+        """Check for a key without counting a lookup or marking it as recently used."""
+        with self._lock:
+            self._check_version()
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
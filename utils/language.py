@@ -2,6 +2,9 @@
 Utility functions for language and cultural adaptation in the Manaaki Navigator Streamlit MVP.
 """
 
+import re
+from functools import lru_cache
+
 # Define language constants
 ENGLISH = "english"
 MAORI = "maori"
@@ -63,6 +66,14 @@ ui_text = {
     "start_over": {
         ENGLISH: "Start Over",
         MAORI: "Tīmata Anō"
+    },
+    "load_earlier": {
+        ENGLISH: "Load earlier messages",
+        MAORI: "Whakaatu i ngā karere o mua"
+    },
+    "diagnostics_title": {
+        ENGLISH: "Diagnostics",
+        MAORI: "Tātaritanga"
     }
 }
 
@@ -189,11 +200,18 @@ def get_common_css():
     .option-button:hover {
         opacity: 0.8;
     }
+    .service-cards {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 1rem;
+    }
     .service-card {
         border: 1px solid #ddd;
         border-radius: 0.5rem;
         padding: 1rem;
         margin-bottom: 1rem;
+        flex: 1 1 0;
+        min-width: 12rem;
     }
     .service-card h4 {
         margin-top: 0;
@@ -205,3 +223,42 @@ def get_common_css():
         border-color: #1976d2;
     }
     """
+
+# CSS comments, whitespace runs, and spaces next to punctuation that minification removes
+_CSS_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_WHITESPACE_PATTERN = re.compile(r"\s+")
+_CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{}:;,>])\s*")
+
+def minify_css(css):
+    """
+    Minify CSS by removing comments and redundant whitespace.
+    
+    Args:
+        css (str): CSS source
+    
+    Returns:
+        str: Minified CSS
+    """
+    css = _CSS_COMMENT_PATTERN.sub("", css)
+    css = _CSS_WHITESPACE_PATTERN.sub(" ", css)
+    css = _CSS_PUNCTUATION_PATTERN.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+@lru_cache(maxsize=None)
+def get_theme_css(cultural_mode=GENERAL, extra_css=""):
+    """
+    Get the complete, minified style block for a cultural mode.
+    
+    Bundles are built once per process for each mode and page, and the same
+    string is returned on every rerun, so the browser receives an unchanged
+    element and has no styles to recalculate until the mode changes.
+    
+    Args:
+        cultural_mode (str): Cultural mode (general or maori-responsive)
+        extra_css (str): Page-specific CSS appended to the theme
+    
+    Returns:
+        str: <style> element ready for st.markdown
+    """
+    css = get_common_css() + get_css_for_cultural_mode(cultural_mode) + extra_css
+    return f"<style>{minify_css(css)}</style>"
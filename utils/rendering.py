@@ -0,0 +1,120 @@
+"""
+Chat rendering helpers for the Manaaki Navigator Streamlit MVP.
+These functions turn chat messages into HTML once and cache the result, so a
+Streamlit rerun only re-sends markup it has already built. Every piece of text is
+HTML-escaped: user input is untrusted, and directory fields can come from any
+loaded CSV or JSON file.
+"""
+
+import html
+from functools import lru_cache
+
+# Number of chat messages shown at first, and added by each "load earlier" click
+HISTORY_PAGE_SIZE = 20
+
+# Maximum number of distinct rendered fragments kept per process
+RENDER_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_user_message(content):
+    """
+    Render a user chat message.
+
+    Args:
+        content (str): Message text as typed by the user
+
+    Returns:
+        str: HTML for the message
+    """
+    return (
+        '<div class="chat-message chat-message-user">'
+        f"<div>{html.escape(content)}</div>"
+        "</div>"
+    )
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_bot_message(content):
+    """
+    Render a bot chat message, keeping its line breaks.
+
+    Args:
+        content (str): Response text, which can include directory service names
+
+    Returns:
+        str: HTML for the message
+    """
+    content_html = html.escape(content).replace("\n", "<br>")
+    return (
+        '<div class="chat-message chat-message-bot">'
+        f"<div>{content_html}</div>"
+        "</div>"
+    )
+
+def service_card_fields(service):
+    """
+    Get the fields shown on a service card, as a hashable cache key.
+
+    Args:
+        service (dict): Service record or localized view
+
+    Returns:
+        tuple: (name, description, address, phone, hours)
+    """
+    return (
+        service["name"],
+        service["description"],
+        service["address"],
+        service["phone"],
+        service["hours"]
+    )
+
+def _escape_field(value):
+    """
+    Escape a directory field for HTML.
+
+    Args:
+        value: Field value; missing fields render as an empty string
+
+    Returns:
+        str: Escaped text
+    """
+    return html.escape(str(value if value is not None else ""))
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_service_cards(cards, cultural_class, title="Services"):
+    """
+    Render a row of service cards as a single HTML block.
+
+    Args:
+        cards (tuple): Card fields from service_card_fields, one tuple per service
+        cultural_class (str): service-card-general or service-card-maori
+        title (str): Heading shown above the cards
+
+    Returns:
+        str: HTML for the cards
+    """
+    card_html = "".join(
+        f'<div class="service-card {html.escape(cultural_class)}">'
+        f"<h4>{name}</h4>"
+        f"<p>{description}</p>"
+        f"<p><strong>Address:</strong> {address}</p>"
+        f"<p><strong>Phone:</strong> {phone}</p>"
+        f"<p><strong>Hours:</strong> {hours}</p>"
+        "</div>"
+        for name, description, address, phone, hours in (map(_escape_field, card) for card in cards)
+    )
+    return f'<h3>{html.escape(title)}</h3><div class="service-cards">{card_html}</div>'
+
+def visible_messages(messages, window):
+    """
+    Get the most recent messages that fit in the history window.
+
+    Args:
+        messages (list): Full chat history
+        window (int): Number of messages to show
+
+    Returns:
+        tuple: (messages to show, number of earlier messages hidden)
+    """
+    hidden = max(0, len(messages) - window)
+    return messages[hidden:], hidden